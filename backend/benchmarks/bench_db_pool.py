@@ -0,0 +1,75 @@
+"""Compare hand-history query latency with and without the connection pool.
+
+Needs a reachable Postgres at DATABASE_URL with the schema created (start
+the app once, or run ``database.init_db``). Runs the same repository calls
+through a fresh connection per call (the old behaviour) and through the
+pool, from ``--concurrency`` threads, and reports p50/p99 latency:
+
+    python -m benchmarks.bench_db_pool --requests 2000 --concurrency 8
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import database
+from database import ConnectionPool, get_db_connection
+from repositories import hand_repository
+from repositories.hand_repository import HandRepository
+
+
+class Unpooled:
+    """Opens and closes a connection per call, like the code before pooling"""
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = get_db_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+def measure(pool, requests: int, concurrency: int):
+    hand_repository.get_pool = lambda: pool
+    repository = HandRepository()
+
+    def timed_call(_):
+        start = time.perf_counter()
+        repository.get_hand_history(10)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        latencies = sorted(executor.map(timed_call, range(requests)))
+        elapsed = time.perf_counter() - start
+    return (
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        requests / elapsed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=database.DB_POOL_MAX_SIZE)
+    args = parser.parse_args()
+
+    # Fail fast with a clear message rather than timing connection errors
+    get_db_connection().close()
+
+    pool = ConnectionPool(min_size=args.pool_size, max_size=args.pool_size)
+    pool.open()
+    print(f"{'mode':>10} {'p50 ms':>8} {'p99 ms':>8} {'calls/s':>9}")
+    for name, source in (("unpooled", Unpooled()), ("pooled", pool)):
+        p50, p99, rate = measure(source, args.requests, args.concurrency)
+        print(f"{name:>10} {p50:8.2f} {p99:8.2f} {rate:9.0f}")
+    print(pool.stats())
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
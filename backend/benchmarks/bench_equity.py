@@ -0,0 +1,60 @@
+"""Measure Monte Carlo equity throughput in rollouts/sec/core.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_equity --iterations 200000
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from equity import EquityCalculator, rollout_chunk
+from hand_evaluator import parse_cards
+
+SCENARIOS = {
+    "heads-up preflop": (["AhAd", "KdKc"], ""),
+    "3-way flop": (["AhKh", "QdQc", "9s8s"], "2h7h9c"),
+    "6-way preflop": (["AhAd", "KdKc", "QhJh", "9s8s", "7c7d", "5h4h"], ""),
+}
+
+
+async def run_pool(workers: int, holes, board, iterations: int) -> float:
+    calculator = EquityCalculator(max_workers=workers)
+    try:
+        # Warm the pool so process start-up is not measured
+        await calculator.monte_carlo(holes, board, max_iterations=workers * 2000, time_budget=60, target_ci=0)
+        start = time.perf_counter()
+        result = await calculator.monte_carlo(
+            holes, board, max_iterations=iterations, time_budget=600, target_ci=0
+        )
+        return result.iterations / (time.perf_counter() - start)
+    finally:
+        calculator.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    worker_counts = sorted({1, args.workers})
+    print(f"{'scenario':<18} {'workers':>7} {'rollouts/s':>12} {'rollouts/s/core':>16}")
+    for name, (hands, board) in SCENARIOS.items():
+        holes = [parse_cards(hand) for hand in hands]
+        cards = parse_cards(board)
+
+        # Single chunk in-process: the per-core ceiling without IPC overhead
+        start = time.perf_counter()
+        rollout_chunk(holes, cards, 20000, 0)
+        inline = 20000 / (time.perf_counter() - start)
+        print(f"{name:<18} {'inline':>7} {inline:12.0f} {inline:16.0f}")
+
+        for workers in worker_counts:
+            rate = asyncio.run(run_pool(workers, holes, cards, args.iterations))
+            print(f"{name:<18} {workers:>7} {rate:12.0f} {rate / workers:16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Measure game engine throughput in complete hands per second.
+
+Every hand is dealt to showdown with no betting: shuffle and deal, flop,
+turn, river, then evaluate the winner. With ``--serialize`` the API state
+response is also built after every street, the way the game router does.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_game_engine --hands 20000 --players 6
+"""
+import argparse
+import random
+import time
+
+from deck_provider import deck_pool
+from game_logic import PokerGame
+from models import Player
+from routers.game_router import get_game_state_response
+
+
+def play_hands(hands: int, players: int, serialize: bool) -> float:
+    game = PokerGame()
+    seats = [Player(f"Player{i}", 10 ** 9, []) for i in range(players)]
+    start = time.perf_counter()
+    for _ in range(hands):
+        game.start_new_hand(seats)
+        for deal in (game.deal_flop, game.deal_turn, game.deal_river):
+            deal(seats)
+            if serialize:
+                get_game_state_response(game)
+        game.evaluate_winner(seats)
+    return hands / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, default=20000)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--serialize", action="store_true", help="also build the API state after every street")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(0)
+    deck_pool.start()
+    best = max(play_hands(args.hands, args.players, args.serialize) for _ in range(args.repeats))
+    deck_pool.stop()
+    print(f"{args.players} players: {best:,.0f} hands/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compare the lookup-table evaluator against the pokerkit showdown path.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_hand_evaluator --hands 20000
+"""
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from pokerkit import Automation, NoLimitTexasHoldem, StandardHighHand
+
+from hand_evaluator import evaluate, evaluate_hand, card_to_int, RANKS, SUITS
+
+DECK = [rank + suit for suit in SUITS for rank in RANKS]
+
+
+def random_showdowns(count: int, seed: int) -> List[Tuple[List[str], List[str]]]:
+    """Generate heads-up river showdowns as (hole cards, board) pairs"""
+    rng = random.Random(seed)
+    showdowns = []
+    for _ in range(count):
+        cards = rng.sample(DECK, 9)
+        showdowns.append((cards[:4], cards[4:]))
+    return showdowns
+
+
+def pokerkit_showdown(holes: List[str], board: List[str]) -> List[int]:
+    """Rank both hands the way ``evaluate_winner`` used to, via a pokerkit state"""
+    state = NoLimitTexasHoldem.create_state(
+        (
+            Automation.ANTE_POSTING,
+            Automation.BET_COLLECTION,
+            Automation.BLIND_OR_STRADDLE_POSTING,
+            Automation.HOLE_CARDS_SHOWING_OR_MUCKING,
+            Automation.HAND_KILLING,
+            Automation.CHIPS_PUSHING,
+            Automation.CHIPS_PULLING,
+        ),
+        True,
+        0,
+        (20, 40),
+        40,
+        [1000, 1000],
+        2,
+    )
+    state.deal_hole(''.join(holes[:2]))
+    state.deal_hole(''.join(holes[2:]))
+    return [
+        StandardHighHand.from_game(''.join(holes[i:i + 2]), ''.join(board)).entry.index
+        for i in (0, 2)
+    ]
+
+
+def table_showdown(holes: List[str], board: List[str]) -> List[int]:
+    """Rank both hands with the lookup-table evaluator"""
+    return [evaluate_hand(holes[i:i + 2] + board)[0] for i in (0, 2)]
+
+
+def timed(label: str, func, showdowns) -> float:
+    start = time.perf_counter()
+    for holes, board in showdowns:
+        func(holes, board)
+    elapsed = time.perf_counter() - start
+    per_showdown = elapsed / len(showdowns) * 1e6
+    print(f"{label:<28} {elapsed:8.3f}s  {per_showdown:10.2f} us/showdown")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, default=20000, help="number of showdowns")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    showdowns = random_showdowns(args.hands, args.seed)
+
+    # Both evaluators must agree on every winner before timing them
+    for holes, board in showdowns[:2000]:
+        kit = pokerkit_showdown(holes, board)
+        table = table_showdown(holes, board)
+        assert (kit[0] > kit[1]) == (table[0] > table[1])
+        assert (kit[0] == kit[1]) == (table[0] == table[1])
+
+    pokerkit_time = timed("pokerkit state + hands", pokerkit_showdown, showdowns)
+    table_time = timed("lookup table (strings)", table_showdown, showdowns)
+
+    encoded = [[card_to_int(card) for card in holes + board] for holes, board in showdowns]
+    start = time.perf_counter()
+    for cards in encoded:
+        evaluate(cards[0:2] + cards[4:])
+        evaluate(cards[2:4] + cards[4:])
+    raw_time = time.perf_counter() - start
+    print(f"{'lookup table (int codes)':<28} {raw_time:8.3f}s  "
+          f"{raw_time / len(encoded) * 1e6:10.2f} us/showdown")
+
+    print(f"speedup: {pokerkit_time / table_time:.1f}x (strings), "
+          f"{pokerkit_time / raw_time:.1f}x (int codes)")
+
+
+if __name__ == "__main__":
+    main()
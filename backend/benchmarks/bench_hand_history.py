@@ -0,0 +1,98 @@
+"""Measure hand-history page latency at increasing depth: OFFSET vs. keyset.
+
+Needs a reachable Postgres at DATABASE_URL with the schema and indexes
+created (start the app once). Seeds ``--hands`` synthetic hands with a
+single INSERT ... SELECT over generate_series if the table holds fewer,
+then times fetching one page at each depth both ways:
+
+    python -m benchmarks.bench_hand_history --hands 5000000
+"""
+import argparse
+import statistics
+import time
+
+from database import get_db_connection
+from repositories.hand_repository import HandRepository
+
+PAGE_SIZE = 20
+
+
+def seed(conn, hands: int):
+    cursor = conn.cursor()
+    cursor.execute("SELECT count(*) FROM hands")
+    existing = cursor.fetchone()[0]
+    if existing < hands:
+        print(f"seeding {hands - existing} hands...")
+        start = time.perf_counter()
+        cursor.execute("""
+            INSERT INTO hands (hand_id, players, community_cards, pot_amount, winner, created_at)
+            SELECT 'seed-' || n || '-' || md5(random()::text),
+                   '[]'::jsonb, '["2h", "7d", "9c"]'::jsonb, 60, '{}'::jsonb,
+                   TIMESTAMP '2020-01-01' + n * INTERVAL '1 second'
+            FROM generate_series(%s, %s) AS n
+        """, (existing + 1, hands))
+        conn.commit()
+        cursor.execute("ANALYZE hands")
+        conn.commit()
+        print(f"seeded in {time.perf_counter() - start:.0f}s")
+    cursor.close()
+
+
+def time_offset(conn, offset: int, repeats: int) -> float:
+    cursor = conn.cursor()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        cursor.execute("""
+            SELECT id, hand_id, players, community_cards, pot_amount, winner, created_at
+            FROM hands ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s
+        """, (PAGE_SIZE, offset))
+        cursor.fetchall()
+        samples.append(time.perf_counter() - start)
+    cursor.close()
+    return statistics.median(samples) * 1000
+
+
+def keyset_key_at(conn, offset: int):
+    """The (created_at, id) key a client's cursor holds after paging to ``offset``"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT created_at, id FROM hands ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET %s
+    """, (offset - 1,))
+    key = cursor.fetchone()
+    cursor.close()
+    return key
+
+
+def time_keyset(repository: HandRepository, before, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        repository.get_hand_history(PAGE_SIZE, before)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, default=5000000)
+    parser.add_argument("--depths", type=int, nargs="+", default=[20, 2000, 200000, 2000000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    seed(conn, args.hands)
+    repository = HandRepository()
+
+    print(f"{'depth':>10} {'offset ms':>10} {'keyset ms':>10}")
+    for depth in args.depths:
+        if depth >= args.hands:
+            continue
+        offset_ms = time_offset(conn, depth, args.repeats)
+        keyset_ms = time_keyset(repository, keyset_key_at(conn, depth), args.repeats)
+        print(f"{depth:>10} {offset_ms:10.2f} {keyset_ms:10.2f}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
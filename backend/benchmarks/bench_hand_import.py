@@ -0,0 +1,113 @@
+"""Compare hand import throughput: COPY staging vs. multi-row INSERT vs. row-by-row.
+
+Needs a reachable Postgres at DATABASE_URL with the schema created. Each
+method loads its own freshly generated hands; rows/sec counts hand rows
+plus action rows:
+
+    python -m benchmarks.bench_hand_import --hands 20000
+"""
+import argparse
+import io
+import json
+import random
+import time
+import uuid
+
+from database import get_db_connection
+from hand_import import import_file
+from models import Action, Hand, Player
+from repositories.hand_repository import HandRepository
+
+ACTIONS_PER_HAND = 8
+
+
+def make_records(count: int):
+    prefix = uuid.uuid4().hex[:8]
+    for number in range(count):
+        yield {
+            "hand_id": f"bench-{prefix}-{number}",
+            "players": [
+                {"name": f"Player{seat}", "stack": 1000, "cards": ["Ah", "Kd"], "is_active": True,
+                 "is_all_in": False, "current_bet": 0}
+                for seat in range(6)
+            ],
+            "community_cards": ["2h", "7d", "9c", "Js", "Qh"],
+            "pot_amount": random.randint(60, 2000),
+            "winner": {"winner": "Player0", "amount": 120},
+            "actions": [
+                {"player_name": f"Player{i % 6}", "action_type": "call", "amount": 40, "street": "preflop"}
+                for i in range(ACTIONS_PER_HAND)
+            ],
+        }
+
+
+def to_hand(record) -> Hand:
+    return Hand(
+        hand_id=record["hand_id"],
+        players=[Player(**player) for player in record["players"]],
+        community_cards=record["community_cards"],
+        pot_amount=record["pot_amount"],
+        winner=record["winner"],
+        actions=[Action(**action) for action in record["actions"]],
+    )
+
+
+def bench_copy(count: int) -> float:
+    stream = io.StringIO("".join(json.dumps(record) + "\n" for record in make_records(count)))
+    start = time.perf_counter()
+    import_file(stream)
+    return time.perf_counter() - start
+
+
+def bench_batched(count: int, batch_size: int = 200) -> float:
+    repository = HandRepository()
+    hands = [to_hand(record) for record in make_records(count)]
+    start = time.perf_counter()
+    for offset in range(0, count, batch_size):
+        repository.save_hands(hands[offset:offset + batch_size])
+    return time.perf_counter() - start
+
+
+def bench_row_by_row(count: int) -> float:
+    """The original save_hand: one INSERT per hand and per action"""
+    hands = [to_hand(record) for record in make_records(count)]
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    for hand in hands:
+        cursor.execute(
+            "INSERT INTO hands (hand_id, players, community_cards, pot_amount, winner) VALUES (%s, %s, %s, %s, %s) "
+            "ON CONFLICT (hand_id) DO NOTHING",
+            (hand.hand_id, json.dumps([vars(p) for p in hand.players]), json.dumps(hand.community_cards),
+             hand.pot_amount, json.dumps(hand.winner)),
+        )
+        for action in hand.actions:
+            cursor.execute(
+                "INSERT INTO actions (hand_id, player_name, action_type, amount, street) VALUES (%s, %s, %s, %s, %s)",
+                (hand.hand_id, action.player_name, action.action_type, action.amount, action.street),
+            )
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, default=20000)
+    parser.add_argument("--row-by-row-hands", type=int, default=2000, help="the slow path gets a smaller sample")
+    args = parser.parse_args()
+
+    rows_per_hand = 1 + ACTIONS_PER_HAND
+    print(f"{'method':>12} {'hands':>8} {'rows/s':>10}")
+    for name, method, count in (
+        ("row-by-row", bench_row_by_row, args.row_by_row_hands),
+        ("multi-row", bench_batched, args.hands),
+        ("copy", bench_copy, args.hands),
+    ):
+        elapsed = method(count)
+        print(f"{name:>12} {count:>8} {count * rows_per_hand / elapsed:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Measure make_action throughput on a single game.
+
+Plays long preflop streets where every player alternately makes the
+minimum raise and calls, so each action has to find the highest bet and
+the next player to act. A new hand starts once the raises outgrow the
+stacks.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_make_action --actions 200000 --players 6 9
+"""
+import argparse
+import time
+
+from game_logic import PokerGame
+from models import Player
+
+
+def raise_or_call(game: PokerGame, seats) -> bool:
+    player = seats[game.current_player_index]
+    if game._get_call_amount(seats, player) > 0:
+        return game.make_action(seats, game.current_player_index, "call")
+    amount = max(game.min_bet, game._get_min_raise(seats))
+    return game.make_action(seats, game.current_player_index, "raise", amount)
+
+
+def run(actions: int, players: int) -> float:
+    game = PokerGame()
+    game.start_new_hand([Player(f"Player{i}", 10 ** 18, []) for i in range(players)])
+    start = time.perf_counter()
+    for _ in range(actions):
+        if not raise_or_call(game, game.players):
+            game.start_new_hand([Player(f"Player{i}", 10 ** 18, []) for i in range(players)])
+    return actions / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=200000)
+    parser.add_argument("--players", type=int, nargs="+", default=[2, 6, 9])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'players':>7} {'actions/s':>10}")
+    for players in args.players:
+        best = max(run(args.actions, players) for _ in range(args.repeats))
+        print(f"{players:>7} {best:10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
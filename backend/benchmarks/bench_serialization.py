@@ -0,0 +1,134 @@
+"""Measure memory per table and serialization time per response.
+
+* memory: tracemalloc growth per table, each seating six players mid-hand
+  with its state response cached;
+* state: building a table's state response (``get_cached_state``), the
+  work behind every action, deal and state request;
+* action / history: full requests through the ASGI app. History pages
+  are served by an in-memory repository, so only the encoding is timed.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_serialization --tables 1000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+import httpx
+
+from main import app
+from models import Action, HandHistory, Player
+from repositories.async_hand_repository import AsyncHandRepository
+from routers import hand_router
+from routers.game_router import get_cached_state
+from table_registry import TableRegistry
+
+PLAYERS = [{"name": f"Player{i}", "stack": 100000} for i in range(6)]
+HISTORY_PAGE = 50
+
+
+def play_street(table, actions: int):
+    game = table.game
+    game.start_new_hand([Player(p["name"], p["stack"], []) for p in PLAYERS])
+    for _ in range(actions):
+        player = game.players[game.current_player_index]
+        if game._get_call_amount(game.players, player) > 0:
+            game.make_action(game.players, game.current_player_index, "call")
+        else:
+            amount = max(game.min_bet, game._get_min_raise(game.players))
+            game.make_action(game.players, game.current_player_index, "raise", amount)
+
+
+def memory_per_table(tables: int, actions: int) -> float:
+    registry = TableRegistry()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(tables):
+        table = registry.create(f"bench-{i}")
+        play_street(table, actions)
+        get_cached_state(table)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return growth / tables
+
+
+def state_build_us(repeats: int, actions: int) -> float:
+    table = TableRegistry().create("bench-state")
+    play_street(table, actions)
+    samples = []
+    for _ in range(repeats):
+        table.state_cache = None
+        start = time.perf_counter()
+        get_cached_state(table)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+class InMemoryRepository:
+    def __init__(self, hands):
+        self.hands = hands
+
+    def get_hand_history(self, limit=10, before=None, include_actions=False):
+        return self.hands[:limit]
+
+
+def history_page():
+    return [
+        HandHistory(
+            hand_id=f"hand-{n}",
+            players=[Player(p["name"], p["stack"], ["Ah", "Kd"]) for p in PLAYERS],
+            community_cards=["2h", "7d", "9c", "Js", "Kh"],
+            pot_amount=600,
+            winner={"winner": "Player0", "amount": 600, "reason": "Best hand: One pair"},
+            created_at=datetime(2024, 1, 1),
+            id=n,
+            actions=[Action(f"Player{i % 6}", "call", 40, "preflop") for i in range(12)],
+        )
+        for n in range(HISTORY_PAGE + 1)
+    ]
+
+
+async def request_us(repeats: int, actions: int):
+    transport = httpx.ASGITransport(app=app)
+    hand_router.hand_repository = AsyncHandRepository(InMemoryRepository(history_page()), max_workers=1)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        action_samples, history_samples = [], []
+        for _ in range(repeats):
+            await client.post("/api/tables/bench-requests/start-hand", json=PLAYERS)
+            for _ in range(actions):
+                legal = (await client.get("/api/tables/bench-requests/legal-actions")).json()
+                action_type = "call" if "call" in legal["actions"] else "raise"
+                amount = legal["actions"]["raise"]["min"] if action_type == "raise" else 0
+                action = {"player_index": legal["player_index"], "action_type": action_type, "amount": amount}
+                start = time.perf_counter()
+                response = await client.post("/api/tables/bench-requests/action", json=action)
+                action_samples.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+            start = time.perf_counter()
+            response = await client.get("/api/hands/", params={"limit": HISTORY_PAGE, "include": "actions"})
+            history_samples.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+    return statistics.median(action_samples) * 1e6, statistics.median(history_samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", type=int, default=1000)
+    parser.add_argument("--actions", type=int, default=24, help="actions played at every table")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"memory per table:      {memory_per_table(args.tables, args.actions) / 1024:8.1f} KiB")
+    print(f"state response build:  {state_build_us(args.repeats * 10, args.actions):8.1f} us")
+    action_us, history_us = asyncio.run(request_us(args.repeats // 10, args.actions))
+    print(f"action request:        {action_us:8.1f} us")
+    print(f"history page ({HISTORY_PAGE}):     {history_us:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Measure side pot resolution over randomized 6-way all-in showdowns.
+
+Every scenario deals six hands and a board, gives each seat a random
+all-in amount (so most showdowns have several side pots) and resolves the
+pots two ways: the single pass in ``pots.resolve_pots``, ranking each
+hand once, and a naive pot-by-pot loop that ranks the eligible hands
+again for every pot.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_side_pots --scenarios 50000
+"""
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from hand_evaluator import evaluate
+from pots import resolve_pots, total_payouts
+
+SEATS = 6
+
+
+def random_scenarios(count: int, seed: int) -> List[Tuple[List[int], List[List[int]], List[int]]]:
+    rng = random.Random(seed)
+    scenarios = []
+    for _ in range(count):
+        cards = rng.sample(range(52), SEATS * 2 + 5)
+        holes = [cards[2 * seat:2 * seat + 2] for seat in range(SEATS)]
+        contributions = [rng.choice([100, 250, 500, 1000, 2500, 5000]) for _ in range(SEATS)]
+        scenarios.append((contributions, holes, cards[-5:]))
+    return scenarios
+
+
+def single_pass(contributions, holes, board):
+    strengths = [evaluate(hole + board) for hole in holes]
+    return total_payouts(resolve_pots(contributions, [True] * SEATS, strengths, first_seat=1))
+
+
+def pot_by_pot(contributions, holes, board):
+    payouts = {}
+    previous = 0
+    for level in sorted(set(contributions)):
+        amount = sum(min(c, level) - min(c, previous) for c in contributions)
+        eligible = [seat for seat in range(SEATS) if contributions[seat] >= level]
+        strengths = {seat: evaluate(holes[seat] + board) for seat in eligible}
+        best = max(strengths.values())
+        winners = sorted((seat for seat in eligible if strengths[seat] == best), key=lambda seat: (seat - 1) % SEATS)
+        share, odd = divmod(amount, len(winners))
+        for position, seat in enumerate(winners):
+            payouts[seat] = payouts.get(seat, 0) + share + (1 if position < odd else 0)
+        previous = level
+    return payouts
+
+
+def time_resolver(resolver, scenarios) -> float:
+    start = time.perf_counter()
+    for scenario in scenarios:
+        resolver(*scenario)
+    return len(scenarios) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    scenarios = random_scenarios(args.scenarios, args.seed)
+    assert all(single_pass(*s) == pot_by_pot(*s) for s in scenarios[:1000])
+    pots = sum(len(set(contributions)) for contributions, _, _ in scenarios) / len(scenarios)
+    print(f"{args.scenarios} scenarios, {pots:.1f} pots on average")
+    for name, resolver in [("single pass", single_pass), ("pot by pot", pot_by_pot)]:
+        print(f"{name:>12}: {time_resolver(resolver, scenarios):10,.0f} showdowns/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Measure write-ahead log recovery time and logging cost for open tables.
+
+Opens ``--tables`` tables in a temporary directory, plays every one of them
+partway through a hand with random legal actions, logging each change,
+then recovers them into a fresh registry as a restart would. Recovery is
+timed twice: from the log as written, and after a compaction, which
+leaves only each table's current hand.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_table_wal --tables 1000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Tuple
+
+from deck_provider import SeededDeckProvider
+from models import Player
+from table_registry import TableRegistry
+from table_wal import TableWAL
+
+
+def play_partial_hands(registry: TableRegistry, wal: TableWAL, tables: int, hands: int, seed: int) -> int:
+    """Play ``hands - 1`` complete hands and part of one more on each table; returns the actions made"""
+    rng = random.Random(seed)
+    actions = 0
+    for index in range(tables):
+        table = registry.get_or_create(f"table-{index}")
+        game = table.game
+        game.deck_provider = SeededDeckProvider(index)
+        players = [Player(f"Player{seat}", 2000, []) for seat in range(rng.randint(2, 6))]
+        for hand in range(hands):
+            game.start_new_hand(players)
+            wal.log_events(table.table_id, game)
+            # Leave the last hand a few actions in
+            limit = rng.randint(1, 6) if hand == hands - 1 else 100
+            for _ in range(limit):
+                legal = game.legal_actions(players, game.current_player_index)
+                if not legal or game.is_hand_complete(players):
+                    break
+                action_type = rng.choice([a for a in ("check", "call", "fold") if a in legal] or sorted(legal))
+                game.make_action(players, game.current_player_index, action_type)
+                wal.log_events(table.table_id, game)
+                actions += 1
+            if hand < hands - 1:
+                game.evaluate_winner(players)
+                wal.log_events(table.table_id, game)
+                for player in players:
+                    player.stack = max(player.stack, 100)
+    return actions
+
+
+def time_recovery(directory: str) -> Tuple[int, float]:
+    start = time.perf_counter()
+    wal = TableWAL(directory, fsync_interval=0)
+    recovered = wal.recover(TableRegistry())
+    elapsed = time.perf_counter() - start
+    wal.close()
+    return recovered, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", type=int, default=1000)
+    parser.add_argument("--hands", type=int, default=5, help="hands played per table before the restart")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        wal = TableWAL(directory)
+        registry = TableRegistry()
+        wal.recover(registry)
+        start = time.perf_counter()
+        actions = play_partial_hands(registry, wal, args.tables, args.hands, args.seed)
+        wal.sync()
+        elapsed = time.perf_counter() - start
+        stats = wal.stats()
+        wal.close()
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"{args.tables} tables, {args.hands} hands each, {actions} actions")
+        print(f"logging: {stats['records']:,} records, {stats['fsyncs']} fsyncs, "
+              f"{stats['records'] / elapsed:,.0f} records/s alongside the game, {size / 1024:,.0f} KiB")
+
+        recovered, full = time_recovery(directory)
+        assert recovered == args.tables
+        print(f"recovery from the full log:      {full * 1000:8.1f} ms")
+        # time_recovery leaves a compacted log behind
+        recovered, compacted = time_recovery(directory)
+        assert recovered == args.tables
+        print(f"recovery from the compacted log: {compacted * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Measure action throughput as the number of concurrent tables grows.
+
+Drives the FastAPI app in-process through an ASGI client. Every table runs
+its own sequence of hands (start a 6-handed hand, then everyone folds to
+the big blind) concurrently with all the others.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_tables --tables 1 10 100 1000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from main import app
+from table_registry import table_registry
+
+PLAYERS = [{"name": f"Player{i}", "stack": 100000} for i in range(6)]
+
+
+async def play_table(client: httpx.AsyncClient, table_id: str, hands: int) -> int:
+    """Play ``hands`` hands on one table; returns the number of requests made"""
+    requests = 0
+    for _ in range(hands):
+        response = await client.post(f"/api/tables/{table_id}/start-hand", json=PLAYERS)
+        state = response.json()["game_state"]
+        requests += 1
+        for _ in range(len(PLAYERS) - 1):
+            response = await client.post(
+                f"/api/tables/{table_id}/action",
+                json={"player_index": state["current_player_index"], "action_type": "fold"},
+            )
+            assert response.status_code == 200, response.text
+            state = response.json()["game_state"]
+            requests += 1
+    return requests
+
+
+async def run(tables: int, hands: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        counts = await asyncio.gather(*[
+            play_table(client, f"bench-{tables}-{i}", hands) for i in range(tables)
+        ])
+        elapsed = time.perf_counter() - start
+    for i in range(tables):
+        table_registry.remove(f"bench-{tables}-{i}")
+    return sum(counts) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=6000, help="total requests per run")
+    args = parser.parse_args()
+
+    print(f"{'tables':>7} {'hands/table':>12} {'actions/s':>10}")
+    for tables in args.tables:
+        hands = max(1, args.requests // (tables * len(PLAYERS)))
+        rate = asyncio.run(run(tables, hands))
+        print(f"{tables:>7} {hands:>12} {rate:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
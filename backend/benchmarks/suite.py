@@ -0,0 +1,458 @@
+"""Benchmark suite for engine, repository and API hot paths.
+
+Each case times one operation over several rounds of ``number``
+operations and reports the median, p95 and fastest time per operation.
+The cases come in three groups:
+
+* engine: ``CustomDeck`` creation, ``start_new_hand``, ``make_action``,
+  ``is_hand_complete``, ``evaluate_winner`` and ``get_game_state_response``;
+* repository: ``HandRepository.save_hand`` and ``get_hand_history``
+  against the Postgres at DATABASE_URL. The group is skipped if the
+  database cannot be reached. Hands it saves are deleted afterwards;
+* api: end-to-end request latency through the ASGI app, in process.
+
+Results can be written as JSON. A stored baseline can be compared against
+the current run, and cases slower than the baseline by more than
+``--threshold`` are flagged. Baselines depend on the machine, so keep one
+per machine. Run from the backend directory:
+
+    python -m benchmarks.suite                              # run everything, print a table
+    python -m benchmarks.suite --group engine --json out.json
+    python -m benchmarks.suite --save-baseline              # store this run as the baseline
+    python -m benchmarks.suite --compare                    # exit 1 if any case regressed
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from deck_provider import SeededDeckProvider, deck_pool
+from game_logic import CustomDeck, PokerGame
+from models import Action, Hand, HandHistory, Player
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+GROUPS = ("engine", "repository", "api")
+SEATS = 6
+BENCH_HAND_PREFIX = "bench-suite-"
+
+
+@dataclass
+class Case:
+    name: str
+    group: str
+    run: Callable[[int], Any]  # Runs ``number`` operations, returns the seconds they took
+    number: int
+
+
+CASES: List[Case] = []
+
+
+def case(group: str, number: int):
+    def register(run):
+        CASES.append(Case(f"{group}.{run.__name__}", group, run, number))
+        return run
+    return register
+
+
+def seat_players(stack: int = 10 ** 18) -> List[Player]:
+    return [Player(f"Player{i}", stack, []) for i in range(SEATS)]
+
+
+def raise_or_call(game: PokerGame, players: List[Player]) -> bool:
+    """One move of a street where everyone alternately makes the minimum raise and calls"""
+    player = players[game.current_player_index]
+    if game._get_call_amount(players, player) > 0:
+        return game.make_action(players, game.current_player_index, "call")
+    amount = max(game.min_bet, game._get_min_raise(players))
+    return game.make_action(players, game.current_player_index, "raise", amount)
+
+
+# Engine
+
+@case("engine", number=2000)
+def custom_deck(number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        CustomDeck(deck_pool.next_deck())
+    return time.perf_counter() - start
+
+
+@case("engine", number=1000)
+def start_new_hand(number: int) -> float:
+    game = PokerGame()
+    players = seat_players()
+    start = time.perf_counter()
+    for _ in range(number):
+        game.start_new_hand(players)
+    return time.perf_counter() - start
+
+
+@case("engine", number=2000)
+def make_action(number: int) -> float:
+    game = PokerGame(deck_provider=SeededDeckProvider(1))
+    players = seat_players()
+    game.start_new_hand(players)
+    start = time.perf_counter()
+    for _ in range(number):
+        # The raises outgrow the stacks every couple of hundred actions
+        if not raise_or_call(game, players):
+            players = seat_players()
+            game.start_new_hand(players)
+    return time.perf_counter() - start
+
+
+@case("engine", number=10000)
+def is_hand_complete(number: int) -> float:
+    game = PokerGame(deck_provider=SeededDeckProvider(1))
+    players = seat_players()
+    game.start_new_hand(players)
+    for _ in range(24):
+        raise_or_call(game, players)
+    start = time.perf_counter()
+    for _ in range(number):
+        game.is_hand_complete(players)
+    return time.perf_counter() - start
+
+
+@case("engine", number=200)
+def evaluate_winner(number: int) -> float:
+    # Showdowns pay out, so every one needs its own hand dealt to the river
+    games = []
+    for seed in range(number):
+        game = PokerGame(deck_provider=SeededDeckProvider(seed))
+        players = seat_players(1000)
+        game.start_new_hand(players)
+        for _ in range(SEATS):
+            game.make_action(players, game.current_player_index, "all_in")
+        game.deal_flop(players)
+        game.deal_turn(players)
+        game.deal_river(players)
+        games.append((game, players))
+    start = time.perf_counter()
+    for game, players in games:
+        game.evaluate_winner(players)
+    return time.perf_counter() - start
+
+
+@case("engine", number=1000)
+def game_state_response(number: int) -> float:
+    from routers.game_router import get_game_state_response
+
+    game = PokerGame(deck_provider=SeededDeckProvider(1))
+    players = seat_players()
+    game.start_new_hand(players)
+    for _ in range(24):
+        raise_or_call(game, players)
+    start = time.perf_counter()
+    for _ in range(number):
+        get_game_state_response(game)
+    return time.perf_counter() - start
+
+
+# Repository
+
+def bench_hand(index: int) -> Hand:
+    return Hand(
+        hand_id=f"{BENCH_HAND_PREFIX}{uuid.uuid4().hex}",
+        players=[Player(f"Player{i}", 1000, ["Ah", "Kd"]) for i in range(SEATS)],
+        community_cards=["2h", "7d", "9c", "Js", "Kh"],
+        pot_amount=240 + index,
+        actions=[Action(f"Player{i % SEATS}", "call", 40, "preflop") for i in range(12)],
+        winner={"winner": "Player0", "amount": 240, "reason": "Best hand: One pair"},
+    )
+
+
+@case("repository", number=20)
+def save_hand(number: int) -> float:
+    from repositories.hand_repository import HandRepository
+
+    repository = HandRepository()
+    hands = [bench_hand(i) for i in range(number)]
+    start = time.perf_counter()
+    for hand in hands:
+        if not repository.save_hand(hand):
+            raise RuntimeError("save_hand failed")
+    return time.perf_counter() - start
+
+
+@case("repository", number=20)
+def get_hand_history(number: int) -> float:
+    from repositories.hand_repository import HandRepository
+
+    repository = HandRepository()
+    start = time.perf_counter()
+    for _ in range(number):
+        repository.get_hand_history(limit=20, include_actions=True)
+    return time.perf_counter() - start
+
+
+def repository_unavailable() -> Optional[str]:
+    """Why the repository group cannot run, or None if the database is reachable"""
+    from database import create_tables, get_pool
+
+    try:
+        with get_pool().connection() as conn:
+            create_tables(conn)
+    except Exception as e:
+        return f"database unavailable ({str(e).strip().splitlines()[0]})"
+    return None
+
+
+def delete_bench_hands():
+    from database import get_pool
+
+    with get_pool().connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM actions WHERE hand_id LIKE %s", (BENCH_HAND_PREFIX + "%",))
+        cursor.execute("DELETE FROM hands WHERE hand_id LIKE %s", (BENCH_HAND_PREFIX + "%",))
+        conn.commit()
+        cursor.close()
+
+
+# API
+
+API_PLAYERS = [{"name": f"Player{i}", "stack": 10 ** 18} for i in range(SEATS)]
+
+
+class InMemoryRepository:
+    """History pages without a database, so api.hand_history times the request path only"""
+
+    def __init__(self, hands: List[HandHistory]):
+        self.hands = hands
+
+    def get_hand_history(self, limit=10, before=None, include_actions=False):
+        return self.hands[:limit]
+
+
+def history_page(size: int = 51) -> List[HandHistory]:
+    return [
+        HandHistory(
+            hand_id=f"hand-{n}",
+            players=[Player(p["name"], 1000, ["Ah", "Kd"]) for p in API_PLAYERS],
+            community_cards=["2h", "7d", "9c", "Js", "Kh"],
+            pot_amount=600,
+            winner={"winner": "Player0", "amount": 600, "reason": "Best hand: One pair"},
+            created_at=datetime(2024, 1, 1),
+            id=n,
+            actions=[Action(f"Player{i % SEATS}", "call", 40, "preflop") for i in range(12)],
+        )
+        for n in range(size)
+    ]
+
+
+class ApiClient:
+    """One in-process client shared by the api cases"""
+    client = None
+
+    @classmethod
+    async def get(cls):
+        if cls.client is None:
+            import httpx
+            from main import app
+
+            cls.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+        return cls.client
+
+
+async def timed_requests(number: int, request) -> float:
+    client = await ApiClient.get()
+    elapsed = 0.0
+    for _ in range(number):
+        start = time.perf_counter()
+        response = await request(client)
+        elapsed += time.perf_counter() - start
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.request.url} returned {response.status_code}: {response.text}")
+    return elapsed
+
+
+@case("api", number=50)
+async def start_hand(number: int) -> float:
+    return await timed_requests(number, lambda client: client.post("/api/tables/bench-suite/start-hand", json=API_PLAYERS))
+
+
+@case("api", number=100)
+async def action(number: int) -> float:
+    from table_registry import table_registry
+
+    client = await ApiClient.get()
+    await client.post("/api/tables/bench-suite/start-hand", json=API_PLAYERS)
+    game = table_registry.get("bench-suite").game
+
+    def next_action(client):
+        player = game.players[game.current_player_index]
+        if game._get_call_amount(game.players, player) > 0:
+            body = {"player_index": game.current_player_index, "action_type": "call"}
+        else:
+            amount = max(game.min_bet, game._get_min_raise(game.players))
+            body = {"player_index": game.current_player_index, "action_type": "raise", "amount": amount}
+        return client.post("/api/tables/bench-suite/action", json=body)
+
+    return await timed_requests(number, next_action)
+
+
+@case("api", number=200)
+async def state(number: int) -> float:
+    client = await ApiClient.get()
+    await client.post("/api/tables/bench-suite/start-hand", json=API_PLAYERS)
+    return await timed_requests(number, lambda client: client.get("/api/tables/bench-suite/state"))
+
+
+@case("api", number=50)
+async def hand_history(number: int) -> float:
+    from repositories.async_hand_repository import AsyncHandRepository
+    from routers import hand_router
+
+    repository = hand_router.hand_repository
+    hand_router.hand_repository = AsyncHandRepository(InMemoryRepository(history_page()), max_workers=1)
+    try:
+        return await timed_requests(
+            number, lambda client: client.get("/api/hands/", params={"limit": 50, "include": "actions"})
+        )
+    finally:
+        hand_router.hand_repository.shutdown()
+        hand_router.hand_repository = repository
+
+
+# Running and reporting
+
+def measure(case: Case, rounds: int, loop: asyncio.AbstractEventLoop) -> Dict[str, Any]:
+    def sample() -> float:
+        if asyncio.iscoroutinefunction(case.run):
+            return loop.run_until_complete(case.run(case.number))
+        return case.run(case.number)
+
+    sample()  # Warm-up
+    per_op = sorted(sample() / case.number * 1e6 for _ in range(rounds))
+    median = statistics.median(per_op)
+    return {
+        "group": case.group,
+        "median_us": round(median, 3),
+        "p95_us": round(per_op[min(len(per_op) - 1, int(len(per_op) * 0.95))], 3),
+        "min_us": round(per_op[0], 3),
+        "ops_per_sec": round(1e6 / median, 1) if median else None,
+        "rounds": rounds,
+        "number": case.number,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(groups: List[str], rounds: int, pattern: Optional[str] = None) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    skipped: Dict[str, str] = {}
+    selected = [c for c in CASES if c.group in groups and (pattern is None or pattern in c.name)]
+
+    reason = None
+    if any(c.group == "repository" for c in selected):
+        reason = repository_unavailable()
+    loop = asyncio.new_event_loop()
+    deck_pool.start()
+    try:
+        for case in selected:
+            if case.group == "repository" and reason:
+                skipped[case.name] = reason
+                continue
+            results[case.name] = measure(case, rounds, loop)
+            print(format_result(case.name, results[case.name]), flush=True)
+    finally:
+        deck_pool.stop()
+        if ApiClient.client is not None:
+            loop.run_until_complete(ApiClient.client.aclose())
+            ApiClient.client = None
+        loop.close()
+        if any(c.group == "repository" for c in selected) and not reason:
+            delete_bench_hands()
+
+    for name, why in skipped.items():
+        print(f"{name:<34} skipped: {why}")
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    return (f"{name:<34} {result['median_us']:>11,.2f} us  p95 {result['p95_us']:>11,.2f} us  "
+            f"{result['ops_per_sec'] or 0:>12,.0f} ops/s")
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print each case against the baseline; returns the cases slower by more than ``threshold``"""
+    regressions = []
+    print(f"\n{'case':<34} {'baseline us':>12} {'current us':>12} {'change':>8}")
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:<34} {'-':>12} {result['median_us']:>12,.2f} {'new':>8}")
+            continue
+        change = result["median_us"] / before["median_us"] - 1 if before["median_us"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<34} {before['median_us']:>12,.2f} {result['median_us']:>12,.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--group", choices=GROUPS, action="append", help="run only these groups (repeatable)")
+    parser.add_argument("-k", dest="pattern", help="run only cases whose name contains this")
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--json", dest="json_path", help="write the results to this JSON file")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="store the results as the baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="compare against a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="slowdown that counts as a regression (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read baseline {args.compare}: {e}")
+
+    current = run_suite(args.group or list(GROUPS), args.rounds, args.pattern)
+    for path in filter(None, (args.json_path, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"wrote {path}")
+
+    if baseline is not None:
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nno regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
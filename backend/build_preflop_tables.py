@@ -0,0 +1,100 @@
+"""Generate the preflop equity table file.
+
+Deals random hands and boards in large vectorized batches, ranks them with
+the batch evaluator and accumulates pot shares per starting-hand class:
+
+    python build_preflop_tables.py --deals 20000000 --output data/preflop_equity.bin
+"""
+import argparse
+import time
+
+import numpy as np
+
+from hand_evaluator import evaluate_batch
+from preflop_tables import (
+    DEFAULT_TABLE_PATH, MAX_PLAYERS, MIN_PLAYERS, NUM_CLASSES, PreflopTables,
+    class_name, write_tables,
+)
+
+BATCH_SIZE = 200000
+
+def class_indices(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Vectorized ``preflop_tables.class_index``"""
+    high = 12 - np.maximum(first >> 2, second >> 2)
+    low = 12 - np.minimum(first >> 2, second >> 2)
+    suited = (first & 3) == (second & 3)
+    return np.where(suited, high * 13 + low, low * 13 + high)
+
+def deal(rng: np.random.Generator, size: int, players: int):
+    """Deal ``size`` random deals; returns class indices and pot shares per seat"""
+    needed = 2 * players + 5
+    keys = rng.random((size, 52))
+    cards = keys.argpartition(needed, axis=1)[:, :needed]
+    # argpartition leaves the selected cards in index-dependent order; sort
+    # them by their random keys so seats and board get a uniform deal
+    order = np.take_along_axis(keys, cards, axis=1).argsort(axis=1)
+    cards = np.take_along_axis(cards, order, axis=1)
+    board = cards[:, 2 * players:]
+    strengths = np.stack([
+        evaluate_batch(np.concatenate([cards[:, 2 * seat:2 * seat + 2], board], axis=1))
+        for seat in range(players)
+    ])
+    winners = strengths == strengths.max(axis=0)
+    shares = winners / winners.sum(axis=0)
+    classes = np.stack([class_indices(cards[:, 2 * seat], cards[:, 2 * seat + 1]) for seat in range(players)])
+    return classes, shares
+
+def build_heads_up(rng: np.random.Generator, deals: int) -> np.ndarray:
+    """Class-versus-class equity matrix"""
+    share_sums = np.zeros(NUM_CLASSES * NUM_CLASSES)
+    counts = np.zeros(NUM_CLASSES * NUM_CLASSES)
+    for start in range(0, deals, BATCH_SIZE):
+        classes, shares = deal(rng, min(BATCH_SIZE, deals - start), 2)
+        for hero, villain in ((0, 1), (1, 0)):
+            cells = classes[hero] * NUM_CLASSES + classes[villain]
+            share_sums += np.bincount(cells, weights=shares[hero], minlength=len(share_sums))
+            counts += np.bincount(cells, minlength=len(counts))
+    if counts.min() == 0:
+        raise SystemExit("Some matchups were never dealt; increase --deals")
+    return (share_sums / counts).reshape(NUM_CLASSES, NUM_CLASSES)
+
+def build_multiway(rng: np.random.Generator, deals: int) -> np.ndarray:
+    """Equity of each class against 1-5 random hands"""
+    columns = []
+    for players in range(MIN_PLAYERS, MAX_PLAYERS + 1):
+        share_sums = np.zeros(NUM_CLASSES)
+        counts = np.zeros(NUM_CLASSES)
+        for start in range(0, deals, BATCH_SIZE):
+            classes, shares = deal(rng, min(BATCH_SIZE, deals - start), players)
+            share_sums += np.bincount(classes.ravel(), weights=shares.ravel(), minlength=NUM_CLASSES)
+            counts += np.bincount(classes.ravel(), minlength=NUM_CLASSES)
+        columns.append(share_sums / counts)
+    return np.stack(columns, axis=1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deals", type=int, default=20000000, help="heads-up deals to sample")
+    parser.add_argument("--multiway-deals", type=int, default=2000000, help="deals per player count")
+    parser.add_argument("--output", default=DEFAULT_TABLE_PATH)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    heads_up = build_heads_up(rng, args.deals)
+    # Average the two sides of each matchup so the matrix is exactly complementary
+    heads_up = (heads_up + (1 - heads_up.T)) / 2
+    print(f"heads-up table: {args.deals} deals in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    multiway = build_multiway(rng, args.multiway_deals)
+    print(f"multiway table: {args.multiway_deals} deals per player count in {time.perf_counter() - start:.1f}s")
+
+    write_tables(args.output, heads_up, multiway, args.deals)
+    tables = PreflopTables(args.output)
+    aces, kings = 0, 14
+    print(f"wrote {args.output}: {class_name(aces)} vs {class_name(kings)} = {tables.versus(aces, kings):.3f}, "
+          f"{class_name(aces)} 6-way = {tables.against_field(aces, 6):.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""In-process caches shared by the equity calculator and hand history."""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class LRUCache:
+    """Size-bounded least-recently-used cache with hit/miss counters.
+
+    With a ``ttl`` (seconds), entries older than that are treated as missing.
+    Not thread-safe: use it from one thread (e.g. the event loop).
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._entries: "OrderedDict[object, Tuple[object, float]]" = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.expired += 1
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key):
+        """Remove and return an entry, or None"""
+        entry = self._entries.pop(key, None)
+        return entry[0] if entry is not None else None
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
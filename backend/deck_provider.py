@@ -0,0 +1,136 @@
+"""Shuffled decks for the game engine.
+
+A deck is a permutation of the integer card codes 0-51 (see hand_evaluator).
+``DeckPool``, the default provider, shuffles decks in bulk with NumPy on a
+background thread and keeps them in a bounded ring buffer, so starting a
+hand only copies one ready row out of the buffer. Its generator is seeded
+with 128 bits from ``secrets``.
+
+``SeededDeckProvider`` deals a reproducible sequence of decks for tests and
+replays. Any object with a ``next_deck()`` method returning 52 codes can be
+passed to ``PokerGame``.
+"""
+import os
+import secrets
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+DECK_POOL_SIZE = int(os.getenv("DECK_POOL_SIZE", "4096"))
+DECK_POOL_BATCH_SIZE = int(os.getenv("DECK_POOL_BATCH_SIZE", "1024"))
+
+_ORDERED_DECK = np.arange(52, dtype=np.uint8)
+
+def shuffled_decks(rng: np.random.Generator, count: int) -> np.ndarray:
+    """``count`` independently shuffled decks, one per row"""
+    return rng.permuted(np.broadcast_to(_ORDERED_DECK, (count, 52)), axis=1)
+
+class SeededDeckProvider:
+    """Deterministic decks: the same seed always deals the same sequence"""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+
+    def next_deck(self) -> List[int]:
+        return shuffled_decks(self._rng, 1)[0].tolist()
+
+class DeckPool:
+    """Ring buffer of pre-shuffled decks, refilled in batches by a background thread.
+
+    The refill thread wakes whenever a whole batch fits in the buffer. When
+    the pool is not running or has run dry, ``next_deck`` shuffles one deck
+    inline rather than wait.
+    """
+
+    def __init__(
+        self,
+        size: int = DECK_POOL_SIZE,
+        batch_size: int = DECK_POOL_BATCH_SIZE,
+        seed: Optional[int] = None,
+    ):
+        self.size = size
+        self.batch_size = min(batch_size, size)
+        seed_sequence = np.random.SeedSequence(secrets.randbits(128) if seed is None else seed)
+        # One generator per thread: NumPy generators are not thread-safe
+        refill_seed, inline_seed = seed_sequence.spawn(2)
+        self._rng = np.random.default_rng(refill_seed)
+        self._inline_rng = np.random.default_rng(inline_seed)
+        self._buffer = np.empty((size, 52), dtype=np.uint8)
+        self._head = 0  # Next deck to deal
+        self._ready = 0  # Shuffled decks waiting in the buffer
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        # Metrics
+        self.dealt = 0
+        self.refills = 0
+        self.misses = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        """Start the refill thread; it fills the buffer right away"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self.run, name="deck-pool", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._space.notify()
+        if thread is not None:
+            thread.join()
+
+    def next_deck(self) -> List[int]:
+        with self._lock:
+            if self._ready:
+                deck = self._buffer[self._head].tolist()
+                self._head = (self._head + 1) % self.size
+                self._ready -= 1
+                self.dealt += 1
+                if self.size - self._ready >= self.batch_size:
+                    self._space.notify()
+                return deck
+            self.misses += 1
+            return shuffled_decks(self._inline_rng, 1)[0].tolist()
+
+    def run(self):
+        while True:
+            with self._lock:
+                while not self._stopping and self.size - self._ready < self.batch_size:
+                    self._space.wait()
+                if self._stopping:
+                    return
+            # Shuffle outside the lock; only this thread adds decks, so the
+            # space checked above is still free when the batch is stored
+            batch = shuffled_decks(self._rng, self.batch_size)
+            with self._lock:
+                tail = (self._head + self._ready) % self.size
+                first = min(self.batch_size, self.size - tail)
+                self._buffer[tail:tail + first] = batch[:first]
+                self._buffer[:self.batch_size - first] = batch[first:]
+                self._ready += self.batch_size
+                self.refills += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "size": self.size,
+                "ready": self._ready,
+                "batch_size": self.batch_size,
+                "dealt": self.dealt,
+                "refills": self.refills,
+                "misses": self.misses,
+            }
+
+deck_pool = DeckPool()
@@ -0,0 +1,344 @@
+"""All-in equity calculation.
+
+Monte Carlo rollouts are evaluated with the vectorized batch evaluator in
+chunks that run on a ``ProcessPoolExecutor``, so equity requests never block
+the FastAPI event loop. Sampling stops at whichever comes first: the
+iteration budget, the time budget, or every player's 95% confidence interval
+narrowing below the target half-width.
+
+When few runouts remain (turn and river all-ins) every runout is enumerated
+instead. Exact results are memoized in a bounded LRU keyed by the
+suit-isomorphic canonical form of the hole cards and board, so e.g. AhKh vs
+QdQc on a given board shares its entry with AsKs vs QhQd on the suit-swapped
+board.
+
+Heads-up preflop equity comes straight from the memory-mapped
+``preflop_tables`` when they are available.
+"""
+import asyncio
+import math
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import combinations, permutations
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cache import LRUCache
+from hand_evaluator import evaluate_batch
+from preflop_tables import get_preflop_tables
+
+CHUNK_SIZE = 2000
+Z_95 = 1.96
+EXACT_RUNOUT_LIMIT = 20000
+EXACT_CACHE_SIZE = 4096
+
+_SUIT_PERMUTATIONS = list(permutations(range(4)))
+
+CanonicalKey = Tuple[Tuple[Tuple[int, int], ...], Tuple[int, ...]]
+
+@dataclass
+class EquityResult:
+    equities: List[float]
+    wins: Optional[List[float]]
+    ties: Optional[List[float]]
+    iterations: int
+    elapsed: float
+    method: str = "monte_carlo"
+    confidence_interval: Optional[float] = None
+    workers: int = 1
+
+def validate_cards(holes: Sequence[Sequence[int]], board: Sequence[int]):
+    """Raise ValueError unless the hole cards and board form a legal deal"""
+    if len(holes) < 2:
+        raise ValueError("Equity needs at least two hands")
+    if any(len(hole) != 2 for hole in holes):
+        raise ValueError("Every hand must have exactly two hole cards")
+    if len(board) > 5:
+        raise ValueError("The board has at most five cards")
+    cards = [card for hole in holes for card in hole] + list(board)
+    if any(card < 0 or card > 51 for card in cards):
+        raise ValueError("Card codes must be between 0 and 51")
+    if len(set(cards)) != len(cards):
+        raise ValueError("Cards must not repeat")
+
+def rollout_chunk(
+    holes: Sequence[Sequence[int]],
+    board: Sequence[int],
+    iterations: int,
+    seed: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """Play out random boards and accumulate each player's pot shares.
+
+    Returns the per-player sums of pot shares, squared shares and outright
+    wins, plus the number of rollouts played.
+    """
+    rng = np.random.default_rng(seed)
+    used = {card for hole in holes for card in hole} | set(board)
+    deck = np.array([card for card in range(52) if card not in used], dtype=np.int64)
+    missing = 5 - len(board)
+
+    boards = np.tile(np.asarray(board, dtype=np.int64), (iterations, 1))
+    if missing:
+        picks = rng.random((iterations, len(deck))).argpartition(missing, axis=1)[:, :missing]
+        boards = np.concatenate([boards, deck[picks]], axis=1)
+
+    strengths = np.stack([
+        evaluate_batch(np.concatenate([np.tile(np.asarray(hole, dtype=np.int64), (iterations, 1)), boards], axis=1))
+        for hole in holes
+    ])
+    winners = strengths == strengths.max(axis=0)
+    counts = winners.sum(axis=0)
+    shares = winners / counts
+    outright = (winners & (counts == 1)).sum(axis=1)
+    return shares.sum(axis=1), (shares ** 2).sum(axis=1), outright, iterations
+
+def enumerate_runouts(
+    holes: Sequence[Sequence[int]],
+    board: Sequence[int],
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Play out every possible runout of the board.
+
+    Returns the per-player sums of pot shares and outright wins, plus the
+    number of runouts.
+    """
+    used = {card for hole in holes for card in hole} | set(board)
+    deck = [card for card in range(52) if card not in used]
+    missing = 5 - len(board)
+
+    runouts = list(combinations(deck, missing))
+    runouts = np.array(runouts, dtype=np.int64).reshape(len(runouts), missing)
+    boards = np.concatenate([np.tile(np.asarray(board, dtype=np.int64), (len(runouts), 1)), runouts], axis=1)
+    strengths = np.stack([
+        evaluate_batch(np.concatenate([np.tile(np.asarray(hole, dtype=np.int64), (len(boards), 1)), boards], axis=1))
+        for hole in holes
+    ])
+    winners = strengths == strengths.max(axis=0)
+    counts = winners.sum(axis=0)
+    shares = winners / counts
+    outright = (winners & (counts == 1)).sum(axis=1)
+    return shares.sum(axis=1), outright, len(boards)
+
+def remaining_runouts(holes: Sequence[Sequence[int]], board: Sequence[int]) -> int:
+    """Number of distinct board runouts left to deal"""
+    return math.comb(52 - 2 * len(holes) - len(board), 5 - len(board))
+
+def canonicalize(
+    holes: Sequence[Sequence[int]],
+    board: Sequence[int],
+) -> Tuple[CanonicalKey, List[int]]:
+    """Map a deal to its suit-isomorphic canonical form.
+
+    Equity is unchanged by relabelling suits, by the order of the board
+    cards and by the order of the players, so the key is the smallest form
+    over all 24 suit permutations with sorted hands and board. Also returns
+    each original player's position in the canonical key.
+    """
+    best = None
+    for perm in _SUIT_PERMUTATIONS:
+        mapped = [
+            tuple(sorted(((card & ~3) | perm[card & 3] for card in hole), reverse=True))
+            for hole in holes
+        ]
+        mapped_board = tuple(sorted((card & ~3) | perm[card & 3] for card in board))
+        key = (tuple(sorted(mapped)), mapped_board)
+        if best is None or key < best[0]:
+            best = (key, mapped)
+    key, mapped = best
+    return key, [key[0].index(hole) for hole in mapped]
+
+def summarize(
+    share_sums: np.ndarray,
+    square_sums: np.ndarray,
+    win_sums: np.ndarray,
+    iterations: int,
+) -> Tuple[List[float], List[float], List[float], float]:
+    """Turn accumulated rollout sums into equities and the widest 95% CI"""
+    equities = share_sums / iterations
+    variances = np.maximum(square_sums / iterations - equities ** 2, 0.0)
+    half_width = float(Z_95 * np.sqrt(variances / iterations).max())
+    wins = win_sums / iterations
+    return equities.tolist(), wins.tolist(), (equities - wins).tolist(), half_width
+
+class EquityCalculator:
+    """Exact and Monte Carlo equity calculator backed by a process pool"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        exact_runout_limit: int = EXACT_RUNOUT_LIMIT,
+        cache_size: int = EXACT_CACHE_SIZE,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.exact_runout_limit = exact_runout_limit
+        self.exact_cache = LRUCache(cache_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Created lazily so importing the module never spawns processes
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def prefers_exact(self, holes: Sequence[Sequence[int]], board: Sequence[int]) -> bool:
+        """Whether enumerating every runout is cheaper than sampling"""
+        return remaining_runouts(holes, board) <= self.exact_runout_limit
+
+    async def calculate(
+        self,
+        holes: Sequence[Sequence[int]],
+        board: Sequence[int] = (),
+        mode: str = "auto",
+        **sampling_options,
+    ) -> EquityResult:
+        """Calculate equities, choosing exact enumeration or sampling.
+
+        ``mode`` is ``"auto"``, ``"exact"``, ``"monte_carlo"`` or
+        ``"preflop_table"``; the remaining keyword arguments are passed to
+        :meth:`monte_carlo`.
+        """
+        if mode not in ("auto", "exact", "monte_carlo", "preflop_table"):
+            raise ValueError(f"Unknown equity mode: {mode}")
+        if mode == "preflop_table":
+            return self.preflop_table(holes, board)
+        if mode == "exact" or (mode == "auto" and self.prefers_exact(holes, board)):
+            return await self.exact(holes, board)
+        if mode == "auto" and not board and len(holes) == 2 and get_preflop_tables():
+            return self.preflop_table(holes, board)
+        return await self.monte_carlo(holes, board, **sampling_options)
+
+    def preflop_table(
+        self,
+        holes: Sequence[Sequence[int]],
+        board: Sequence[int] = (),
+    ) -> EquityResult:
+        """Look up preflop equity by starting-hand class"""
+        validate_cards(holes, board)
+        if board:
+            raise ValueError("Preflop tables only apply before the flop")
+        tables = get_preflop_tables()
+        if tables is None:
+            raise ValueError("Preflop equity tables are not available")
+        start = time.perf_counter()
+        return EquityResult(
+            equities=tables.showdown_equities(holes),
+            wins=None,
+            ties=None,
+            iterations=tables.rollouts,
+            elapsed=time.perf_counter() - start,
+            method="preflop_table",
+        )
+
+    async def exact(
+        self,
+        holes: Sequence[Sequence[int]],
+        board: Sequence[int] = (),
+    ) -> EquityResult:
+        """Enumerate every runout, memoizing results by canonical deal.
+
+        Deals with more than ``exact_runout_limit`` runouts are refused, so
+        asking for exact equity cannot bypass the sampling budgets.
+        """
+        validate_cards(holes, board)
+        runouts = remaining_runouts(holes, board)
+        if runouts > self.exact_runout_limit:
+            raise ValueError(
+                f"Exact equity would enumerate {runouts} runouts (limit {self.exact_runout_limit}); use monte_carlo"
+            )
+        start = time.perf_counter()
+        key, positions = canonicalize(holes, board)
+
+        cached = self.exact_cache.get(key)
+        if cached is None:
+            canonical_holes = [list(hole) for hole in key[0]]
+            share_sums, win_sums, runouts = await asyncio.get_running_loop().run_in_executor(
+                self.executor, enumerate_runouts, canonical_holes, list(key[1])
+            )
+            cached = (
+                (share_sums / runouts).tolist(),
+                (win_sums / runouts).tolist(),
+                runouts,
+            )
+            self.exact_cache.put(key, cached)
+
+        equities, wins, runouts = cached
+        return EquityResult(
+            equities=[equities[i] for i in positions],
+            wins=[wins[i] for i in positions],
+            ties=[equities[i] - wins[i] for i in positions],
+            iterations=runouts,
+            elapsed=time.perf_counter() - start,
+            method="exact",
+            confidence_interval=0.0,
+            workers=self.max_workers,
+        )
+
+    async def monte_carlo(
+        self,
+        holes: Sequence[Sequence[int]],
+        board: Sequence[int] = (),
+        max_iterations: int = 100000,
+        time_budget: float = 0.5,
+        target_ci: float = 0.005,
+    ) -> EquityResult:
+        """Estimate equities with rollouts spread across the process pool"""
+        validate_cards(holes, board)
+        if max_iterations < 1:
+            raise ValueError("The iteration budget must be positive")
+        holes = [list(hole) for hole in holes]
+        board = list(board)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+
+        share_sums = np.zeros(len(holes))
+        square_sums = np.zeros(len(holes))
+        win_sums = np.zeros(len(holes))
+        iterations = 0
+        half_width = math.inf
+
+        while iterations < max_iterations:
+            remaining = max_iterations - iterations
+            wave = [
+                min(CHUNK_SIZE, remaining - i * CHUNK_SIZE)
+                for i in range(self.max_workers)
+                if remaining - i * CHUNK_SIZE > 0
+            ]
+            results = await asyncio.gather(*[
+                loop.run_in_executor(
+                    self.executor, rollout_chunk, holes, board, size, secrets.randbits(64)
+                )
+                for size in wave
+            ])
+            for shares, squares, wins, count in results:
+                share_sums += shares
+                square_sums += squares
+                win_sums += wins
+                iterations += count
+
+            equities, win_rates, tie_rates, half_width = summarize(
+                share_sums, square_sums, win_sums, iterations
+            )
+            if half_width <= target_ci or time.perf_counter() - start >= time_budget:
+                break
+
+        return EquityResult(
+            equities=equities,
+            wins=win_rates,
+            ties=tie_rates,
+            iterations=iterations,
+            elapsed=time.perf_counter() - start,
+            confidence_interval=half_width,
+            workers=self.max_workers,
+        )
+
+equity_calculator = EquityCalculator()
@@ -2,36 +2,110 @@ import random
 import uuid
 from typing import List, Dict, Any, Optional, Tuple
 from models import Player, Action, Hand, GameState
-from pokerkit import Card, Hand as PokerHand, NoLimitTexasHoldem, Automation
+from hand_evaluator import evaluate, hand_class, format_cards
+from preflop_tables import get_preflop_tables, MAX_PLAYERS
+from deck_provider import deck_pool
+from pots import Pot, PotLedger, resolve_pots, total_payouts
 
 class CustomDeck:
-    """Custom deck implementation to avoid pokerkit Deck issues"""
-    def __init__(self):
-        self.cards = []
-        self._create_deck()
-        self.shuffle()
+    """Custom deck implementation to avoid pokerkit Deck issues
     
-    def _create_deck(self):
-        """Create a standard 52-card deck"""
-        suits = ['h', 'd', 'c', 's']  # hearts, diamonds, clubs, spades
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
-        
-        for suit in suits:
-            for rank in ranks:
-                self.cards.append(f"{rank}{suit}")
-    
-    def shuffle(self):
-        """Shuffle the deck"""
-        random.shuffle(self.cards)
+    Cards are the evaluator's integer codes (0-51, see hand_evaluator), in
+    the shuffled order given by a deck provider (see deck_provider);
+    ``dealt`` is the 64-bit mask of the cards drawn so far.
+    """
+    def __init__(self, cards: Optional[List[int]] = None):
+        self.cards = cards if cards is not None else deck_pool.next_deck()
+        self.dealt = 0
     
-    def draw(self) -> str:
+    def draw(self) -> int:
         """Draw a card from the deck"""
         if not self.cards:
             raise ValueError("No cards left in deck")
-        return self.cards.pop()
+        card = self.cards.pop()
+        self.dealt |= 1 << card
+        return card
+
+class BettingLedger:
+    """Betting state of the current street, kept up to date action by action
+    
+    Tracks the highest bet, how many players are still in the hand or
+    all-in, how many players still have to act, and how many can act but
+    have not matched the highest bet. Building the ledger for a street is
+    O(n); recording an action is O(1), except when the highest bettor
+    folds, which never happens within a normal betting round.
+    
+    A player has to act until they act after the latest raise. ``round``
+    counts raises, and ``acted_round[i]`` is the round in which player i
+    last acted.
+    """
+    def __init__(self, players: List[Player]):
+        self.acted_round = [-1] * len(players)
+        self.round = 0
+        self.start_street(players)
+    
+    def start_street(self, players: List[Player]):
+        """Recount everything from the players, e.g. after blinds or a new street"""
+        self.round += 1
+        self.active_count = sum(1 for p in players if p.is_active)
+        self.all_in_count = sum(1 for p in players if p.is_active and p.is_all_in)
+        self.to_act_count = self.can_act_count
+        self._recount_bets(players)
+    
+    def _recount_bets(self, players: List[Player]):
+        self.max_bet = max((p.current_bet for p in players if p.is_active), default=0)
+        self.unmatched_count = sum(
+            1 for p in players if p.is_active and not p.is_all_in and p.current_bet < self.max_bet
+        )
+    
+    @property
+    def can_act_count(self) -> int:
+        """Players still in the hand who are not all-in"""
+        return self.active_count - self.all_in_count
+    
+    def must_act(self, index: int) -> bool:
+        return self.acted_round[index] != self.round
+    
+    def record(self, players: List[Player], index: int, previous_bet: int):
+        """Account for an action players[index] has just made"""
+        player = players[index]
+        if self.must_act(index):
+            self.to_act_count -= 1
+        if previous_bet < self.max_bet:
+            self.unmatched_count -= 1
+        self.acted_round[index] = self.round
+        
+        if not player.is_active:
+            self.active_count -= 1
+            if player.current_bet == self.max_bet:
+                # The highest bet left the hand; recount against the bets still in it
+                self._recount_bets(players)
+            return
+        if player.is_all_in:
+            self.all_in_count += 1
+        
+        if player.current_bet > self.max_bet:
+            # A raise: everyone else who can still act has to act again
+            self.max_bet = player.current_bet
+            self.round += 1
+            self.acted_round[index] = self.round
+            self.to_act_count = self.can_act_count - (0 if player.is_all_in else 1)
+            self.unmatched_count = self.to_act_count
+        elif player.current_bet < self.max_bet and not player.is_all_in:
+            self.unmatched_count += 1
+    
+    def is_street_complete(self) -> bool:
+        if self.active_count <= 1:
+            return True
+        if self.unmatched_count:
+            return False
+        # Nobody left to act, or no one left to bet against
+        return self.to_act_count == 0 or self.can_act_count <= 1
 
 class PokerGame:
-    def __init__(self):
+    def __init__(self, deck_provider=None):
+        # Anything with next_deck(); a SeededDeckProvider makes hands reproducible
+        self.deck_provider = deck_provider or deck_pool
         self.deck = None
         self.community_cards = []
         self.pot = 0
@@ -43,19 +117,40 @@ class PokerGame:
         self.min_bet = 40  # Big blind
         self.last_raise_amount = 0
         self.actions = []
+        self.players = []
+        self.ledger = BettingLedger([])
+        self.pot_ledger = PotLedger(0)
+        self.hand_id = None
+        # Append-only log of the current hand (see hand_replay): the deck
+        # and seats it started from, then every action and deal that took
+        # effect, then the showdown payouts
+        self.events: List[Dict[str, Any]] = []
+        # State version: bumped by every change, so readers can tell when
+        # anything they cached is stale. state_id tells game instances apart.
+        self.state_id = uuid.uuid4().hex
+        self.version = 0
+        self.hand_version = 0
+        self.action_versions = []
         
-    def start_new_hand(self, players: List[Player]) -> str:
+    def start_new_hand(self, players: List[Player], hand_id: Optional[str] = None) -> str:
         """Start a new hand and return hand_id"""
-        hand_id = str(uuid.uuid4())
+        hand_id = hand_id or str(uuid.uuid4())
         
         # Reset game state
-        self.deck = CustomDeck()
+        self.deck = CustomDeck(self.deck_provider.next_deck())
+        self.events = []
+        deck = list(self.deck.cards)
+        seats = [{"name": p.name, "stack": p.stack} for p in players]
         self.community_cards = []
         self.pot = 0
         self.current_street = "preflop"
         self.current_player_index = 0
         self.last_raise_amount = 0
         self.actions = []
+        self.action_versions = []
+        self.players = players
+        self.pot_ledger = PotLedger(len(players))
+        self.hand_id = hand_id
         
         # Rotate positions
         self.dealer_index = (self.dealer_index + 1) % len(players)
@@ -80,16 +175,33 @@ class PokerGame:
         small_blind_player.current_bet = small_blind_amount
         big_blind_player.stack -= big_blind_amount
         big_blind_player.current_bet = big_blind_amount
+        # A blind can take a short stack's last chips
+        small_blind_player.is_all_in = small_blind_player.stack == 0
+        big_blind_player.is_all_in = big_blind_player.stack == 0
         
         self.pot = small_blind_amount + big_blind_amount
+        self.pot_ledger.add(self.small_blind_index, small_blind_amount)
+        self.pot_ledger.add(self.big_blind_index, big_blind_amount)
         self.min_bet = big_blind_amount
         
         # Set current player to first after big blind
         self.current_player_index = (self.big_blind_index + 1) % len(players)
         
+        self.ledger = BettingLedger(players)
+        self._log_event({
+            "type": "start",
+            "hand_id": hand_id,
+            "deck": deck,
+            "seats": seats,
+            "dealer_index": self.dealer_index,
+            "small_blind": small_blind_amount,
+            "big_blind": big_blind_amount
+        })
+        self._bump_version()
+        self.hand_version = self.version
         return hand_id
     
-    def deal_flop(self, players: List[Player]) -> List[str]:
+    def deal_flop(self, players: List[Player]) -> List[int]:
         """Deal the flop"""
         if self.current_street != "preflop":
             return self.community_cards
@@ -100,58 +212,84 @@ class PokerGame:
             self.deck.draw()
         ]
         self.current_street = "flop"
-        self.current_player_index = (self.dealer_index + 1) % len(players)
+        self._log_event({"type": "deal", "street": "flop", "cards": list(self.community_cards)})
         self.min_bet = 40
         self.last_raise_amount = 0
         
         # Reset current bets for new street
         for player in players:
             player.current_bet = 0
+        self.ledger.start_street(players)
+        self._first_to_act(players)
             
+        self._bump_version()
         return self.community_cards
     
-    def deal_turn(self, players: List[Player]) -> str:
+    def deal_turn(self, players: List[Player]) -> Optional[int]:
         """Deal the turn"""
         if self.current_street != "flop":
             return None
             
         self.community_cards.append(self.deck.draw())
         self.current_street = "turn"
-        self.current_player_index = (self.dealer_index + 1) % len(players)
+        self._log_event({"type": "deal", "street": "turn", "cards": self.community_cards[-1:]})
         self.min_bet = 40
         self.last_raise_amount = 0
         
         # Reset current bets for new street
         for player in players:
             player.current_bet = 0
+        self.ledger.start_street(players)
+        self._first_to_act(players)
             
+        self._bump_version()
         return self.community_cards[-1]
     
-    def deal_river(self, players: List[Player]) -> str:
+    def deal_river(self, players: List[Player]) -> Optional[int]:
         """Deal the river"""
         if self.current_street != "turn":
             return None
             
         self.community_cards.append(self.deck.draw())
         self.current_street = "river"
-        self.current_player_index = (self.dealer_index + 1) % len(players)
+        self._log_event({"type": "deal", "street": "river", "cards": self.community_cards[-1:]})
         self.min_bet = 40
         self.last_raise_amount = 0
         
         # Reset current bets for new street
         for player in players:
             player.current_bet = 0
+        self.ledger.start_street(players)
+        self._first_to_act(players)
             
+        self._bump_version()
         return self.community_cards[-1]
     
     def make_action(self, players: List[Player], player_index: int, action_type: str, amount: int = 0) -> bool:
         """Make a player action"""
+        if not self._apply_action(players, player_index, action_type, amount):
+            return False
+        self._log_event({
+            "type": "action",
+            "player_index": player_index,
+            "action_type": action_type,
+            "amount": amount
+        })
+        return True
+    
+    def _apply_action(self, players: List[Player], player_index: int, action_type: str, amount: int) -> bool:
         if player_index != self.current_player_index:
             return False
             
         player = players[player_index]
         if not player.is_active or player.is_all_in:
             return False
+        # With nothing to raise, raising is just betting (and needs a full bet);
+        # facing a bet, betting is raising (and needs a full raise)
+        if action_type == "raise" and self.ledger.max_bet == 0:
+            action_type = "bet"
+        elif action_type == "bet" and self.ledger.max_bet > 0:
+            action_type = "raise"
             
         action = Action(
             player_name=player.name,
@@ -159,28 +297,36 @@ class PokerGame:
             amount=amount,
             street=self.current_street
         )
+        previous_bet = player.current_bet
         
         if action_type == "fold":
             player.is_active = False
-            self.actions.append(action)
+            self._record_action(action)
+            self.ledger.record(players, player_index, previous_bet)
             self._next_player(players)
             return True
             
         elif action_type == "check":
             if self._can_check(players):
-                self.actions.append(action)
+                self._record_action(action)
+                self.ledger.record(players, player_index, previous_bet)
                 self._next_player(players)
                 return True
             return False
             
         elif action_type == "call":
             call_amount = self._get_call_amount(players, player)
-            if call_amount <= player.stack:
+            # With nothing to call, the action is a check
+            if 0 < call_amount <= player.stack:
                 player.stack -= call_amount
                 player.current_bet += call_amount
+                # Calling with the whole stack puts the player all-in
+                player.is_all_in = player.stack == 0
                 self.pot += call_amount
+                self.pot_ledger.add(player_index, call_amount)
                 action.amount = call_amount
-                self.actions.append(action)
+                self._record_action(action)
+                self.ledger.record(players, player_index, previous_bet)
                 self._next_player(players)
                 return True
             return False
@@ -189,11 +335,14 @@ class PokerGame:
             if amount >= self.min_bet and amount <= player.stack:
                 player.stack -= amount
                 player.current_bet += amount
+                player.is_all_in = player.stack == 0
                 self.pot += amount
+                self.pot_ledger.add(player_index, amount)
                 self.min_bet = amount
                 self.last_raise_amount = amount
                 action.amount = amount
-                self.actions.append(action)
+                self._record_action(action)
+                self.ledger.record(players, player_index, previous_bet)
                 self._next_player(players)
                 return True
             return False
@@ -203,11 +352,14 @@ class PokerGame:
             if amount >= min_raise and amount <= player.stack:
                 player.stack -= amount
                 player.current_bet += amount
+                player.is_all_in = player.stack == 0
                 self.pot += amount
+                self.pot_ledger.add(player_index, amount)
                 self.min_bet = amount
                 self.last_raise_amount = amount
                 action.amount = amount
-                self.actions.append(action)
+                self._record_action(action)
+                self.ledger.record(players, player_index, previous_bet)
                 self._next_player(players)
                 return True
             return False
@@ -218,51 +370,103 @@ class PokerGame:
             player.current_bet += all_in_amount
             player.is_all_in = True
             self.pot += all_in_amount
+            self.pot_ledger.add(player_index, all_in_amount)
             action.amount = all_in_amount
-            self.actions.append(action)
+            self._record_action(action)
+            self.ledger.record(players, player_index, previous_bet)
             self._next_player(players)
             return True
             
         return False
     
+    def _log_event(self, event: Dict[str, Any]):
+        self.events.append(event)
+    
+    def _record_action(self, action: Action):
+        """Append an action and bump the state version"""
+        self.actions.append(action)
+        self._bump_version()
+    
+    def _bump_version(self):
+        """Mark the state changed, stamping new actions with the new version"""
+        self.version += 1
+        unstamped = len(self.actions) - len(self.action_versions)
+        self.action_versions.extend([self.version] * unstamped)
+    
+    def actions_since(self, version: int) -> List[Action]:
+        """Actions of the current hand recorded after ``version``"""
+        return [a for a, v in zip(self.actions, self.action_versions) if v > version]
+    
     def _can_check(self, players: List[Player]) -> bool:
         """Check if current player can check"""
         current_player = players[self.current_player_index]
-        max_bet = max(p.current_bet for p in players if p.is_active)
-        return current_player.current_bet >= max_bet
+        return current_player.current_bet >= self.ledger.max_bet
     
     def _get_call_amount(self, players: List[Player], player: Player) -> int:
         """Get amount needed to call"""
-        max_bet = max(p.current_bet for p in players if p.is_active)
-        return max_bet - player.current_bet
+        return self.ledger.max_bet - player.current_bet
     
     def _get_min_raise(self, players: List[Player]) -> int:
         """Get minimum raise amount"""
-        max_bet = max(p.current_bet for p in players if p.is_active)
-        return max_bet + self.last_raise_amount
+        return self.ledger.max_bet + self.last_raise_amount
+    
+    def _first_to_act(self, players: List[Player]):
+        """Open a street with the first player left of the button who can still act"""
+        self.current_player_index = (self.dealer_index + 1) % len(players)
+        player = players[self.current_player_index]
+        if not player.is_active or player.is_all_in:
+            self._next_player(players)
     
     def _next_player(self, players: List[Player]):
-        """Move to next active player"""
-        while True:
+        """Move to next active player, staying put if nobody can act"""
+        if self.ledger.can_act_count == 0:
+            return
+        for _ in range(len(players)):
             self.current_player_index = (self.current_player_index + 1) % len(players)
             if players[self.current_player_index].is_active and not players[self.current_player_index].is_all_in:
                 break
     
+    def legal_actions(self, players: List[Player], player_index: int) -> Dict[str, Any]:
+        """Actions open to a player, with the amounts ``make_action`` accepts for them"""
+        player = players[player_index]
+        if player_index != self.current_player_index or not player.is_active or player.is_all_in:
+            return {}
+        
+        actions: Dict[str, Any] = {"fold": {}}
+        call_amount = self._get_call_amount(players, player)
+        if call_amount <= 0:
+            actions["check"] = {}
+        elif call_amount <= player.stack:
+            actions["call"] = {"amount": call_amount}
+        # Facing a bet, only raising is open
+        if self.ledger.max_bet == 0 and self.min_bet <= player.stack:
+            actions["bet"] = {"min": self.min_bet, "max": player.stack}
+        min_raise = self._get_min_raise(players)
+        if self.ledger.max_bet > 0 and min_raise <= player.stack:
+            actions["raise"] = {"min": min_raise, "max": player.stack}
+        if player.stack > 0:
+            actions["all_in"] = {"amount": player.stack}
+        return actions
+    
     def is_hand_complete(self, players: List[Player]) -> bool:
-        """Check if current street is complete"""
-        active_players = [p for p in players if p.is_active]
-        if len(active_players) <= 1:
-            return True
-            
-        # Check if all active players have matched bets
-        max_bet = max(p.current_bet for p in active_players)
-        for player in active_players:
-            if not player.is_all_in and player.current_bet < max_bet:
-                return False
-        return True
+        """Check if current street is complete: everyone still able to act has acted and matched the highest bet"""
+        return self.ledger.is_street_complete()
     
     def evaluate_winner(self, players: List[Player]) -> Dict[str, Any]:
-        """Evaluate and return winner(s) using pokerkit"""
+        """Evaluate and return winner(s) using the lookup-table evaluator"""
+        stacks = [p.stack for p in players]
+        result = self._evaluate_winner(players)
+        # Preflop winners are drawn at random, so replays apply the payouts
+        # rather than evaluating again
+        self._log_event({
+            "type": "showdown",
+            "payouts": [p.stack - stack for p, stack in zip(players, stacks)]
+        })
+        return result
+    
+    def _evaluate_winner(self, players: List[Player]) -> Dict[str, Any]:
+        # Awarding the pot changes stacks however the winner is found
+        self._bump_version()
         active_players = [p for p in players if p.is_active]
         
         if len(active_players) == 1:
@@ -275,129 +479,50 @@ class PokerGame:
                 "hand_rank": "No showdown"
             }
         
-        # Use pokerkit for proper hand evaluation
         try:
-            # Create pokerkit state for evaluation
-            state = NoLimitTexasHoldem.create_state(
-                (
-                    Automation.ANTE_POSTING,
-                    Automation.BET_COLLECTION,
-                    Automation.BLIND_OR_STRADDLE_POSTING,
-                    Automation.HOLE_CARDS_SHOWING_OR_MUCKING,
-                    Automation.HAND_KILLING,
-                    Automation.CHIPS_PUSHING,
-                    Automation.CHIPS_PULLING,
-                ),
-                True,  # Uniform antes
-                0,  # No antes
-                (20, 40),  # Blinds
-                40,  # Min bet
-                [p.stack + p.current_bet for p in active_players],  # Stacks
-                len(active_players),  # Number of players
-            )
-            
-            # Deal hole cards to active players
-            for player in active_players:
-                hole_cards = ''.join(player.cards)
-                state.deal_hole(hole_cards)
-            
-            # Deal community cards if available
-            if len(self.community_cards) >= 3:
-                # Deal flop
-                flop_cards = ''.join(self.community_cards[:3])
-                state.burn_card()
-                state.deal_board(flop_cards)
-                
-                if len(self.community_cards) >= 4:
-                    # Deal turn
-                    state.burn_card()
-                    state.deal_board(self.community_cards[3])
-                    
-                    if len(self.community_cards) >= 5:
-                        # Deal river
-                        state.burn_card()
-                        state.deal_board(self.community_cards[4])
-            
-            # Get hand rankings
-            hand_rankings = []
-            for i, player in enumerate(active_players):
-                try:
-                    # Get player's hand evaluation
-                    player_hand = state.hole_cards[i]
-                    if len(self.community_cards) >= 3:
-                        # Create 7-card hand for evaluation
-                        all_cards = player.cards + self.community_cards
-                        hand = PokerHand.from_cards(all_cards)
-                        hand_rankings.append({
-                            'player': player.name,
-                            'hand': hand,
-                            'rank': hand.rank,
-                            'cards': player.cards
-                        })
-                    else:
-                        # Preflop - use hole cards only
-                        hand_rankings.append({
-                            'player': player.name,
-                            'hand': None,
-                            'rank': 0,
-                            'cards': player.cards
-                        })
-                except Exception as e:
-                    print(f"Error evaluating hand for {player.name}: {e}")
-                    hand_rankings.append({
-                        'player': player.name,
-                        'hand': None,
-                        'rank': 0,
-                        'cards': player.cards
-                    })
-            
             # Find winner(s)
             if len(self.community_cards) >= 3:
-                # Post-flop evaluation
-                best_rank = max(h['rank'] for h in hand_rankings if h['hand'] is not None)
-                winners = [h for h in hand_rankings if h['hand'] is not None and h['rank'] == best_rank]
-                
-                if len(winners) == 1:
-                    winner = winners[0]
-                    winner_player = next(p for p in active_players if p.name == winner['player'])
-                    winner_player.stack += self.pot
-                    
-                    return {
-                        "winner": winner['player'],
-                        "amount": self.pot,
-                        "reason": f"Best hand: {winner['hand'].description}",
-                        "hand_rank": winner['hand'].description,
-                        "community_cards": self.community_cards
-                    }
+                # Post-flop evaluation with the lookup-table evaluator, one
+                # ranking per player shared by every pot
+                strengths = [
+                    evaluate(p.cards + self.community_cards) if p.is_active else None
+                    for p in players
+                ]
+                result, main_pot = self._award_pots(players, strengths)
+                result["hand_rank"] = hand_class(strengths[main_pot.winners[0]])
+                result["reason"] = f"{'Split pot' if len(main_pot.winners) > 1 else 'Best hand'}: {result['hand_rank']}"
+            else:
+                # Preflop - no community cards, so rank the players by drawing
+                # them one by one, weighted by preflop equity
+                tables = get_preflop_tables()
+                if tables is None or len(active_players) > MAX_PLAYERS:
+                    equities = None
                 else:
-                    # Split pot
-                    split_amount = self.pot // len(winners)
-                    for winner in winners:
-                        winner_player = next(p for p in active_players if p.name == winner['player'])
-                        winner_player.stack += split_amount
-                    
-                    return {
-                        "winners": [w['player'] for w in winners],
-                        "amount": split_amount,
-                        "reason": f"Split pot: {winners[0]['hand'].description}",
-                        "hand_rank": winners[0]['hand'].description,
-                        "community_cards": self.community_cards
+                    equities = tables.showdown_equities(
+                        [p.cards for p in active_players]
+                    )
+                active_seats = [seat for seat, p in enumerate(players) if p.is_active]
+                strengths = [None] * len(players)
+                remaining = list(range(len(active_seats)))
+                while remaining:
+                    weights = [max(equities[i], 1e-9) for i in remaining] if equities else None
+                    drawn = random.choices(remaining, weights=weights)[0]
+                    remaining.remove(drawn)
+                    strengths[active_seats[drawn]] = len(remaining)
+                result, _ = self._award_pots(players, strengths)
+                result["hand_rank"] = "Preflop"
+                result["reason"] = "Preflop winner (no community cards)"
+                if equities is not None:
+                    result["reason"] = "Preflop winner by equity (no community cards)"
+                    result["preflop_equities"] = {
+                        p.name: equity for p, equity in zip(active_players, equities)
                     }
-            else:
-                # Preflop - random winner (no community cards)
-                winner = random.choice(active_players)
-                winner.stack += self.pot
-                
-                return {
-                    "winner": winner.name,
-                    "amount": self.pot,
-                    "reason": "Preflop winner (no community cards)",
-                    "hand_rank": "Preflop",
-                    "community_cards": self.community_cards
-                }
+            
+            result["community_cards"] = format_cards(self.community_cards)
+            return result
                 
         except Exception as e:
-            print(f"Error in pokerkit evaluation: {e}")
+            print(f"Error in hand evaluation: {e}")
             # Fallback to random winner
             winner = random.choice(active_players)
             winner.stack += self.pot
@@ -407,5 +532,50 @@ class PokerGame:
                 "amount": self.pot,
                 "reason": "Random winner (evaluation error)",
                 "hand_rank": "Error",
-                "community_cards": self.community_cards
+                "community_cards": format_cards(self.community_cards)
             }
+    
+    def _award_pots(self, players: List[Player], strengths: List[Optional[int]]) -> Tuple[Dict[str, Any], Pot]:
+        """Pay out the main and side pots by hand strength; returns the result and the main pot"""
+        contributions = self.pot_ledger.contributions[:len(players)]
+        contributions += [0] * (len(players) - len(contributions))
+        # Chips no contribution accounts for (e.g. a pot set directly) are dead money
+        dead = self.pot - sum(contributions)
+        pots = resolve_pots(
+            contributions,
+            [p.is_active for p in players],
+            strengths,
+            first_seat=(self.dealer_index + 1) % len(players),
+            dead=dead
+        )
+        payouts = total_payouts(pots)
+        for seat, amount in payouts.items():
+            players[seat].stack += amount
+        
+        # The uncalled part of the single deepest bet comes back to its owner;
+        # it is paid out but not won, so it does not make that seat a winner
+        won = dict(payouts)
+        order = sorted(range(len(players)), key=lambda seat: contributions[seat], reverse=True)
+        top, runner_up = order[0], order[1]
+        refund = contributions[top] - contributions[runner_up]
+        if refund and players[top].is_active:
+            won[top] -= refund
+            if not won[top]:
+                del won[top]
+        
+        main_pot = pots[0]
+        result: Dict[str, Any] = {}
+        if len(won) == 1:
+            seat = next(iter(won))
+            result["winner"] = players[seat].name
+            result["amount"] = won[seat]
+        else:
+            result["winners"] = [players[seat].name for seat in sorted(won)]
+            # Each main-pot winner's share; per-seat totals are in "payouts"
+            result["amount"] = main_pot.amount // len(main_pot.winners)
+        result["payouts"] = {players[seat].name: amount for seat, amount in payouts.items()}
+        result["pots"] = [
+            {"amount": pot.amount, "winners": [players[seat].name for seat in pot.winners]}
+            for pot in pots
+        ]
+        return result, main_pot
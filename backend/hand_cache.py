@@ -0,0 +1,66 @@
+"""Read-through cache for completed hands.
+
+A hand never changes once it is saved, so hand details are cached by id for
+a long time. Completed hands are added as soon as they are queued for
+writing, so they can be read before the write-behind flush reaches the
+database. The most recent history pages are cached too. Any new hand clears
+them, and so does every flush. A page read between a hand's submission and
+its flush may be missing that hand, so it must not outlive the flush.
+"""
+import os
+from typing import List, Optional
+
+from cache import LRUCache
+from models import Hand, HandHistory
+
+HAND_CACHE_SIZE = int(os.getenv("HAND_CACHE_SIZE", "10000"))
+HAND_CACHE_TTL = float(os.getenv("HAND_CACHE_TTL", "3600"))
+HISTORY_PAGE_CACHE_TTL = float(os.getenv("HISTORY_PAGE_CACHE_TTL", "30"))
+# First pages only, keyed by (limit, include_actions)
+HISTORY_PAGE_CACHE_SIZE = 32
+
+class HandCache:
+    """Hand details by id plus the most recent history pages"""
+
+    def __init__(
+        self,
+        maxsize: int = HAND_CACHE_SIZE,
+        ttl: float = HAND_CACHE_TTL,
+        page_ttl: float = HISTORY_PAGE_CACHE_TTL,
+    ):
+        self.hands = LRUCache(maxsize, ttl)
+        self.pages = LRUCache(HISTORY_PAGE_CACHE_SIZE, page_ttl)
+
+    def get_hand(self, hand_id: str) -> Optional[HandHistory]:
+        return self.hands.get(hand_id)
+
+    def put_hand(self, hand: HandHistory):
+        self.hands.put(hand.hand_id, hand)
+
+    def get_page(self, limit: int, include_actions: bool) -> Optional[List[HandHistory]]:
+        return self.pages.get((limit, include_actions))
+
+    def put_page(self, limit: int, include_actions: bool, hands: List[HandHistory]):
+        self.pages.put((limit, include_actions), hands)
+
+    def add_completed(self, hand: Hand):
+        """Cache a just-completed hand and drop the history pages it belongs on top of"""
+        self.put_hand(HandHistory(
+            hand_id=hand.hand_id,
+            players=hand.players,
+            community_cards=hand.community_cards,
+            pot_amount=hand.pot_amount,
+            winner=hand.winner or {},
+            created_at=hand.created_at,
+            actions=list(hand.actions),
+            events=hand.events,
+        ))
+        self.pages.clear()
+
+    def invalidate_pages(self):
+        self.pages.clear()
+
+    def stats(self):
+        return {"hands": self.hands.stats(), "history_pages": self.pages.stats()}
+
+hand_cache = HandCache()
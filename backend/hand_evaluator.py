@@ -0,0 +1,312 @@
+"""Lookup-table hand evaluator for Texas Hold'em.
+
+Cards are encoded as integers ``rank * 4 + suit`` (0-51), where rank runs
+from 0 (deuce) to 12 (ace) and suit indexes ``SUITS``. The game engine uses
+the same codes throughout; sets of cards fit in a 64-bit mask (``cards_mask``). A hand of 5, 6 or 7
+cards is ranked with a handful of integer operations:
+
+* every rank is mapped to a distinct prime, so the product of the primes
+  identifies the rank multiset of the hand; non-flush hands are resolved by
+  a single lookup of that product;
+* if any suit holds five or more cards the hand is a flush (nothing else can
+  beat it with seven cards), resolved by a lookup of the suit's rank bitmask.
+
+Hand strengths are dense integers in ``0..7461`` where a stronger hand has a
+greater value. They order hands exactly like pokerkit's ``StandardHighHand``
+lookup entries, whose indices are sparse.
+
+:func:`evaluate_batch` ranks whole arrays of hands with NumPy using the same
+tables, so batch results always match :func:`evaluate`.
+"""
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+RANKS = '23456789TJQKA'
+SUITS = 'hdcs'  # hearts, diamonds, clubs, spades
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+HAND_CLASSES = (
+    'High card',
+    'One pair',
+    'Two pair',
+    'Three of a kind',
+    'Straight',
+    'Flush',
+    'Full house',
+    'Four of a kind',
+    'Straight flush',
+)
+
+# Rank bitmasks of the ten straights, weakest (the wheel) first
+_STRAIGHTS = [0b1000000001111] + [0b11111 << i for i in range(9)]
+
+CARD_PRIMES = [PRIMES[card >> 2] for card in range(52)]
+CARD_BITS = [1 << (card >> 2) for card in range(52)]
+
+
+def card_to_int(card: str) -> int:
+    """Convert a card string such as ``"Ah"`` to its integer code"""
+    return RANKS.index(card[0].upper()) * 4 + SUITS.index(card[1].lower())
+
+
+def parse_cards(text: str) -> List[int]:
+    """Convert concatenated card strings such as ``"AhKd"`` to integer codes"""
+    if len(text) % 2:
+        raise ValueError(f"Invalid cards: {text}")
+    return [card_to_int(text[i:i + 2]) for i in range(0, len(text), 2)]
+
+
+def int_to_card(card: int) -> str:
+    """Convert an integer card code back to its string form"""
+    return RANKS[card >> 2] + SUITS[card & 3]
+
+
+CARD_STRINGS = [int_to_card(card) for card in range(52)]
+
+
+def format_cards(cards: Iterable[int]) -> List[str]:
+    """Convert integer card codes to card strings, e.g. for API responses"""
+    return [CARD_STRINGS[card] for card in cards]
+
+
+def cards_mask(cards: Iterable[int]) -> int:
+    """Pack integer card codes into a 64-bit set with bit ``card`` for each card"""
+    mask = 0
+    for card in cards:
+        mask |= 1 << card
+    return mask
+
+
+def _descending(bits: int) -> Tuple[int, ...]:
+    return tuple(rank for rank in range(12, -1, -1) if bits & (1 << rank))
+
+
+def _build_five_card_tables() -> Tuple[Dict[int, int], Dict[int, int], List[int]]:
+    """Enumerate every 5-card equivalence class in ascending strength.
+
+    Returns the flush table keyed by rank bitmask, the non-flush table keyed
+    by prime product and the first strength of each hand class.
+    """
+    distinct = [
+        bits for bits in range(1 << 13)
+        if bits.bit_count() == 5 and bits not in _STRAIGHTS
+    ]
+    distinct.sort(key=_descending)
+
+    def product(ranks: Iterable[int]) -> int:
+        result = 1
+        for rank in ranks:
+            result *= PRIMES[rank]
+        return result
+
+    def kickers(count: int, exclude: Sequence[int]) -> List[Tuple[int, ...]]:
+        ranks = [rank for rank in range(13) if rank not in exclude]
+        return sorted(
+            (tuple(sorted(combo, reverse=True)) for combo in combinations(ranks, count)),
+        )
+
+    flush: Dict[int, int] = {}
+    unsuited: Dict[int, int] = {}
+    class_starts: List[int] = []
+    strength = 0
+
+    def start_class():
+        class_starts.append(strength)
+
+    # High card
+    start_class()
+    for bits in distinct:
+        unsuited[product(_descending(bits))] = strength
+        strength += 1
+
+    # One pair
+    start_class()
+    for pair in range(13):
+        for kick in kickers(3, (pair,)):
+            unsuited[product((pair, pair) + kick)] = strength
+            strength += 1
+
+    # Two pair
+    start_class()
+    for low, high in sorted(combinations(range(13), 2), key=lambda p: (p[1], p[0])):
+        for kick in kickers(1, (high, low)):
+            unsuited[product((high, high, low, low) + kick)] = strength
+            strength += 1
+
+    # Three of a kind
+    start_class()
+    for trips in range(13):
+        for kick in kickers(2, (trips,)):
+            unsuited[product((trips,) * 3 + kick)] = strength
+            strength += 1
+
+    # Straight
+    start_class()
+    for bits in _STRAIGHTS:
+        unsuited[product(_descending(bits))] = strength
+        strength += 1
+
+    # Flush
+    start_class()
+    for bits in distinct:
+        flush[bits] = strength
+        strength += 1
+
+    # Full house
+    start_class()
+    for trips in range(13):
+        for pair in range(13):
+            if pair != trips:
+                unsuited[product((trips,) * 3 + (pair,) * 2)] = strength
+                strength += 1
+
+    # Four of a kind
+    start_class()
+    for quads in range(13):
+        for kick in kickers(1, (quads,)):
+            unsuited[product((quads,) * 4 + kick)] = strength
+            strength += 1
+
+    # Straight flush
+    start_class()
+    for bits in _STRAIGHTS:
+        flush[bits] = strength
+        strength += 1
+
+    return flush, unsuited, class_starts
+
+
+def _build_tables() -> Tuple[List[int], Dict[int, int], List[int]]:
+    """Extend the 5-card tables to every 6- and 7-card rank combination"""
+    flush5, unsuited5, class_starts = _build_five_card_tables()
+
+    # Flush table indexed directly by the 13-bit rank mask of the flush suit
+    flush = [-1] * (1 << 13)
+    for bits in range(1 << 13):
+        count = bits.bit_count()
+        if count == 5:
+            flush[bits] = flush5[bits]
+        elif count in (6, 7):
+            flush[bits] = max(
+                flush[bits & ~(1 << rank)] for rank in range(13) if bits & (1 << rank)
+            )
+
+    # Non-flush table: the best hand of n cards is the best of its n-1 subsets
+    unsuited = dict(unsuited5)
+    previous = {product: list(_ranks_of(product)) for product in unsuited5}
+    for _ in (6, 7):
+        current = {}
+        for product, ranks in previous.items():
+            for rank in range(13):
+                if ranks.count(rank) < 4:
+                    current.setdefault(product * PRIMES[rank], ranks + [rank])
+        for product, ranks in current.items():
+            unsuited[product] = max(
+                unsuited[product // PRIMES[rank]] for rank in set(ranks)
+            )
+        previous = current
+
+    return flush, unsuited, class_starts
+
+
+def _ranks_of(product: int) -> Iterable[int]:
+    for rank, prime in enumerate(PRIMES):
+        while product % prime == 0:
+            product //= prime
+            yield rank
+
+
+FLUSH_TABLE, UNSUITED_TABLE, _CLASS_STARTS = _build_tables()
+
+# Array views of the same tables for vectorized batch evaluation
+_FLUSH_ARRAY = np.array(FLUSH_TABLE, dtype=np.int16)
+_UNSUITED_KEYS = np.array(sorted(UNSUITED_TABLE), dtype=np.int64)
+_UNSUITED_RANKS = np.array([UNSUITED_TABLE[key] for key in _UNSUITED_KEYS.tolist()], dtype=np.int16)
+_CARD_PRIMES_ARRAY = np.array(CARD_PRIMES, dtype=np.int64)
+_CARD_BITS_ARRAY = np.array(CARD_BITS, dtype=np.int32)
+_POPCOUNT = np.array([bits.bit_count() for bits in range(1 << 13)], dtype=np.int8)
+_CLASS_STARTS_ARRAY = np.array(_CLASS_STARTS, dtype=np.int16)
+
+
+def evaluate(cards: Sequence[int]) -> int:
+    """Return the strength of the best 5-card hand made from 5-7 cards"""
+    product = 1
+    hearts = diamonds = clubs = spades = 0
+    for card in cards:
+        product *= CARD_PRIMES[card]
+        suit = card & 3
+        if suit == 0:
+            hearts |= CARD_BITS[card]
+        elif suit == 1:
+            diamonds |= CARD_BITS[card]
+        elif suit == 2:
+            clubs |= CARD_BITS[card]
+        else:
+            spades |= CARD_BITS[card]
+
+    for bits in (hearts, diamonds, clubs, spades):
+        if bits.bit_count() >= 5:
+            return FLUSH_TABLE[bits]
+    return UNSUITED_TABLE[product]
+
+
+def hand_class(strength: int) -> str:
+    """Return the hand class description for a strength value"""
+    for index in range(len(_CLASS_STARTS) - 1, -1, -1):
+        if strength >= _CLASS_STARTS[index]:
+            return HAND_CLASSES[index]
+    raise ValueError(f"Invalid hand strength: {strength}")
+
+
+def evaluate_hand(cards: Iterable[Union[str, int]]) -> Tuple[int, str]:
+    """Rank a hand given as card strings or integer codes.
+
+    Returns a ``(strength, description)`` tuple.
+    """
+    codes = [card if isinstance(card, int) else card_to_int(card) for card in cards]
+    if not 5 <= len(codes) <= 7 or len(set(codes)) != len(codes):
+        raise ValueError(f"Invalid hand: {codes}")
+    strength = evaluate(codes)
+    return strength, hand_class(strength)
+
+
+def evaluate_batch(hands: np.ndarray, board: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rank many hands at once with vectorized table lookups.
+
+    ``hands`` is an ``(n, k)`` array of integer card codes. An optional
+    ``board`` of shared cards is appended to every hand; the combined hands
+    must hold 5-7 distinct cards each. Returns an ``int16`` array of
+    strengths identical to :func:`evaluate`.
+    """
+    hands = np.asarray(hands, dtype=np.int64)
+    if hands.ndim != 2:
+        raise ValueError("Hands must be a 2-dimensional array of card codes")
+    if board is not None and len(board):
+        board = np.asarray(board, dtype=np.int64).reshape(1, -1)
+        hands = np.concatenate([hands, np.repeat(board, len(hands), axis=0)], axis=1)
+    if not 5 <= hands.shape[1] <= 7:
+        raise ValueError(f"Hands must have 5-7 cards, got {hands.shape[1]}")
+    if hands.size and (hands.min() < 0 or hands.max() > 51):
+        raise ValueError("Card codes must be between 0 and 51")
+    ordered = np.sort(hands, axis=1)
+    if np.any(ordered[:, 1:] == ordered[:, :-1]):
+        raise ValueError("Hands must not contain duplicate cards")
+
+    products = np.prod(_CARD_PRIMES_ARRAY[hands], axis=1)
+    strengths = _UNSUITED_RANKS[np.searchsorted(_UNSUITED_KEYS, products)]
+
+    # Each rank appears at most once per suit, so summing bits is an OR
+    bits = _CARD_BITS_ARRAY[hands]
+    suits = hands & 3
+    for suit in range(4):
+        mask = np.where(suits == suit, bits, 0).sum(axis=1)
+        flushes = _POPCOUNT[mask] >= 5
+        strengths = np.where(flushes, _FLUSH_ARRAY[mask], strengths)
+    return strengths
+
+
+def hand_class_batch(strengths: np.ndarray) -> np.ndarray:
+    """Return the ``HAND_CLASSES`` index of each strength"""
+    return np.searchsorted(_CLASS_STARTS_ARRAY, strengths, side='right') - 1
@@ -0,0 +1,72 @@
+"""Streaming export of hand history as NDJSON or CSV.
+
+Hands are read through a server-side cursor (``HandRepository.iter_hand_chunks``)
+and formatted a chunk at a time, so memory stays flat however large the
+history is. NDJSON output can be fed straight back into ``hand_import``.
+
+    python hand_export.py --format csv > hands.csv
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+EXPORT_CHUNK_SIZE = int(os.getenv("HAND_EXPORT_CHUNK_SIZE", "1000"))
+
+CSV_COLUMNS = ["hand_id", "created_at", "pot_amount", "community_cards", "players", "winner", "actions"]
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def ndjson_chunks(chunks: Iterable[List[Dict]]) -> Iterator[str]:
+    """One NDJSON text block per chunk of records"""
+    for records in chunks:
+        yield "".join(json.dumps(record) + "\n" for record in records)
+
+def csv_chunks(chunks: Iterable[List[Dict]]) -> Iterator[str]:
+    """A header line, then one CSV text block per chunk; nested fields are JSON"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue()
+    for records in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        for record in records:
+            writer.writerow([
+                record["hand_id"],
+                record["created_at"],
+                record["pot_amount"],
+                " ".join(record["community_cards"]),
+                json.dumps(record["players"]),
+                json.dumps(record["winner"]),
+                json.dumps(record["actions"]),
+            ])
+        yield buffer.getvalue()
+
+def format_chunks(chunks: Iterable[List[Dict]], export_format: str) -> Iterator[str]:
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    return ndjson_chunks(chunks) if export_format == "ndjson" else csv_chunks(chunks)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    from repositories.hand_repository import HandRepository
+    chunks = HandRepository().iter_hand_chunks(args.chunk_size, args.since, args.until)
+    for text in format_chunks(chunks, args.format):
+        sys.stdout.write(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Bulk import of historical hands.
+
+Input is newline-delimited JSON, one hand per line, in the shape the hand
+history endpoints return plus the hand's actions::
+
+    {"hand_id": "...", "players": [...], "community_cards": ["Ah", ...],
+     "pot_amount": 120, "winner": {...}, "created_at": "2024-01-31T12:00:00",
+     "actions": [{"player_name": "Alice", "action_type": "call", "amount": 20, "street": "preflop"}]}
+
+An optional ``events`` list (the ``PokerGame`` event log) is stored too, so
+imported hands can be replayed.
+
+Every record is checked against that shape as it is read, so a malformed
+one is rejected with its line number before anything reaches the database.
+Hands are loaded in chunks. ``HandRepository.import_hands`` COPYs each chunk
+into staging tables and merges it with ``ON CONFLICT (hand_id) DO NOTHING``,
+so re-running an import is safe. A hand_id repeated within a chunk keeps its
+first record only. Each chunk commits on its own.
+
+    python hand_import.py hands.ndjson
+    python hand_import.py - < hands.ndjson
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+IMPORT_CHUNK_SIZE = int(os.getenv("HAND_IMPORT_CHUNK_SIZE", "10000"))
+
+REQUIRED_FIELDS = ("hand_id", "players", "community_cards", "pot_amount")
+HAND_ID_MAX_LENGTH = 50
+# Limits of the columns rows are COPYed into; past them Postgres rejects the whole chunk
+ACTION_MAX_LENGTHS = {"player_name": 100, "action_type": 20, "street": 20}
+INTEGER_RANGE = (-2 ** 31, 2 ** 31 - 1)
+
+# Field -> accepted types, for the records read back into Player and Action
+PLAYER_SCHEMA = {"name": (str,), "stack": (int,), "cards": (list,), "is_active": (bool,),
+                 "is_all_in": (bool,), "current_bet": (int,)}
+PLAYER_REQUIRED = ("name", "stack", "cards")
+ACTION_SCHEMA = {"player_name": (str,), "action_type": (str,), "amount": (int, type(None)), "street": (str,)}
+ACTION_REQUIRED = ("player_name", "action_type")
+
+def _is_a(value: Any, types: tuple) -> bool:
+    # bool is an int subclass, but True is not a stack
+    return isinstance(value, types) and not (isinstance(value, bool) and bool not in types)
+
+def _check_integer(value: Any, where: str):
+    if not INTEGER_RANGE[0] <= value <= INTEGER_RANGE[1]:
+        raise ValueError(f"{where} is out of range for an integer column")
+
+def _check_object(value: Any, schema: Dict[str, tuple], required: tuple, where: str, max_lengths: Optional[Dict[str, int]] = None):
+    if not isinstance(value, dict):
+        raise ValueError(f"{where} must be an object")
+    missing = [field for field in required if field not in value]
+    if missing:
+        raise ValueError(f"{where} is missing {', '.join(missing)}")
+    for field, item in value.items():
+        if field not in schema:
+            raise ValueError(f"{where} has unknown field {field}")
+        if not _is_a(item, schema[field]):
+            raise ValueError(f"{where}.{field} has the wrong type")
+        limit = (max_lengths or {}).get(field)
+        if limit is not None and len(item) > limit:
+            raise ValueError(f"{where}.{field} is longer than {limit} characters")
+
+def validate_record(record: Dict[str, Any]):
+    """Raise ValueError naming the first field of a hand record that does not fit the schema"""
+    hand_id = record["hand_id"]
+    if not isinstance(hand_id, str) or not 0 < len(hand_id) <= HAND_ID_MAX_LENGTH:
+        raise ValueError(f"hand_id must be a string of 1 to {HAND_ID_MAX_LENGTH} characters")
+    if not isinstance(record["players"], list):
+        raise ValueError("players must be a list")
+    for index, player in enumerate(record["players"]):
+        _check_object(player, PLAYER_SCHEMA, PLAYER_REQUIRED, f"players[{index}]")
+    if not isinstance(record["community_cards"], list) or not all(isinstance(c, str) for c in record["community_cards"]):
+        raise ValueError("community_cards must be a list of strings")
+    if not _is_a(record["pot_amount"], (int,)):
+        raise ValueError("pot_amount must be an integer")
+    _check_integer(record["pot_amount"], "pot_amount")
+    if record.get("winner") is not None and not isinstance(record["winner"], dict):
+        raise ValueError("winner must be an object")
+    created_at = record.get("created_at")
+    if created_at is not None:
+        try:
+            datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise ValueError("created_at must be an ISO 8601 timestamp")
+    events = record.get("events")
+    if events is not None and (not isinstance(events, list) or not all(isinstance(e, dict) for e in events)):
+        raise ValueError("events must be a list of objects")
+    actions = record.get("actions")
+    if actions is not None:
+        if not isinstance(actions, list):
+            raise ValueError("actions must be a list")
+        for index, action in enumerate(actions):
+            _check_object(action, ACTION_SCHEMA, ACTION_REQUIRED, f"actions[{index}]", ACTION_MAX_LENGTHS)
+            if action.get("amount") is not None:
+                _check_integer(action["amount"], f"actions[{index}].amount")
+
+def parse_hand_line(line: str, number: int) -> Optional[Dict[str, Any]]:
+    """Parse one NDJSON line; returns None for a blank line"""
+    if not line.strip():
+        return None
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Line {number}: invalid JSON ({e.msg})")
+    if not isinstance(record, dict):
+        raise ValueError(f"Line {number}: expected a JSON object")
+    missing = [field for field in REQUIRED_FIELDS if field not in record]
+    if missing:
+        raise ValueError(f"Line {number}: missing {', '.join(missing)}")
+    try:
+        validate_record(record)
+    except ValueError as e:
+        raise ValueError(f"Line {number} (hand {record['hand_id']}): {e}")
+    return record
+
+def iter_ndjson(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Parse NDJSON lines, skipping blank ones"""
+    for number, line in enumerate(lines, 1):
+        record = parse_hand_line(line, number)
+        if record is not None:
+            yield record
+
+def chunked(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def unique_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The records with each hand_id's first occurrence only"""
+    seen = set()
+    unique = []
+    for record in records:
+        if record["hand_id"] not in seen:
+            seen.add(record["hand_id"])
+            unique.append(record)
+    return unique
+
+def hand_rows(records: List[Dict[str, Any]]) -> Iterator[list]:
+    """Rows for the hands staging table"""
+    for record in records:
+        yield [
+            record["hand_id"],
+            json.dumps(record["players"]),
+            json.dumps(record["community_cards"]),
+            record["pot_amount"],
+            json.dumps(record["winner"]) if record.get("winner") else None,
+            record.get("created_at"),
+            json.dumps(record["events"]) if record.get("events") else None,
+        ]
+
+def action_rows(records: List[Dict[str, Any]]) -> Iterator[list]:
+    """Rows for the actions staging table, numbered to keep each hand's order"""
+    for record in records:
+        for seq, action in enumerate(record.get("actions") or []):
+            yield [
+                record["hand_id"],
+                seq,
+                action["player_name"],
+                action["action_type"],
+                action.get("amount"),
+                action.get("street", "preflop"),
+            ]
+
+class CopyStream(io.TextIOBase):
+    """File-like CSV view of a row iterator, read lazily by ``copy_expert``"""
+
+    def __init__(self, rows: Iterable[list]):
+        self._rows = iter(rows)
+        self._buffer = io.StringIO()
+        # Numbers go out unquoted and everything else quoted; None becomes "",
+        # which the COPY statements turn into NULL with FORCE_NULL
+        self._writer = csv.writer(self._buffer, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+        self._pending = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self, size: int):
+        while size < 0 or len(self._pending) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(row)
+            self._pending += self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
+    def read(self, size: Optional[int] = -1) -> str:
+        size = -1 if size is None else size
+        self._fill(size)
+        if size < 0:
+            chunk, self._pending = self._pending, ""
+        else:
+            chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+def import_file(stream, chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict[str, Any]:
+    """Import every hand in an NDJSON text stream"""
+    from repositories.hand_repository import HandRepository
+    repository = HandRepository()
+    totals = {"read": 0, "hands_inserted": 0, "actions_inserted": 0}
+    start = time.perf_counter()
+    for chunk in chunked(iter_ndjson(stream), chunk_size):
+        result = repository.import_hands(chunk)
+        if result is None:
+            raise RuntimeError(f"Import failed after {totals['read']} hands")
+        totals["read"] += len(chunk)
+        totals["hands_inserted"] += result[0]
+        totals["actions_inserted"] += result[1]
+    totals["elapsed"] = time.perf_counter() - start
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="NDJSON file of hands, or - for stdin")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.path == "-":
+        totals = import_file(sys.stdin, args.chunk_size)
+    else:
+        with open(args.path, encoding="utf-8") as stream:
+            totals = import_file(stream, args.chunk_size)
+    rate = totals["read"] / totals["elapsed"] if totals["elapsed"] else 0
+    print(f"read {totals['read']} hands, inserted {totals['hands_inserted']} hands and "
+          f"{totals['actions_inserted']} actions in {totals['elapsed']:.1f}s ({rate:.0f} hands/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Rebuild past hands from their event logs.
+
+``PokerGame`` logs every hand as it is played (``PokerGame.events``). The
+start event records the deck order, seats, stacks and button. Each later
+event is an action or deal that took effect, and the last event holds the
+showdown payouts. Replaying the events through a fresh ``PokerGame``
+gives the exact state after any of them.
+
+``HandReplay`` keeps a copy of the game every ``snapshot_interval``
+events. A state is rebuilt from the nearest earlier copy, so any step
+costs at most ``snapshot_interval`` events, however long the hand.
+"""
+import copy
+import os
+from typing import Any, Dict, List
+
+from cache import LRUCache
+from game_logic import PokerGame
+from hand_evaluator import format_cards
+from models import Player
+
+REPLAY_SNAPSHOT_INTERVAL = int(os.getenv("REPLAY_SNAPSHOT_INTERVAL", "8"))
+REPLAY_CACHE_SIZE = int(os.getenv("REPLAY_CACHE_SIZE", "256"))
+
+class FixedDeckProvider:
+    """Deals the same deck every hand, e.g. the one a start event recorded"""
+
+    def __init__(self, deck: List[int]):
+        self.deck = deck
+
+    def next_deck(self) -> List[int]:
+        return list(self.deck)
+
+def apply_event(game: PokerGame, event: Dict[str, Any]):
+    """Apply one logged event to ``game``; raises ValueError if it does not fit the game's state"""
+    kind = event["type"]
+    if kind == "start":
+        players = [Player(seat["name"], seat["stack"], []) for seat in event["seats"]]
+        # start_new_hand moves the button on by one seat
+        game.dealer_index = (event["dealer_index"] - 1) % len(players)
+        deck_provider, game.deck_provider = game.deck_provider, FixedDeckProvider(event["deck"])
+        try:
+            game.start_new_hand(players, hand_id=event["hand_id"])
+        finally:
+            game.deck_provider = deck_provider
+    elif kind == "action":
+        if not game.make_action(game.players, event["player_index"], event["action_type"], event["amount"]):
+            raise ValueError(f"Logged action was rejected on replay: {event}")
+    elif kind == "deal":
+        dealt = len(game.community_cards)
+        getattr(game, f"deal_{event['street']}")(game.players)
+        if game.community_cards[dealt:] != event["cards"]:
+            raise ValueError(f"Logged {event['street']} does not match the deck")
+    elif kind == "showdown":
+        for player, amount in zip(game.players, event["payouts"]):
+            player.stack += amount
+        game._log_event(event)
+        game._bump_version()
+    else:
+        raise ValueError(f"Unknown event type: {kind}")
+
+def public_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """An event as clients see it: cards as strings, and no deck order, which would reveal cards never dealt"""
+    public = {key: value for key, value in event.items() if key != "deck"}
+    if "cards" in public:
+        public["cards"] = format_cards(public["cards"])
+    return public
+
+class HandReplay:
+    """Game states of one logged hand, rebuilt on demand from periodic snapshots"""
+
+    def __init__(self, events: List[Dict[str, Any]], snapshot_interval: int = REPLAY_SNAPSHOT_INTERVAL):
+        if snapshot_interval < 1:
+            raise ValueError("snapshot_interval must be positive")
+        self.events = events
+        self.snapshot_interval = snapshot_interval
+        # Step -> game after that many events; filled in as steps are visited
+        self._snapshots: Dict[int, PokerGame] = {0: PokerGame(deck_provider=FixedDeckProvider([]))}
+
+    @property
+    def steps(self) -> int:
+        return len(self.events)
+
+    def state_at(self, step: int) -> PokerGame:
+        """A new game in the state after the first ``step`` events"""
+        if not 0 <= step <= self.steps:
+            raise ValueError(f"step must be between 0 and {self.steps}")
+        base = step - step % self.snapshot_interval
+        while base not in self._snapshots:
+            base -= self.snapshot_interval
+        game = copy.deepcopy(self._snapshots[base])
+        for index in range(base, step):
+            apply_event(game, self.events[index])
+            if (index + 1) % self.snapshot_interval == 0 and index + 1 not in self._snapshots:
+                self._snapshots[index + 1] = copy.deepcopy(game)
+        return game
+
+# Replays of recently viewed hands, keyed by hand_id
+replay_cache = LRUCache(REPLAY_CACHE_SIZE)
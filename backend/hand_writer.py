@@ -0,0 +1,180 @@
+"""Write-behind persistence for completed hands.
+
+``complete_hand`` queues its hand and returns without waiting for the
+database. A background task collects queued hands and writes them in group
+commits: a batch is flushed once it holds ``batch_size`` hands or its oldest
+hand has waited ``flush_interval`` seconds. When the queue is full,
+``submit`` waits for room. That backpressure slows the tables down instead
+of letting memory grow without bound. Stopping the writer drains the queue
+first.
+
+A batch that fails to save is retried ``retries`` times, waiting
+``retry_delay`` seconds and doubling the wait each time; hands written
+through without the background task get a single attempt. Saving is
+idempotent, so a retry cannot duplicate hands. A batch that still fails is
+appended to the ``dead_letter`` file as NDJSON, which
+``python hand_import.py <file>`` replays. Without a dead-letter file, the
+records are printed instead.
+"""
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+from models import Hand
+from hand_cache import HandCache, hand_cache
+from repositories.async_hand_repository import AsyncHandRepository, async_hand_repository
+from serialization import dumps, hand_dict
+
+HAND_WRITE_BATCH_SIZE = int(os.getenv("HAND_WRITE_BATCH_SIZE", "200"))
+HAND_WRITE_FLUSH_INTERVAL = float(os.getenv("HAND_WRITE_FLUSH_INTERVAL", "0.05"))
+HAND_WRITE_QUEUE_SIZE = int(os.getenv("HAND_WRITE_QUEUE_SIZE", "10000"))
+HAND_WRITE_RETRIES = int(os.getenv("HAND_WRITE_RETRIES", "3"))
+HAND_WRITE_RETRY_DELAY = float(os.getenv("HAND_WRITE_RETRY_DELAY", "0.5"))
+HAND_WRITE_DEAD_LETTER = os.getenv("HAND_WRITE_DEAD_LETTER") or None
+
+def hand_record(hand: Hand) -> bytes:
+    """One NDJSON line in the hand_import format, event log included so replays survive"""
+    record = hand_dict(hand)
+    record["events"] = hand.events
+    return dumps(record) + b"\n"
+
+class HandWriter:
+    """Background queue that batches hand inserts into group commits"""
+
+    def __init__(
+        self,
+        repository: AsyncHandRepository = async_hand_repository,
+        batch_size: int = HAND_WRITE_BATCH_SIZE,
+        flush_interval: float = HAND_WRITE_FLUSH_INTERVAL,
+        max_queue: int = HAND_WRITE_QUEUE_SIZE,
+        cache: Optional[HandCache] = None,
+        retries: int = HAND_WRITE_RETRIES,
+        retry_delay: float = HAND_WRITE_RETRY_DELAY,
+        dead_letter: Optional[str] = HAND_WRITE_DEAD_LETTER,
+    ):
+        self.repository = repository
+        self.cache = cache
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.dead_letter = dead_letter
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Metrics
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.backpressure_waits = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self):
+        """Start the background flush task on the running event loop"""
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Flush everything still queued, then stop the background task"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        # New hands are written directly from here on; the sentinel ends the run loop
+        await self._queue.put(None)
+        await task
+
+    async def submit(self, hand: Hand):
+        """Queue a completed hand, waiting for room if the queue is full"""
+        self.submitted += 1
+        if self.cache is not None:
+            # Readable right away, before the batch reaches the database
+            self.cache.add_completed(hand)
+        if not self.running:
+            # No background task (e.g. outside the app lifespan): write through,
+            # without retries, since the request is waiting
+            await self._flush([hand], retries=0)
+            return
+        if self._queue.full():
+            self.backpressure_waits += 1
+        await self._queue.put(hand)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            hand = await self._queue.get()
+            if hand is None:
+                break
+            batch = [hand]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if self._queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        hand = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    hand = self._queue.get_nowait()
+                if hand is None:
+                    stopping = True
+                    break
+                batch.append(hand)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Hand], retries: Optional[int] = None):
+        retries = self.retries if retries is None else retries
+        delay = self.retry_delay
+        for attempt in range(retries + 1):
+            if await self.repository.save_hands(batch):
+                self.written += len(batch)
+                break
+            if attempt < retries:
+                self.retried += 1
+                await asyncio.sleep(delay)
+                delay *= 2
+        else:
+            self.failed += len(batch)
+            self._dead_letter(batch)
+        self.batches += 1
+        if self.cache is not None:
+            # Pages read before this flush may be missing these hands
+            self.cache.invalidate_pages()
+
+    def _dead_letter(self, batch: List[Hand]):
+        """Keep a batch that could not be saved where it can be replayed from"""
+        hand_ids = ", ".join(hand.hand_id for hand in batch)
+        lines = b"".join(hand_record(hand) for hand in batch)
+        if self.dead_letter:
+            try:
+                with open(self.dead_letter, "ab") as f:
+                    f.write(lines)
+                self.dead_lettered += len(batch)
+                print(f"Error saving hands {hand_ids}; appended to {self.dead_letter} for replay")
+                return
+            except OSError as e:
+                print(f"Error writing dead-letter file {self.dead_letter}: {e}")
+        print(f"Error saving hands {hand_ids}; unsaved records follow:\n{lines.decode()}", end="")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "submitted": self.submitted,
+            "written": self.written,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "batches": self.batches,
+            "backpressure_waits": self.backpressure_waits,
+        }
+
+hand_writer = HandWriter(cache=hand_cache)
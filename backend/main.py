@@ -1,16 +1,43 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import os
-from database import init_db
-from routers import game_router, hand_router
+from database import init_db, open_pool, close_pool, get_pool
+from routers import game_router, hand_router, eval_router
+from equity import equity_calculator
+from preflop_tables import load_preflop_tables
+from table_registry import table_registry
+from repositories.async_hand_repository import async_hand_repository
+from hand_writer import hand_writer
+from hand_cache import hand_cache
+from deck_provider import deck_pool
+from table_wal import WAL_DIR, table_wal
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    open_pool()
     await init_db()
+    # Map the preflop equity tables once; workers share the page cache
+    load_preflop_tables()
+    eviction_task = asyncio.create_task(table_registry.run_eviction())
+    hand_writer.start()
+    deck_pool.start()
+    # Reopen the tables that were live when the server last stopped
+    if WAL_DIR:
+        recovered = table_wal.recover(table_registry)
+        print(f"Recovered {recovered} tables from the write-ahead log")
     yield
     # Shutdown
+    eviction_task.cancel()
+    table_wal.close()
+    deck_pool.stop()
+    # Drain queued hands while the repository and pool are still open
+    await hand_writer.stop()
+    equity_calculator.shutdown()
+    async_hand_repository.shutdown()
+    close_pool()
 
 app = FastAPI(
     title="Poker Game API",
@@ -30,8 +57,35 @@ app.add_middleware(
 
 # Include routers
 app.include_router(game_router.router, prefix="/api/game", tags=["game"])
+app.include_router(game_router.tables_router, prefix="/api/tables", tags=["tables"])
 app.include_router(hand_router.router, prefix="/api/hands", tags=["hands"])
+app.include_router(eval_router.router, prefix="/api/eval", tags=["eval"])
 
 @app.get("/")
 async def root():
     return {"message": "Poker Game API is running"}
+
+@app.get("/api/db/pool")
+async def db_pool_stats():
+    """Database connection pool metrics"""
+    return get_pool().stats()
+
+@app.get("/api/db/writer")
+async def hand_writer_stats():
+    """Write-behind hand queue metrics"""
+    return hand_writer.stats()
+
+@app.get("/api/db/cache")
+async def hand_cache_stats():
+    """Hand detail and history page cache hit/miss counters"""
+    return hand_cache.stats()
+
+@app.get("/api/decks/pool")
+async def deck_pool_stats():
+    """Pre-shuffled deck pool metrics"""
+    return deck_pool.stats()
+
+@app.get("/api/tables/wal")
+async def table_wal_stats():
+    """Write-ahead log metrics: records, fsyncs, segments and compactions"""
+    return table_wal.stats()
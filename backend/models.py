@@ -1,24 +1,24 @@
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     name: str
     stack: int
-    cards: List[str]
+    cards: List[Union[int, str]]  # Integer codes in a live game, strings once saved
     is_active: bool = True
     is_all_in: bool = False
     current_bet: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     player_name: str
     action_type: str  # fold, check, call, bet, raise, all_in
     amount: Optional[int] = None
     street: str = "preflop"  # preflop, flop, turn, river
 
-@dataclass
+@dataclass(slots=True)
 class Hand:
     hand_id: str
     players: List[Player]
@@ -28,6 +28,7 @@ class Hand:
     actions: List[Action] = None
     winner: Optional[Dict[str, Any]] = None
     created_at: datetime = None
+    events: Optional[List[Dict[str, Any]]] = None  # PokerGame event log, for replay
     
     def __post_init__(self):
         if self.actions is None:
@@ -35,7 +36,7 @@ class Hand:
         if self.created_at is None:
             self.created_at = datetime.now()
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     players: List[Player]
     community_cards: List[str]
@@ -49,7 +50,7 @@ class GameState:
     last_raise_amount: int
     actions: List[Action]
 
-@dataclass
+@dataclass(slots=True)
 class HandHistory:
     hand_id: str
     players: List[Player]
@@ -57,3 +58,6 @@ class HandHistory:
     pot_amount: int
     winner: Dict[str, Any]
     created_at: datetime
+    id: Optional[int] = None  # Row id, the tiebreaker in page cursors
+    actions: Optional[List[Action]] = None  # Only loaded when asked for
+    events: Optional[List[Dict[str, Any]]] = None  # Only kept for hands cached on completion
@@ -0,0 +1,108 @@
+"""Main and side pots.
+
+``PotLedger`` records how many chips each seat has put in over the whole
+hand. ``resolve_pots`` splits those chips into pots by contribution level
+and awards each pot to the best hand among the live seats that paid into
+it. It makes one pass over the seats, from the largest contribution down.
+Every seat that has paid at least the current level is in that layer, so
+the set of eligible seats only grows. The best hand so far is updated as
+each seat joins, so every seat's hand is ranked once for all the pots.
+
+Odd chips from a split go one at a time to the winners closest to the left
+of the button.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+@dataclass
+class Pot:
+    amount: int
+    eligible: List[int]  # Seats that can win this pot
+    winners: List[int]  # In odd-chip order
+    payouts: Dict[int, int] = field(default_factory=dict)
+
+class PotLedger:
+    """Chips each seat has put into the pot this hand"""
+
+    def __init__(self, seats: int):
+        self.contributions = [0] * seats
+
+    def add(self, seat: int, amount: int):
+        self.contributions[seat] += amount
+
+    @property
+    def total(self) -> int:
+        return sum(self.contributions)
+
+def resolve_pots(
+    contributions: Sequence[int],
+    live: Sequence[bool],
+    strengths: Sequence[Optional[int]],
+    first_seat: int = 0,
+    dead: int = 0,
+) -> List[Pot]:
+    """Split the contributions into pots, main pot first, and award each one.
+
+    ``live`` marks seats still in the hand and ``strengths`` holds one hand
+    strength per live seat (greater is better). Chips are split
+    odd-chip-first starting at ``first_seat``, the seat left of the button.
+    ``dead`` chips that no seat's contribution accounts for go into the main
+    pot.
+    """
+    seats = len(contributions)
+    order = sorted(range(seats), key=lambda seat: contributions[seat], reverse=True)
+    layers: List[Pot] = []
+    eligible: List[int] = []
+    winners: List[int] = []
+    best = None
+    carry = 0  # Chips in layers above every live seat's contribution
+    k = 0
+    while k < seats and contributions[order[k]] > 0:
+        level = contributions[order[k]]
+        joined = False
+        while k < seats and contributions[order[k]] == level:
+            seat = order[k]
+            k += 1
+            if live[seat]:
+                joined = True
+                eligible.append(seat)
+                if best is None or strengths[seat] > best:
+                    best, winners = strengths[seat], [seat]
+                elif strengths[seat] == best:
+                    winners.append(seat)
+        lower = contributions[order[k]] if k < seats else 0
+        amount = (level - lower) * k + carry
+        if not eligible:
+            carry = amount
+        elif layers and not joined:
+            layers[-1].amount += amount
+        else:
+            layers.append(Pot(amount, list(eligible), list(winners)))
+            carry = 0
+
+    if dead:
+        if layers:
+            layers[-1].amount += dead
+        else:
+            live_seats = [seat for seat in range(seats) if live[seat]]
+            best = max(strengths[seat] for seat in live_seats)
+            layers.append(Pot(dead, live_seats, [s for s in live_seats if strengths[s] == best]))
+
+    pots = layers[::-1]
+    for pot in pots:
+        pot.eligible.sort()
+        pot.winners.sort(key=lambda seat: (seat - first_seat) % seats)
+        share, odd_chips = divmod(pot.amount, len(pot.winners))
+        pot.payouts = {
+            seat: share + (1 if position < odd_chips else 0)
+            for position, seat in enumerate(pot.winners)
+        }
+    return pots
+
+def total_payouts(pots: List[Pot]) -> Dict[int, int]:
+    """Chips won by each seat across all pots"""
+    payouts: Dict[int, int] = {}
+    for pot in pots:
+        for seat, amount in pot.payouts.items():
+            payouts[seat] = payouts.get(seat, 0) + amount
+    return payouts
@@ -0,0 +1,150 @@
+"""Precomputed preflop equity tables.
+
+The 1326 starting hands collapse into 169 classes (13 pairs, 78 suited and
+78 offsuit hands), laid out on a 13x13 grid: pairs on the diagonal, suited
+hands above it and offsuit hands below it. ``build_preflop_tables.py``
+generates two tables once and writes them to a compact binary file:
+
+* ``heads_up[i, j]``: equity of class ``i`` against class ``j``;
+* ``multiway[i, n - 2]``: equity of class ``i`` against ``n - 1`` random
+  hands, for ``n`` from 2 to 6 players.
+
+The file is memory-mapped read-only, so lookups are O(1) array indexing and
+every uvicorn worker shares the same page-cache pages instead of holding its
+own copy.
+"""
+import mmap
+import os
+import struct
+from typing import Optional, Sequence
+
+import numpy as np
+
+from hand_evaluator import RANKS
+
+MAGIC = b"PFEQ"
+VERSION = 1
+NUM_CLASSES = 169
+MIN_PLAYERS = 2
+MAX_PLAYERS = 6
+# magic, version, class count, player-count columns, heads-up deals sampled
+HEADER = struct.Struct("<4sHHHxxQ")
+SCALE = 65535
+
+DEFAULT_TABLE_PATH = os.getenv(
+    "PREFLOP_TABLE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preflop_equity.bin"),
+)
+
+def class_index(cards: Sequence[int]) -> int:
+    """Return the 169-class index of two integer-coded hole cards"""
+    high, low = sorted((cards[0] >> 2, cards[1] >> 2), reverse=True)
+    row, col = 12 - high, 12 - low
+    if (cards[0] & 3) == (cards[1] & 3):
+        return row * 13 + col
+    return col * 13 + row
+
+def class_name(index: int) -> str:
+    """Return the conventional name of a class, e.g. ``"AKs"`` or ``"QQ"``"""
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANKS[12 - row] * 2
+    if row < col:
+        return RANKS[12 - row] + RANKS[12 - col] + "s"
+    return RANKS[12 - col] + RANKS[12 - row] + "o"
+
+def class_from_name(name: str) -> int:
+    """Return the class index for a name such as ``"AKs"``, ``"T9o"`` or ``"77"``"""
+    name = name.strip()
+    try:
+        high, low = RANKS.index(name[0].upper()), RANKS.index(name[1].upper())
+    except (IndexError, ValueError):
+        raise ValueError(f"Invalid starting hand: {name}")
+    suffix = name[2:].lower()
+    if high < low:
+        high, low = low, high
+    row, col = 12 - high, 12 - low
+    if high == low and suffix == "":
+        return row * 13 + col
+    if high != low and suffix == "s":
+        return row * 13 + col
+    if high != low and suffix == "o":
+        return col * 13 + row
+    raise ValueError(f"Invalid starting hand: {name}")
+
+def write_tables(path: str, heads_up: np.ndarray, multiway: np.ndarray, rollouts: int):
+    """Quantize equities to 16 bits and write the binary table file"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    header = HEADER.pack(MAGIC, VERSION, NUM_CLASSES, MAX_PLAYERS - MIN_PLAYERS + 1, rollouts)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(np.round(heads_up * SCALE).astype("<u2").tobytes())
+        f.write(np.round(multiway * SCALE).astype("<u2").tobytes())
+
+class PreflopTables:
+    """Read-only, memory-mapped view of the preflop equity tables"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, classes, columns, self.rollouts = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION or classes != NUM_CLASSES:
+            self._mmap.close()
+            raise ValueError(f"Not a preflop equity table file: {path}")
+
+        # Views straight into the mapped pages; nothing is copied
+        offset = HEADER.size
+        self.heads_up = np.frombuffer(self._mmap, dtype="<u2", count=classes * classes, offset=offset).reshape(classes, classes)
+        offset += classes * classes * 2
+        self.multiway = np.frombuffer(self._mmap, dtype="<u2", count=classes * columns, offset=offset).reshape(classes, columns)
+
+    def versus(self, hero: int, villain: int) -> float:
+        """Equity of class ``hero`` against class ``villain`` heads-up"""
+        return int(self.heads_up[hero, villain]) / SCALE
+
+    def against_field(self, hero: int, players: int) -> float:
+        """Equity of class ``hero`` against ``players - 1`` random hands"""
+        if not MIN_PLAYERS <= players <= MAX_PLAYERS:
+            raise ValueError(f"Players must be between {MIN_PLAYERS} and {MAX_PLAYERS}")
+        return int(self.multiway[hero, players - MIN_PLAYERS]) / SCALE
+
+    def showdown_equities(self, holes: Sequence[Sequence[int]]) -> list:
+        """Approximate equities of specific hole cards going to showdown.
+
+        Heads-up uses the class-versus-class table; multiway hands use each
+        class's equity against the field, normalized to sum to one.
+        """
+        classes = [class_index(hole) for hole in holes]
+        if len(classes) == 2:
+            first = self.versus(classes[0], classes[1])
+            return [first, 1 - first]
+        raw = [self.against_field(cls, len(classes)) for cls in classes]
+        total = sum(raw)
+        return [equity / total for equity in raw]
+
+    def close(self):
+        self.heads_up = self.multiway = None
+        self._mmap.close()
+
+_tables: Optional[PreflopTables] = None
+_load_failed = False
+
+def load_preflop_tables(path: str = DEFAULT_TABLE_PATH) -> Optional[PreflopTables]:
+    """Map the table file once per process; returns None if it is unusable"""
+    global _tables, _load_failed
+    if _tables is None:
+        try:
+            _tables = PreflopTables(path)
+            _load_failed = False
+        except (OSError, ValueError) as e:
+            print(f"Preflop equity tables unavailable: {e}")
+            _load_failed = True
+    return _tables
+
+def get_preflop_tables() -> Optional[PreflopTables]:
+    """Return the mapped tables, loading them on first use"""
+    if _tables is None and not _load_failed:
+        return load_preflop_tables()
+    return _tables
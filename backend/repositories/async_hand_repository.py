@@ -0,0 +1,103 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from database import DB_POOL_MAX_SIZE
+from models import Hand, Action, HandHistory
+from repositories.hand_repository import HandRepository
+from hand_cache import HandCache, hand_cache
+
+# One thread per pooled connection, so offloaded queries never queue for a connection
+DB_WORKERS = int(os.getenv("DB_WORKERS", str(DB_POOL_MAX_SIZE)))
+
+class AsyncHandRepository:
+    """Awaitable HandRepository.
+
+    psycopg2 blocks, so each call runs on a bounded thread pool instead of
+    the event loop; a slow history query no longer stalls every table. With
+    a ``cache``, hand details and first history pages are served from it
+    when possible.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[HandRepository] = None,
+        max_workers: int = DB_WORKERS,
+        cache: Optional[HandCache] = None
+    ):
+        self.repository = repository or HandRepository()
+        self.max_workers = max_workers
+        self.cache = cache
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db")
+        return self._executor
+
+    async def _run(self, method, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(method, *args))
+
+    async def save_hand(self, hand: Hand) -> bool:
+        """Save completed hand to database"""
+        return await self._run(self.repository.save_hand, hand)
+
+    async def save_hands(self, hands: List[Hand]) -> bool:
+        """Save a batch of completed hands in one transaction"""
+        return await self._run(self.repository.save_hands, hands)
+
+    async def import_hands(self, records: List[dict]) -> Optional[Tuple[int, int]]:
+        """Bulk-load a chunk of hand records via COPY"""
+        return await self._run(self.repository.import_hands, records)
+
+    async def get_hand_history(
+        self,
+        limit: int = 10,
+        before: Optional[Tuple[datetime, int]] = None,
+        include_actions: bool = False
+    ) -> List[HandHistory]:
+        """Get recent hand history, newest first, starting after ``before``"""
+        if self.cache is None or before is not None:
+            return await self._run(self.repository.get_hand_history, limit, before, include_actions)
+        
+        hands = self.cache.get_page(limit, include_actions)
+        if hands is None:
+            hands = await self._run(self.repository.get_hand_history, limit, before, include_actions)
+            if hands:
+                self.cache.put_page(limit, include_actions, hands)
+                if include_actions:
+                    for hand in hands:
+                        self.cache.put_hand(hand)
+        return hands
+
+    async def get_hand(self, hand_id: str) -> Optional[HandHistory]:
+        """Get one hand with its actions"""
+        hand = self.cache.get_hand(hand_id) if self.cache is not None else None
+        if hand is None:
+            hand = await self._run(self.repository.get_hand, hand_id)
+            if hand is not None and self.cache is not None:
+                self.cache.put_hand(hand)
+        return hand
+
+    async def get_hand_events(self, hand_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get a hand's event log, from the cache while the hand is in it"""
+        hand = self.cache.get_hand(hand_id) if self.cache is not None else None
+        if hand is not None and hand.events is not None:
+            return hand.events
+        return await self._run(self.repository.get_hand_events, hand_id)
+
+    async def get_hand_actions(self, hand_id: str) -> List[Action]:
+        """Get actions for a specific hand"""
+        return await self._run(self.repository.get_hand_actions, hand_id)
+
+    def shutdown(self):
+        """Wait for in-flight queries and stop the worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+async_hand_repository = AsyncHandRepository(cache=hand_cache)
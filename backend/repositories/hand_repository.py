@@ -1,134 +1,345 @@
+import base64
 import json
-from typing import List, Optional
-from database import get_db_connection
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from psycopg2.extras import execute_values
+from database import get_pool
+from hand_import import CopyStream, action_rows, hand_rows, unique_records
 from models import Hand, Action, HandHistory, Player
+from serialization import hand_row
 from datetime import datetime
 
+# Rows per multi-row INSERT statement
+BATCH_PAGE_SIZE = 1000
+
+# Each hand's actions as one JSON array, in the order they were taken
+HAND_ACTIONS_JOIN = """
+    LEFT JOIN LATERAL (
+        SELECT json_agg(json_build_object(
+                   'player_name', player_name,
+                   'action_type', action_type,
+                   'amount', amount,
+                   'street', street
+               ) ORDER BY created_at, id) AS actions
+        FROM actions
+        WHERE actions.hand_id = h.hand_id
+    ) a ON true
+"""
+
+def encode_cursor(hand: HandHistory) -> str:
+    """Opaque page cursor naming the position just after ``hand``"""
+    key = f"{hand.created_at.isoformat()}|{hand.id}"
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+    try:
+        key = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = key.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
 class HandRepository:
     def __init__(self):
         pass
     
     def save_hand(self, hand: Hand) -> bool:
         """Save completed hand to database"""
+        return self.save_hands([hand])
+    
+    def save_hands(self, hands: List[Hand]) -> bool:
+        """Save a batch of completed hands in one transaction.
+        
+        Hands and actions each go in as multi-row inserts, so a batch costs a
+        handful of round-trips however many hands and actions it holds.
+        """
+        if not hands:
+            return True
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            # Convert players to JSON
-            players_json = []
-            for player in hand.players:
-                player_dict = {
-                    "name": player.name,
-                    "stack": player.stack,
-                    "cards": player.cards,
-                    "is_active": player.is_active,
-                    "is_all_in": player.is_all_in,
-                    "current_bet": player.current_bet
-                }
-                players_json.append(player_dict)
-            
-            # Insert hand
-            cursor.execute("""
-                INSERT INTO hands (hand_id, players, community_cards, pot_amount, winner)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (hand_id) DO NOTHING
-            """, (
-                hand.hand_id,
-                json.dumps(players_json),
-                json.dumps(hand.community_cards),
-                hand.pot_amount,
-                json.dumps(hand.winner) if hand.winner else None
-            ))
-            
-            # Insert actions
-            for action in hand.actions:
-                cursor.execute("""
-                    INSERT INTO actions (hand_id, player_name, action_type, amount, street)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (
+            with get_pool().connection() as conn:
+                cursor = conn.cursor()
+                
+                # Insert hands; ids that already exist are skipped
+                inserted = execute_values(cursor, """
+                    INSERT INTO hands (hand_id, players, community_cards, pot_amount, winner, events, created_at)
+                    VALUES %s
+                    ON CONFLICT (hand_id) DO NOTHING
+                    RETURNING hand_id
+                """, [hand_row(hand) for hand in hands], page_size=BATCH_PAGE_SIZE, fetch=True)
+                new_hand_ids = {row[0] for row in inserted}
+                
+                # Insert actions of the newly saved hands only, so a retried batch adds no duplicates
+                action_rows = [(
                     hand.hand_id,
                     action.player_name,
                     action.action_type,
                     action.amount,
                     action.street
-                ))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
+                ) for hand in hands if hand.hand_id in new_hand_ids for action in hand.actions]
+                if action_rows:
+                    execute_values(cursor, """
+                        INSERT INTO actions (hand_id, player_name, action_type, amount, street)
+                        VALUES %s
+                    """, action_rows, page_size=BATCH_PAGE_SIZE)
+                
+                conn.commit()
+                cursor.close()
             return True
             
         except Exception as e:
-            print(f"Error saving hand: {e}")
+            print(f"Error saving hands: {e}")
             return False
     
-    def get_hand_history(self, limit: int = 10) -> List[HandHistory]:
-        """Get recent hand history"""
+    def import_hands(self, records: List[dict]) -> Optional[Tuple[int, int]]:
+        """Bulk-load a chunk of hand records (see hand_import) via COPY.
+        
+        Returns (hands inserted, actions inserted); hands whose id already
+        exists are skipped along with their actions, and so are later
+        records of a hand_id repeated within the chunk.
+        """
+        records = unique_records(records)
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT hand_id, players, community_cards, pot_amount, winner, created_at
-                FROM hands
-                ORDER BY created_at DESC
-                LIMIT %s
-            """, (limit,))
-            
-            hands = []
-            for row in cursor.fetchall():
-                hand_id, players_json, community_cards_json, pot_amount, winner_json, created_at = row
-                
-                # Parse JSON data
-                players_data = json.loads(players_json)
-                players = [Player(**player_data) for player_data in players_data]
-                community_cards = json.loads(community_cards_json)
-                winner = json.loads(winner_json) if winner_json else {}
+            with get_pool().connection() as conn:
+                cursor = conn.cursor()
                 
-                hand = HandHistory(
-                    hand_id=hand_id,
-                    players=players,
-                    community_cards=community_cards,
-                    pot_amount=pot_amount,
-                    winner=winner,
-                    created_at=created_at
+                # Session-local staging tables, emptied by every commit
+                cursor.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS staging_hands (
+                        hand_id VARCHAR(50),
+                        players JSONB,
+                        community_cards JSONB,
+                        pot_amount INTEGER,
+                        winner JSONB,
+                        created_at TIMESTAMP,
+                        events JSONB
+                    ) ON COMMIT DELETE ROWS
+                """)
+                cursor.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS staging_actions (
+                        hand_id VARCHAR(50),
+                        seq INTEGER,
+                        player_name VARCHAR(100),
+                        action_type VARCHAR(20),
+                        amount INTEGER,
+                        street VARCHAR(20)
+                    ) ON COMMIT DELETE ROWS
+                """)
+                cursor.copy_expert(
+                    "COPY staging_hands (hand_id, players, community_cards, pot_amount, winner, created_at, events) FROM STDIN WITH (FORMAT csv, FORCE_NULL (winner, created_at, events))",
+                    CopyStream(hand_rows(records))
+                )
+                cursor.copy_expert(
+                    "COPY staging_actions (hand_id, seq, player_name, action_type, amount, street) FROM STDIN WITH (FORMAT csv, FORCE_NULL (amount))",
+                    CopyStream(action_rows(records))
                 )
-                hands.append(hand)
+                
+                # Merge; actions follow only the hands that were actually inserted
+                cursor.execute("""
+                    WITH inserted AS (
+                        INSERT INTO hands (hand_id, players, community_cards, pot_amount, winner, created_at, events)
+                        SELECT DISTINCT ON (hand_id) hand_id, players, community_cards, pot_amount,
+                               COALESCE(winner, '{}'::jsonb), COALESCE(created_at, CURRENT_TIMESTAMP), events
+                        FROM staging_hands
+                        ORDER BY hand_id
+                        ON CONFLICT (hand_id) DO NOTHING
+                        RETURNING hand_id, created_at
+                    ), moved AS (
+                        INSERT INTO actions (hand_id, player_name, action_type, amount, street, created_at)
+                        SELECT a.hand_id, a.player_name, a.action_type, a.amount, a.street, i.created_at
+                        FROM staging_actions a
+                        JOIN inserted i USING (hand_id)
+                        ORDER BY a.hand_id, a.seq
+                        RETURNING 1
+                    )
+                    SELECT (SELECT count(*) FROM inserted), (SELECT count(*) FROM moved)
+                """)
+                hands_inserted, actions_inserted = cursor.fetchone()
+                
+                conn.commit()
+                cursor.close()
+            return hands_inserted, actions_inserted
             
-            cursor.close()
-            conn.close()
+        except Exception as e:
+            print(f"Error importing hands: {e}")
+            return None
+    
+    @staticmethod
+    def _load_json(value):
+        # psycopg2 already decodes JSONB columns; plain JSON text still needs parsing
+        return json.loads(value) if isinstance(value, (str, bytes)) else value
+    
+    def get_hand_history(
+        self,
+        limit: int = 10,
+        before: Optional[Tuple[datetime, int]] = None,
+        include_actions: bool = False
+    ) -> List[HandHistory]:
+        """Get recent hand history, newest first.
+        
+        ``before`` is the (created_at, id) key of the last hand of the
+        previous page; the index on (created_at, id) makes every page,
+        however deep, a short index range scan. With ``include_actions``
+        each hand's actions come back aggregated in the same query.
+        """
+        try:
+            with get_pool().connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute(f"""
+                    SELECT {self._hand_columns(include_actions)}
+                    FROM hands h
+                    {HAND_ACTIONS_JOIN if include_actions else ""}
+                    WHERE %(before_at)s::timestamp IS NULL OR (h.created_at, h.id) < (%(before_at)s, %(before_id)s)
+                    ORDER BY h.created_at DESC, h.id DESC
+                    LIMIT %(limit)s
+                """, {
+                    "before_at": before[0] if before else None,
+                    "before_id": before[1] if before else None,
+                    "limit": limit
+                })
+                
+                hands = [self._hand_from_row(row, include_actions) for row in cursor.fetchall()]
+                
+                cursor.close()
             return hands
             
         except Exception as e:
             print(f"Error getting hand history: {e}")
             return []
     
+    def get_hand(self, hand_id: str) -> Optional[HandHistory]:
+        """Get one hand with its actions in a single query"""
+        try:
+            with get_pool().connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute(f"""
+                    SELECT {self._hand_columns(True)}
+                    FROM hands h
+                    {HAND_ACTIONS_JOIN}
+                    WHERE h.hand_id = %s
+                """, (hand_id,))
+                row = cursor.fetchone()
+                
+                cursor.close()
+            return self._hand_from_row(row, True) if row else None
+            
+        except Exception as e:
+            print(f"Error getting hand: {e}")
+            return None
+    
+    def get_hand_events(self, hand_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get a hand's event log: [] if it was saved without one, None if there is no such hand"""
+        try:
+            with get_pool().connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute("SELECT events FROM hands WHERE hand_id = %s", (hand_id,))
+                row = cursor.fetchone()
+                
+                cursor.close()
+            if row is None:
+                return None
+            return self._load_json(row[0]) if row[0] else []
+            
+        except Exception as e:
+            print(f"Error getting hand events: {e}")
+            return None
+    
+    @staticmethod
+    def _hand_columns(include_actions: bool) -> str:
+        columns = "h.id, h.hand_id, h.players, h.community_cards, h.pot_amount, h.winner, h.created_at"
+        return columns + (", COALESCE(a.actions, '[]'::json)" if include_actions else "")
+    
+    def _hand_from_row(self, row: tuple, include_actions: bool) -> HandHistory:
+        row_id, hand_id, players_json, community_cards_json, pot_amount, winner_json, created_at = row[:7]
+        
+        # Parse JSON data
+        players_data = self._load_json(players_json)
+        players = [Player(**player_data) for player_data in players_data]
+        community_cards = self._load_json(community_cards_json)
+        winner = self._load_json(winner_json) if winner_json else {}
+        actions = [Action(**action) for action in self._load_json(row[7])] if include_actions else None
+        
+        return HandHistory(
+            hand_id=hand_id,
+            players=players,
+            community_cards=community_cards,
+            pot_amount=pot_amount,
+            winner=winner,
+            created_at=created_at,
+            id=row_id,
+            actions=actions
+        )
+    
+    def iter_hand_chunks(
+        self,
+        chunk_size: int = 1000,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Iterator[List[dict]]:
+        """Stream hands, oldest first, in chunks of export records.
+        
+        Uses a named (server-side) cursor, so only ``chunk_size`` rows are in
+        memory at a time however many hands match. Each record carries the
+        hand's actions in the format ``hand_import`` reads. Database errors
+        propagate to the caller.
+        """
+        with get_pool().connection() as conn:
+            cursor = conn.cursor(name=f"hand_export_{uuid.uuid4().hex}")
+            cursor.itersize = chunk_size
+            cursor.execute(f"""
+                SELECT h.hand_id, h.players, h.community_cards, h.pot_amount, h.winner, h.created_at,
+                       COALESCE(a.actions, '[]'::json)
+                FROM hands h
+                {HAND_ACTIONS_JOIN}
+                WHERE (%(since)s::timestamp IS NULL OR h.created_at >= %(since)s)
+                  AND (%(until)s::timestamp IS NULL OR h.created_at < %(until)s)
+                ORDER BY h.created_at, h.id
+            """, {"since": since, "until": until})
+            try:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield [{
+                        "hand_id": hand_id,
+                        "players": self._load_json(players),
+                        "community_cards": self._load_json(community_cards),
+                        "pot_amount": pot_amount,
+                        "winner": self._load_json(winner) if winner else {},
+                        "created_at": created_at.isoformat() if created_at else None,
+                        "actions": self._load_json(actions)
+                    } for hand_id, players, community_cards, pot_amount, winner, created_at, actions in rows]
+            finally:
+                cursor.close()
+    
     def get_hand_actions(self, hand_id: str) -> List[Action]:
         """Get actions for a specific hand"""
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
+            with get_pool().connection() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT player_name, action_type, amount, street, created_at
-                FROM actions
-                WHERE hand_id = %s
-                ORDER BY created_at ASC
-            """, (hand_id,))
+                cursor.execute("""
+                    SELECT player_name, action_type, amount, street, created_at
+                    FROM actions
+                    WHERE hand_id = %s
+                    ORDER BY created_at ASC, id ASC
+                """, (hand_id,))
             
-            actions = []
-            for row in cursor.fetchall():
-                player_name, action_type, amount, street, created_at = row
-                action = Action(
-                    player_name=player_name,
-                    action_type=action_type,
-                    amount=amount,
-                    street=street
-                )
-                actions.append(action)
+                actions = []
+                for row in cursor.fetchall():
+                    player_name, action_type, amount, street, created_at = row
+                    action = Action(
+                        player_name=player_name,
+                        action_type=action_type,
+                        amount=amount,
+                        street=street
+                    )
+                    actions.append(action)
             
-            cursor.close()
-            conn.close()
+                cursor.close()
             return actions
             
         except Exception as e:
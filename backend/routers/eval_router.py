@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from typing import List, Optional
+
+from hand_evaluator import evaluate_batch, hand_class_batch, HAND_CLASSES
+
+router = APIRouter()
+
+MAX_BATCH_SIZE = 100000
+
+class BatchEvalRequest(BaseModel):
+    hands: List[List[int]]
+    board: Optional[List[int]] = None
+    include_descriptions: bool = False
+
+@router.post("/batch")
+async def evaluate_hands_batch(request: BatchEvalRequest):
+    """Rank a batch of hands encoded as integer card codes (rank * 4 + suit)"""
+    if not request.hands:
+        return {"ranks": []}
+    if len(request.hands) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} hands per batch")
+    if len({len(hand) for hand in request.hands}) != 1:
+        raise HTTPException(status_code=400, detail="All hands must have the same number of cards")
+
+    try:
+        # Large batches take tens of milliseconds; keep them off the event loop
+        ranks = await run_in_threadpool(evaluate_batch, request.hands, request.board)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response = {"ranks": ranks.tolist()}
+    if request.include_descriptions:
+        response["descriptions"] = [HAND_CLASSES[i] for i in hand_class_batch(ranks).tolist()]
+    return response
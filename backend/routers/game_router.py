@@ -1,17 +1,30 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+from dataclasses import asdict, replace
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import json
+import asyncio
 
-from models import Player, GameState
+from models import Player, GameState, Hand, Action
 from game_logic import PokerGame
-from repositories.hand_repository import HandRepository
+from table_registry import table_registry, Table, TableNotFoundError, DEFAULT_TABLE_ID
+from hand_evaluator import parse_cards, format_cards
+from equity import equity_calculator
+from preflop_tables import get_preflop_tables, class_from_name, class_name
+from hand_writer import hand_writer
+from table_wal import table_wal
+from serialization import FastJSONResponse, action_dict, dumps, game_state_dict
 
+# Legacy /api/game routes play on the default table; /api/tables routes are table-scoped
 router = APIRouter()
+tables_router = APIRouter()
 
-# Global game instance (in production, this should be managed properly)
-poker_game = PokerGame()
-hand_repository = HandRepository()
+SSE_KEEPALIVE_SECONDS = 15
+# Bounds on one equity request, so a single call cannot tie up every worker
+MAX_EQUITY_ITERATIONS = 1000000
+MAX_EQUITY_TIME_BUDGET_MS = 2000
+MIN_EQUITY_TARGET_CI = 0.001
 
 class PlayerRequest(BaseModel):
     name: str
@@ -34,9 +47,43 @@ class GameStateResponse(BaseModel):
     min_bet: int
     last_raise_amount: int
     actions: List[Dict[str, Any]]
+    version: int = 0
+
+def get_table(table_id: str) -> Table:
+    """Look up a table, opening the default table on first use"""
+    if table_id == DEFAULT_TABLE_ID:
+        return table_registry.get_or_create(table_id)
+    try:
+        return table_registry.get(table_id)
+    except TableNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Table {table_id} not found")
+
+@tables_router.post("/")
+async def create_table(table_id: Optional[str] = None):
+    """Open a new table"""
+    try:
+        table = table_registry.create(table_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    await table_wal.synced()
+    return {"table_id": table.table_id}
+
+@tables_router.get("/")
+async def list_tables():
+    """List open tables"""
+    return {"tables": table_registry.table_ids()}
+
+@tables_router.delete("/{table_id}")
+async def close_table(table_id: str):
+    """Close a table"""
+    if not table_registry.remove(table_id):
+        raise HTTPException(status_code=404, detail=f"Table {table_id} not found")
+    await table_wal.synced()
+    return {"message": "Table closed"}
 
 @router.post("/start-hand")
-async def start_hand(players: List[PlayerRequest]):
+@tables_router.post("/{table_id}/start-hand")
+async def start_hand(players: List[PlayerRequest], table_id: str = DEFAULT_TABLE_ID):
     """Start a new hand with given players"""
     if len(players) < 2 or len(players) > 6:
         raise HTTPException(status_code=400, detail="Must have 2-6 players")
@@ -54,153 +101,364 @@ async def start_hand(players: List[PlayerRequest]):
         )
         player_objects.append(player)
     
-    # Start new hand
-    hand_id = poker_game.start_new_hand(player_objects)
-    
-    return {
-        "hand_id": hand_id,
-        "message": "New hand started",
-        "game_state": get_game_state_response(player_objects)
-    }
+    # Start new hand, opening the table if this is its first hand
+    table = table_registry.get_or_create(table_id)
+    async with table.lock:
+        hand_id = table.game.start_new_hand(player_objects)
+        
+        return FastJSONResponse({
+            "hand_id": hand_id,
+            "message": "New hand started",
+            "game_state": await publish_state(table, reset=True)
+        })
 
 @router.post("/action")
-async def make_action(action: ActionRequest):
+@tables_router.post("/{table_id}/action")
+async def make_action(action: ActionRequest, table_id: str = DEFAULT_TABLE_ID):
     """Make a player action"""
-    # Get current players (this should be stored in a proper way)
-    # For now, we'll use a simplified approach
-    players = get_current_players()
-    
-    if action.player_index >= len(players):
-        raise HTTPException(status_code=400, detail="Invalid player index")
-    
-    success = poker_game.make_action(players, action.player_index, action.action_type, action.amount or 0)
-    
-    if not success:
-        raise HTTPException(status_code=400, detail="Invalid action")
-    
+    table = get_table(table_id)
+    async with table.lock:
+        players = table.game.players
+        
+        if action.player_index >= len(players):
+            raise HTTPException(status_code=400, detail="Invalid player index")
+        
+        success = table.game.make_action(players, action.player_index, action.action_type, action.amount or 0)
+        
+        if not success:
+            raise HTTPException(status_code=400, detail="Invalid action")
+        
+        return FastJSONResponse({
+            "message": "Action successful",
+            "game_state": await publish_state(table)
+        })
+
+@router.get("/legal-actions")
+@tables_router.get("/{table_id}/legal-actions")
+async def get_legal_actions(table_id: str = DEFAULT_TABLE_ID):
+    """Actions the player to act may take, and whether the street is complete"""
+    game = get_table(table_id).game
+    if not game.players:
+        raise HTTPException(status_code=400, detail="No hand in progress")
     return {
-        "message": "Action successful",
-        "game_state": get_game_state_response(players)
+        "player_index": game.current_player_index,
+        "actions": game.legal_actions(game.players, game.current_player_index),
+        "street_complete": game.is_hand_complete(game.players),
+        "version": game.version
     }
 
 @router.post("/deal-flop")
-async def deal_flop():
+@tables_router.post("/{table_id}/deal-flop")
+async def deal_flop(table_id: str = DEFAULT_TABLE_ID):
     """Deal the flop"""
-    players = get_current_players()
-    community_cards = poker_game.deal_flop(players)
-    
-    return {
-        "message": "Flop dealt",
-        "community_cards": community_cards,
-        "game_state": get_game_state_response(players)
-    }
+    table = get_table(table_id)
+    async with table.lock:
+        if table.game.deck is None:
+            raise HTTPException(status_code=400, detail="No hand in progress")
+        community_cards = table.game.deal_flop(table.game.players)
+        
+        return FastJSONResponse({
+            "message": "Flop dealt",
+            "community_cards": format_cards(community_cards),
+            "game_state": await publish_state(table)
+        })
 
 @router.post("/deal-turn")
-async def deal_turn():
+@tables_router.post("/{table_id}/deal-turn")
+async def deal_turn(table_id: str = DEFAULT_TABLE_ID):
     """Deal the turn"""
-    players = get_current_players()
-    turn_card = poker_game.deal_turn(players)
-    
-    if not turn_card:
-        raise HTTPException(status_code=400, detail="Cannot deal turn at this time")
-    
-    return {
-        "message": "Turn dealt",
-        "turn_card": turn_card,
-        "game_state": get_game_state_response(players)
-    }
+    table = get_table(table_id)
+    async with table.lock:
+        turn_card = table.game.deal_turn(table.game.players)
+        
+        if turn_card is None:
+            raise HTTPException(status_code=400, detail="Cannot deal turn at this time")
+        
+        return FastJSONResponse({
+            "message": "Turn dealt",
+            "turn_card": format_cards([turn_card])[0],
+            "game_state": await publish_state(table)
+        })
 
 @router.post("/deal-river")
-async def deal_river():
+@tables_router.post("/{table_id}/deal-river")
+async def deal_river(table_id: str = DEFAULT_TABLE_ID):
     """Deal the river"""
-    players = get_current_players()
-    river_card = poker_game.deal_river(players)
-    
-    if not river_card:
-        raise HTTPException(status_code=400, detail="Cannot deal river at this time")
-    
-    return {
-        "message": "River dealt",
-        "river_card": river_card,
-        "game_state": get_game_state_response(players)
-    }
+    table = get_table(table_id)
+    async with table.lock:
+        river_card = table.game.deal_river(table.game.players)
+        
+        if river_card is None:
+            raise HTTPException(status_code=400, detail="Cannot deal river at this time")
+        
+        return FastJSONResponse({
+            "message": "River dealt",
+            "river_card": format_cards([river_card])[0],
+            "game_state": await publish_state(table)
+        })
 
 @router.post("/complete-hand")
-async def complete_hand():
+@tables_router.post("/{table_id}/complete-hand")
+async def complete_hand(table_id: str = DEFAULT_TABLE_ID):
     """Complete the current hand and determine winner"""
-    players = get_current_players()
+    table = get_table(table_id)
+    async with table.lock:
+        game = table.game
+        if not game.players:
+            raise HTTPException(status_code=400, detail="No hand in progress")
+        
+        # Equity of each showdown hand before the pot is awarded, for the audit trail
+        equity_audit = await audit_showdown_equity(game)
+        
+        # Evaluate winner
+        winner_info = game.evaluate_winner(game.players)
+        if equity_audit:
+            winner_info["equity_audit"] = equity_audit
+        
+        # Queue the hand for the batched database writer
+        hand = create_hand_from_game_state(game, winner_info)
+        await hand_writer.submit(hand)
+        
+        return FastJSONResponse({
+            "message": "Hand completed",
+            "winner": winner_info,
+            "final_game_state": await publish_state(table)
+        })
+
+@router.get("/state", response_model=GameStateResponse)
+@tables_router.get("/{table_id}/state", response_model=GameStateResponse)
+async def get_current_state(request: Request, table_id: str = DEFAULT_TABLE_ID, since_version: Optional[int] = None):
+    """Get current game state, or only the actions since ``since_version``.
     
-    # Evaluate winner
-    winner_info = poker_game.evaluate_winner(players)
+    Supports conditional requests: the ETag names the state version, and a
+    matching If-None-Match gets a 304 without touching the serializer.
+    """
+    table = get_table(table_id)
+    game = table.game
+    etag = state_etag(game)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
     
-    # Save hand to database
-    hand = create_hand_from_game_state(players, winner_info)
-    hand_repository.save_hand(hand)
+    if since_version is not None:
+        if since_version < 0 or since_version > game.version:
+            raise HTTPException(status_code=400, detail=f"since_version must be between 0 and {game.version}")
+        changes = {
+            "version": game.version,
+            "since_version": since_version,
+            "actions": [action_dict(a) for a in game.actions_since(since_version)],
+            # Set when since_version predates the current hand and the client must resync
+            "state": get_cached_state(table).state if since_version < game.hand_version else None
+        }
+        return Response(content=dumps(changes), media_type="application/json", headers={"ETag": etag})
     
-    return {
-        "message": "Hand completed",
-        "winner": winner_info,
-        "final_game_state": get_game_state_response(players)
-    }
+    return Response(content=get_cached_state(table).body, media_type="application/json", headers={"ETag": etag})
+
+@router.websocket("/ws")
+@tables_router.websocket("/{table_id}/ws")
+async def table_updates(websocket: WebSocket, table_id: str = DEFAULT_TABLE_ID):
+    """Push a snapshot of the table, then a delta after every change"""
+    try:
+        table = get_table(table_id)
+    except HTTPException as e:
+        await websocket.close(code=4404, reason=e.detail)
+        return
+    await websocket.accept()
+    subscriber = table.channel.subscribe(get_cached_state(table).state)
+    disconnected = asyncio.ensure_future(wait_for_disconnect(websocket))
+    try:
+        while True:
+            event = asyncio.ensure_future(subscriber.get())
+            done, _ = await asyncio.wait({event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                event.cancel()
+                break
+            if event.result() is None:
+                await websocket.close(code=1001, reason="Table closed")
+                break
+            await websocket.send_text(event.result()[1])
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        table.channel.unsubscribe(subscriber)
+
+async def wait_for_disconnect(websocket: WebSocket):
+    """Read and ignore client messages (pings, keepalives) until the client disconnects"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+@router.get("/events")
+@tables_router.get("/{table_id}/events")
+async def table_event_stream(request: Request, table_id: str = DEFAULT_TABLE_ID):
+    """Server-sent events fallback for clients that cannot use the WebSocket"""
+    table = get_table(table_id)
+    subscriber = table.channel.subscribe(get_cached_state(table).state)
 
-@router.get("/state")
-async def get_current_state():
-    """Get current game state"""
-    players = get_current_players()
-    return get_game_state_response(players)
-
-def get_current_players() -> List[Player]:
-    """Get current players (simplified - in production this should be stored properly)"""
-    # This is a simplified implementation
-    # In a real application, you'd store this in a database or session
-    return [
-        Player("Alice", 1000, []),
-        Player("Bob", 1000, []),
-        Player("Charlie", 1000, []),
-        Player("David", 1000, []),
-        Player("Eve", 1000, []),
-        Player("Frank", 1000, [])
+    async def stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscriber.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    break
+                version, payload = event
+                yield f"id: {version}\ndata: {payload}\n\n"
+        finally:
+            table.channel.unsubscribe(subscriber)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@router.get("/equity")
+@tables_router.get("/{table_id}/equity")
+async def get_equity(
+    table_id: str = DEFAULT_TABLE_ID,
+    hands: Optional[str] = None,
+    board: Optional[str] = None,
+    mode: str = "auto",
+    iterations: int = Query(100000, ge=1, le=MAX_EQUITY_ITERATIONS),
+    time_budget_ms: int = Query(500, ge=1, le=MAX_EQUITY_TIME_BUDGET_MS),
+    target_ci: float = Query(0.005, ge=MIN_EQUITY_TARGET_CI, le=1)
+):
+    """Get all-in equity for the current hand, or for given hands (e.g. hands=AhAd,KdQc&board=2h7d9c)"""
+    try:
+        if hands:
+            names = None
+            hole_cards = [hand.strip() for hand in hands.split(",")]
+            board_cards = board or ""
+            holes = [parse_cards(hole) for hole in hole_cards]
+            board_codes = parse_cards(board_cards)
+        else:
+            game = get_table(table_id).game
+            contenders = get_showdown_contenders(game)
+            names = [p.name for p in contenders]
+            holes = [p.cards for p in contenders]
+            board_codes = game.community_cards
+            hole_cards = ["".join(format_cards(hole)) for hole in holes]
+            board_cards = "".join(format_cards(board_codes))
+        
+        result = await equity_calculator.calculate(
+            holes,
+            board_codes,
+            mode=mode,
+            max_iterations=iterations,
+            time_budget=time_budget_ms / 1000,
+            target_ci=target_ci
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    response = asdict(result)
+    response["players"] = [
+        {"name": name, "cards": [cards[:2], cards[2:]], "equity": equity, "win": win, "tie": tie}
+        for name, cards, equity, win, tie in zip(
+            names or hole_cards,
+            hole_cards,
+            result.equities,
+            result.wins or [None] * len(hole_cards),
+            result.ties or [None] * len(hole_cards)
+        )
     ]
+    response["community_cards"] = [board_cards[i:i + 2] for i in range(0, len(board_cards), 2)]
+    return response
 
-def get_game_state_response(players: List[Player]) -> GameStateResponse:
-    """Convert game state to response format"""
-    return GameStateResponse(
-        players=[{
-            "name": p.name,
-            "stack": p.stack,
-            "cards": p.cards,
-            "is_active": p.is_active,
-            "is_all_in": p.is_all_in,
-            "current_bet": p.current_bet
-        } for p in players],
-        community_cards=poker_game.community_cards,
-        pot_amount=poker_game.pot,
-        current_street=poker_game.current_street,
-        current_player_index=poker_game.current_player_index,
-        dealer_index=poker_game.dealer_index,
-        small_blind_index=poker_game.small_blind_index,
-        big_blind_index=poker_game.big_blind_index,
-        min_bet=poker_game.min_bet,
-        last_raise_amount=poker_game.last_raise_amount,
-        actions=[{
-            "player_name": a.player_name,
-            "action_type": a.action_type,
-            "amount": a.amount,
-            "street": a.street
-        } for a in poker_game.actions]
-    )
+@router.get("/equity/preflop")
+async def get_preflop_equity(hand: str, versus: Optional[str] = None, players: int = 2):
+    """Look up preflop equity of a starting hand class (e.g. hand=AKs&versus=QQ, or hand=AKs&players=6)"""
+    tables = get_preflop_tables()
+    if tables is None:
+        raise HTTPException(status_code=503, detail="Preflop equity tables are not available")
+    
+    try:
+        hero = class_from_name(hand)
+        if versus:
+            villain = class_from_name(versus)
+            return {"hand": class_name(hero), "versus": class_name(villain), "equity": tables.versus(hero, villain)}
+        return {"hand": class_name(hero), "players": players, "equity": tables.against_field(hero, players)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def get_showdown_contenders(game: PokerGame) -> List[Player]:
+    """Players of the current hand still contesting the pot"""
+    return [p for p in game.players if p.is_active and p.cards]
 
-def create_hand_from_game_state(players: List[Player], winner_info: Dict[str, Any]):
-    """Create a Hand object from current game state"""
-    from models import Hand
-    import uuid
+async def audit_showdown_equity(game: PokerGame) -> Optional[Dict[str, Any]]:
+    """Exact equity of the showdown hands, when cheap enough to enumerate"""
+    contenders = get_showdown_contenders(game)
+    if len(contenders) < 2:
+        return None
+    
+    holes = [p.cards for p in contenders]
+    board = game.community_cards
+    if not equity_calculator.prefers_exact(holes, board):
+        return None
     
+    try:
+        result = await equity_calculator.exact(holes, board)
+    except ValueError as e:
+        print(f"Error auditing showdown equity: {e}")
+        return None
+    
+    return {
+        "method": result.method,
+        "runouts": result.iterations,
+        "equities": {p.name: equity for p, equity in zip(contenders, result.equities)}
+    }
+
+class CachedState:
+    """A game state response and its JSON body, built once per state version"""
+    
+    def __init__(self, version: int, state: Dict[str, Any]):
+        self.version = version
+        self.state = state
+        self.body = dumps(state)
+
+def get_cached_state(table: Table) -> CachedState:
+    """Serialize the table's state, reusing the last result if nothing changed"""
+    cached = table.state_cache
+    if cached is None or cached.version != table.game.version:
+        cached = CachedState(table.game.version, get_game_state_response(table.game))
+        table.state_cache = cached
+    return cached
+
+def state_etag(game: PokerGame) -> str:
+    return f'"{game.state_id}-{game.version}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+async def publish_state(table: Table, reset: bool = False) -> Dict[str, Any]:
+    """Log the table's new hand events, then build its state response and push it to the table's subscribers.
+
+    Waits for the write-ahead log to fsync the events first, so nobody sees
+    a state a crash could lose.
+    """
+    table_wal.log_events(table.table_id, table.game)
+    await table_wal.synced()
+    state = get_cached_state(table).state
+    table.channel.publish(state, reset=reset)
+    return state
+
+def get_game_state_response(game: PokerGame) -> Dict[str, Any]:
+    """Convert game state to response format (the GameStateResponse layout)"""
+    return game_state_dict(game)
+
+def create_hand_from_game_state(game: PokerGame, winner_info: Dict[str, Any]) -> Hand:
+    """Create a Hand object from current game state, with cards as strings"""
     return Hand(
-        hand_id=str(uuid.uuid4()),
-        players=players,
-        community_cards=poker_game.community_cards,
-        pot_amount=poker_game.pot,
-        current_street=poker_game.current_street,
-        actions=poker_game.actions,
-        winner=winner_info
+        hand_id=game.hand_id,
+        players=[replace(p, cards=format_cards(p.cards)) for p in game.players],
+        community_cards=format_cards(game.community_cards),
+        pot_amount=game.pot,
+        current_street=game.current_street,
+        actions=game.actions,
+        winner=winner_info,
+        events=list(game.events)
     )
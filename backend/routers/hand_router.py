@@ -1,67 +1,166 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
-from repositories.hand_repository import HandRepository
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import List, Optional, Dict, Any, AsyncIterator
+from hand_import import IMPORT_CHUNK_SIZE, parse_hand_line
+from hand_export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, format_chunks
+from repositories.async_hand_repository import async_hand_repository as hand_repository
+from repositories.hand_repository import HandRepository, encode_cursor, decode_cursor
+from hand_replay import HandReplay, public_event, replay_cache
+from serialization import FastJSONResponse, action_dict, game_state_dict, hand_dict
 
 router = APIRouter()
-hand_repository = HandRepository()
+
+MAX_PAGE_SIZE = 100
+
+async def request_lines(request: Request) -> AsyncIterator[str]:
+    """Yield the request body line by line as it streams in"""
+    pending = b""
+    async for piece in request.stream():
+        pending += piece
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+    if pending:
+        yield pending.decode("utf-8")
+
+@router.post("/import")
+async def import_hands(request: Request, chunk_size: int = IMPORT_CHUNK_SIZE):
+    """Bulk-import hands from an NDJSON body (one hand per line) via COPY"""
+    if chunk_size < 1:
+        raise HTTPException(status_code=400, detail="chunk_size must be positive")
+    totals = {"read": 0, "hands_inserted": 0, "actions_inserted": 0}
+    
+    async def load(chunk: List[Dict[str, Any]]):
+        result = await hand_repository.import_hands(chunk)
+        if result is None:
+            raise HTTPException(status_code=503, detail={"message": "Import failed", **totals})
+        totals["read"] += len(chunk)
+        totals["hands_inserted"] += result[0]
+        totals["actions_inserted"] += result[1]
+    
+    chunk = []
+    number = 0
+    async for line in request_lines(request):
+        number += 1
+        try:
+            record = parse_hand_line(line, number)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail={"message": str(e), **totals})
+        if record is not None:
+            chunk.append(record)
+        if len(chunk) >= chunk_size:
+            await load(chunk)
+            chunk = []
+    if chunk:
+        await load(chunk)
+    
+    return totals
 
 @router.get("/")
-async def get_hand_history(limit: int = 10):
-    """Get recent hand history"""
-    hands = hand_repository.get_hand_history(limit)
+async def get_hand_history(limit: int = 10, cursor: Optional[str] = None, include: Optional[str] = None):
+    """Get recent hand history, newest first.
     
-    return {
-        "hands": [
-            {
-                "hand_id": hand.hand_id,
-                "players": [
-                    {
-                        "name": p.name,
-                        "stack": p.stack,
-                        "cards": p.cards,
-                        "is_active": p.is_active,
-                        "is_all_in": p.is_all_in,
-                        "current_bet": p.current_bet
-                    } for p in hand.players
-                ],
-                "community_cards": hand.community_cards,
-                "pot_amount": hand.pot_amount,
-                "winner": hand.winner,
-                "created_at": hand.created_at.isoformat()
-            } for hand in hands
-        ]
-    }
+    Pass the returned ``next_cursor`` back as ``cursor`` for the next page;
+    ``include=actions`` adds each hand's actions from the same query.
+    """
+    if include not in (None, "actions"):
+        raise HTTPException(status_code=400, detail="include must be 'actions'")
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    try:
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Fetch one extra row to learn whether another page follows
+    hands = await hand_repository.get_hand_history(limit + 1, before, include == "actions")
+    next_cursor = encode_cursor(hands[limit - 1]) if len(hands) > limit else None
+    hands = hands[:limit]
+    
+    return FastJSONResponse({
+        "next_cursor": next_cursor,
+        "hands": [hand_dict(hand) for hand in hands]
+    })
+
+@router.get("/export")
+async def export_hands(
+    format: str = "ndjson",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE
+):
+    """Stream every hand (with its actions) as NDJSON or CSV, oldest first"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    if chunk_size < 1:
+        raise HTTPException(status_code=400, detail="chunk_size must be positive")
+    
+    chunks = HandRepository().iter_hand_chunks(chunk_size, since, until)
+    # Run the query before answering, so a database failure is a 503 rather than a cut-off 200
+    try:
+        first = await run_in_threadpool(next, chunks, [])
+    except Exception as e:
+        print(f"Error exporting hands: {e}")
+        raise HTTPException(status_code=503, detail="Hand history is unavailable")
+    
+    def all_chunks():
+        yield first
+        yield from chunks
+    
+    return StreamingResponse(
+        format_chunks(all_chunks(), format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="hands.{format}"'}
+    )
 
 @router.get("/{hand_id}")
 async def get_hand_details(hand_id: str):
-    """Get details of a specific hand"""
-    actions = hand_repository.get_hand_actions(hand_id)
+    """Get a specific hand with its actions, in one query"""
+    hand = await hand_repository.get_hand(hand_id)
+    if hand is None:
+        raise HTTPException(status_code=404, detail=f"Hand {hand_id} not found")
     
-    return {
+    return FastJSONResponse(hand_dict(hand))
+
+@router.get("/{hand_id}/replay")
+async def get_hand_replay(hand_id: str, step: Optional[int] = None):
+    """Game state after the first ``step`` events of a hand (default: all of them)"""
+    replay = replay_cache.get(hand_id)
+    if replay is None:
+        events = await hand_repository.get_hand_events(hand_id)
+        if events is None:
+            raise HTTPException(status_code=404, detail=f"Hand {hand_id} not found")
+        if not events:
+            raise HTTPException(status_code=404, detail=f"Hand {hand_id} has no event log")
+        replay = HandReplay(events)
+        replay_cache.put(hand_id, replay)
+    
+    if step is None:
+        step = replay.steps
+    if not 0 <= step <= replay.steps:
+        raise HTTPException(status_code=400, detail=f"step must be between 0 and {replay.steps}")
+    try:
+        game = replay.state_at(step)
+    except (ValueError, KeyError) as e:
+        print(f"Error replaying hand {hand_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Hand {hand_id} could not be replayed")
+    
+    return FastJSONResponse({
         "hand_id": hand_id,
-        "actions": [
-            {
-                "player_name": action.player_name,
-                "action_type": action.action_type,
-                "amount": action.amount,
-                "street": action.street
-            } for action in actions
-        ]
-    }
+        "step": step,
+        "steps": replay.steps,
+        "event": public_event(replay.events[step - 1]) if step else None,
+        "state": game_state_dict(game)
+    })
 
 @router.get("/{hand_id}/actions")
 async def get_hand_actions(hand_id: str):
     """Get all actions for a specific hand"""
-    actions = hand_repository.get_hand_actions(hand_id)
+    actions = await hand_repository.get_hand_actions(hand_id)
     
     return {
         "hand_id": hand_id,
-        "actions": [
-            {
-                "player_name": action.player_name,
-                "action_type": action.action_type,
-                "amount": action.amount,
-                "street": action.street
-            } for action in actions
-        ]
+        "actions": [action_dict(action) for action in actions]
     }
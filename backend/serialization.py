@@ -0,0 +1,92 @@
+"""Shared JSON serialization for players, actions, hands and game state.
+
+Every response and database write that carries these models goes through
+here, so their JSON layout is defined once. Field names are fixed up front
+and read with one ``attrgetter`` call per object. Encoding uses orjson,
+which writes bytes directly and handles datetimes itself.
+"""
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+from fastapi.responses import Response
+
+from hand_evaluator import format_cards
+from models import Action, Hand, HandHistory, Player
+
+PLAYER_FIELDS = ("name", "stack", "cards", "is_active", "is_all_in", "current_bet")
+ACTION_FIELDS = ("player_name", "action_type", "amount", "street")
+
+_player_values = attrgetter(*PLAYER_FIELDS)
+_action_values = attrgetter(*ACTION_FIELDS)
+
+def dumps(content: Any) -> bytes:
+    # Equities in winner info can be NumPy scalars
+    return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def player_dict(player: Player) -> Dict[str, Any]:
+    return dict(zip(PLAYER_FIELDS, _player_values(player)))
+
+def live_player_dict(player: Player) -> Dict[str, Any]:
+    """A seated player, with integer card codes turned into strings"""
+    data = dict(zip(PLAYER_FIELDS, _player_values(player)))
+    data["cards"] = format_cards(player.cards)
+    return data
+
+def action_dict(action: Action) -> Dict[str, Any]:
+    return dict(zip(ACTION_FIELDS, _action_values(action)))
+
+def hand_dict(hand: HandHistory) -> Dict[str, Any]:
+    """Hand history record; actions are included when they were loaded"""
+    data = {
+        "hand_id": hand.hand_id,
+        "players": [player_dict(p) for p in hand.players],
+        "community_cards": hand.community_cards,
+        "pot_amount": hand.pot_amount,
+        "winner": hand.winner,
+        "created_at": hand.created_at,
+    }
+    if hand.actions is not None:
+        data["actions"] = [action_dict(a) for a in hand.actions]
+    return data
+
+def game_state_dict(game) -> Dict[str, Any]:
+    """A live or replayed PokerGame in the GameStateResponse layout"""
+    return {
+        "players": [live_player_dict(p) for p in game.players],
+        "community_cards": format_cards(game.community_cards),
+        "pot_amount": game.pot,
+        "current_street": game.current_street,
+        "current_player_index": game.current_player_index,
+        "dealer_index": game.dealer_index,
+        "small_blind_index": game.small_blind_index,
+        "big_blind_index": game.big_blind_index,
+        "min_bet": game.min_bet,
+        "last_raise_amount": game.last_raise_amount,
+        "actions": [action_dict(a) for a in game.actions],
+        "version": game.version
+    }
+
+def hand_row(hand: Hand) -> Tuple[str, str, str, int, Optional[str], Optional[str], datetime]:
+    """(hand_id, players, community_cards, pot_amount, winner, events, created_at) for the hands table, JSON columns encoded.
+
+    The hand's own created_at is stored, so the row and the cached copy of
+    the hand agree on it.
+    """
+    return (
+        hand.hand_id,
+        dumps([player_dict(p) for p in hand.players]).decode(),
+        dumps(hand.community_cards).decode(),
+        hand.pot_amount,
+        dumps(hand.winner).decode() if hand.winner else None,
+        dumps(hand.events).decode() if hand.events else None,
+        hand.created_at,
+    )
+
+class FastJSONResponse(Response):
+    """JSON response encoded by ``dumps``; return it directly to skip FastAPI's jsonable_encoder"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
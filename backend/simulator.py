@@ -0,0 +1,318 @@
+"""Headless hand simulator: plays PokerGame hands directly, without HTTP.
+
+Every hand goes through ``start_new_hand``, ``make_action``, the ``deal_*``
+methods and ``evaluate_winner``, with each seat's decisions made by a
+policy function. Hands are split into shards, each run in its own
+process with its own seed. The simulator reports hands/sec and the time
+spent in each engine phase. After every hand it checks that no chips were
+created or lost, that stacks never go negative, and that the pot matches
+what the seats put in. With ``--fuzz`` it also tries illegal actions and
+checks that the engine rejects them without changing anything. Every
+violation is reported with the seed and hand number that reproduce it.
+
+A policy takes ``(game, seat, legal, rng)``, where ``legal`` is
+``game.legal_actions(...)``, and returns ``(action_type, amount)``. Pick
+built-in policies by name, or load your own as ``module:function``. With
+several policies, seats take them in turn:
+
+    python simulator.py --hands 100000 --players 6 --processes 4
+    python simulator.py --policies random,calling_station,aggressive --fuzz 0.1
+    python simulator.py --policies mybots:tight_aggressive,random
+"""
+import argparse
+import importlib
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from deck_provider import SeededDeckProvider
+from game_logic import PokerGame
+from models import Player
+
+Policy = Callable[[PokerGame, int, Dict[str, Any], random.Random], Tuple[str, int]]
+
+PHASES = ("start", "action", "deal", "showdown")
+ACTION_TYPES = ("fold", "check", "call", "bet", "raise", "all_in")
+# A street that takes more actions than this is stuck
+MAX_STREET_ACTIONS = 200
+# Violations kept per shard; all of them are counted
+MAX_REPORTED_VIOLATIONS = 20
+BIG_BLIND = 40
+
+def random_policy(game: PokerGame, seat: int, legal: Dict[str, Any], rng: random.Random) -> Tuple[str, int]:
+    """Any legal action, with a uniformly random amount"""
+    action_type = rng.choice(sorted(legal))
+    options = legal[action_type]
+    return action_type, rng.randint(options["min"], options["max"]) if "min" in options else 0
+
+def calling_station(game: PokerGame, seat: int, legal: Dict[str, Any], rng: random.Random) -> Tuple[str, int]:
+    """Checks or calls whatever is bet, going all-in when a call would not cover it"""
+    for action_type in ("check", "call", "all_in"):
+        if action_type in legal:
+            return action_type, 0
+    return "fold", 0
+
+def aggressive(game: PokerGame, seat: int, legal: Dict[str, Any], rng: random.Random) -> Tuple[str, int]:
+    """Makes the minimum raise or bet whenever possible, otherwise shoves"""
+    for action_type in ("raise", "bet"):
+        if action_type in legal:
+            return action_type, legal[action_type]["min"]
+    return ("all_in", 0) if "all_in" in legal else ("fold", 0)
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "calling_station": calling_station,
+    "aggressive": aggressive,
+}
+
+def load_policy(name: str) -> Policy:
+    """A built-in policy by name, or ``module:function`` from an importable module"""
+    if name in POLICIES:
+        return POLICIES[name]
+    module_name, _, function_name = name.partition(":")
+    if not function_name:
+        raise ValueError(f"Unknown policy {name!r}: use one of {', '.join(POLICIES)} or module:function")
+    return getattr(importlib.import_module(module_name), function_name)
+
+@dataclass
+class SimulationResult:
+    hands: int = 0
+    actions: int = 0
+    rebuys: int = 0
+    elapsed: float = 0.0  # Engine time summed over processes
+    timings: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+    calls: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(PHASES, 0))
+    fuzzed: int = 0
+    violation_count: int = 0
+    violations: List[str] = field(default_factory=list)
+
+    def add_violation(self, message: str):
+        self.violation_count += 1
+        if len(self.violations) < MAX_REPORTED_VIOLATIONS:
+            self.violations.append(message)
+
+    def merge(self, other: "SimulationResult"):
+        self.hands += other.hands
+        self.actions += other.actions
+        self.rebuys += other.rebuys
+        self.elapsed += other.elapsed
+        for phase in PHASES:
+            self.timings[phase] += other.timings[phase]
+            self.calls[phase] += other.calls[phase]
+        self.fuzzed += other.fuzzed
+        self.violation_count += other.violation_count
+        self.violations.extend(other.violations[:MAX_REPORTED_VIOLATIONS - len(self.violations)])
+
+def _state_key(game: PokerGame, players: List[Player]) -> Tuple:
+    return game.version, game.pot, tuple((p.stack, p.current_bet, p.is_active) for p in players)
+
+def fuzz_action(
+    game: PokerGame,
+    players: List[Player],
+    legal: Dict[str, Any],
+    rng: random.Random,
+) -> Optional[str]:
+    """Try one action the rules forbid; returns a violation message if the engine took it or changed state"""
+    seat = game.current_player_index
+    allowed = dict(legal)
+    # make_action takes a raise with nothing to raise as a bet, and a bet
+    # facing a bet as a raise
+    if "bet" in legal:
+        allowed.setdefault("raise", legal["bet"])
+    if "raise" in legal:
+        allowed.setdefault("bet", legal["raise"])
+    choices = [(seat, action_type, rng.randint(0, 10 ** 6)) for action_type in ACTION_TYPES if action_type not in allowed]
+    for action_type in ("bet", "raise"):
+        if action_type in allowed:
+            choices.append((seat, action_type, allowed[action_type]["max"] + 1))
+            if allowed[action_type]["min"] > 0:
+                choices.append((seat, action_type, allowed[action_type]["min"] - 1))
+    if len(players) > 1:
+        other = (seat + rng.randrange(1, len(players))) % len(players)
+        choices.append((other, rng.choice(ACTION_TYPES), BIG_BLIND))
+    if not choices:
+        return None
+
+    attempt = rng.choice(choices)
+    before = _state_key(game, players)
+    if game.make_action(players, *attempt):
+        return f"illegal action accepted: seat {attempt[0]} {attempt[1]} {attempt[2]} on the {game.current_street}"
+    if _state_key(game, players) != before:
+        return f"rejected action changed the game: seat {attempt[0]} {attempt[1]} {attempt[2]}"
+    return None
+
+def play_hand(
+    game: PokerGame,
+    players: List[Player],
+    policies: List[Policy],
+    rng: random.Random,
+    result: SimulationResult,
+    fuzz: float = 0.0,
+) -> List[str]:
+    """Play one hand to the end, adding its timings to ``result``; returns the invariants it broke"""
+    problems = []
+    chips = sum(p.stack for p in players)
+    timings, calls = result.timings, result.calls
+
+    start = time.perf_counter()
+    game.start_new_hand(players)
+    timings["start"] += time.perf_counter() - start
+    calls["start"] += 1
+
+    for deal in (None, game.deal_flop, game.deal_turn, game.deal_river):
+        if deal is not None:
+            if game.ledger.active_count < 2:
+                break
+            start = time.perf_counter()
+            deal(players)
+            timings["deal"] += time.perf_counter() - start
+            calls["deal"] += 1
+        for _ in range(MAX_STREET_ACTIONS):
+            if game.is_hand_complete(players):
+                break
+            seat = game.current_player_index
+            legal = game.legal_actions(players, seat)
+            if not legal:
+                problems.append(f"nobody can act but the {game.current_street} is not complete")
+                break
+            if fuzz and rng.random() < fuzz:
+                result.fuzzed += 1
+                problem = fuzz_action(game, players, legal, rng)
+                if problem:
+                    problems.append(problem)
+                    continue  # The state moved on; ask for the legal actions again
+            action_type, amount = policies[seat % len(policies)](game, seat, legal, rng)
+            start = time.perf_counter()
+            accepted = game.make_action(players, seat, action_type, amount)
+            timings["action"] += time.perf_counter() - start
+            calls["action"] += 1
+            result.actions += 1
+            if not accepted:
+                options = legal.get(action_type)
+                if options is not None and ("min" not in options or options["min"] <= amount <= options["max"]):
+                    problems.append(f"legal action rejected: seat {seat} {action_type} {amount} on the {game.current_street}")
+                # Whatever the policy meant, the hand goes on
+                game.make_action(players, seat, "fold")
+        else:
+            problems.append(f"the {game.current_street} did not finish within {MAX_STREET_ACTIONS} actions")
+            break
+
+    if game.pot != game.pot_ledger.total:
+        problems.append(f"pot is {game.pot} but the seats put in {game.pot_ledger.total}")
+    start = time.perf_counter()
+    game.evaluate_winner(players)
+    timings["showdown"] += time.perf_counter() - start
+    calls["showdown"] += 1
+
+    if sum(p.stack for p in players) != chips:
+        problems.append(f"chips not conserved: {chips} before the hand, {sum(p.stack for p in players)} after")
+    if any(p.stack < 0 for p in players):
+        problems.append(f"negative stack: {[p.stack for p in players]}")
+    result.hands += 1
+    return problems
+
+@dataclass
+class Shard:
+    hands: int
+    players: int
+    policies: List[str]
+    seed: int
+    stack: int = 2000
+    fuzz: float = 0.0
+
+def run_shard(shard: Shard) -> SimulationResult:
+    """Play one shard's hands at one table; runs in a worker process"""
+    # Preflop showdowns draw winners from the global generator
+    random.seed(shard.seed)
+    rng = random.Random(shard.seed)
+    policies = [load_policy(name) for name in shard.policies]
+    game = PokerGame(deck_provider=SeededDeckProvider(shard.seed))
+    players = [Player(f"Player{seat}", shard.stack, []) for seat in range(shard.players)]
+    result = SimulationResult()
+
+    start = time.perf_counter()
+    for number in range(shard.hands):
+        # Busted players buy back in, so the table never breaks up
+        for player in players:
+            if player.stack < BIG_BLIND:
+                player.stack = shard.stack
+                result.rebuys += 1
+        for problem in play_hand(game, players, policies, rng, result, shard.fuzz):
+            result.add_violation(f"seed {shard.seed} hand {number}: {problem}")
+    result.elapsed = time.perf_counter() - start
+    return result
+
+def simulate(
+    hands: int,
+    players: int = 6,
+    policies: Optional[List[str]] = None,
+    processes: int = 1,
+    seed: int = 0,
+    stack: int = 2000,
+    fuzz: float = 0.0,
+) -> SimulationResult:
+    """Split ``hands`` into one shard per process and merge the results"""
+    policies = policies or ["random"]
+    for name in policies:
+        load_policy(name)  # Fail here rather than in every worker
+    processes = max(1, min(processes, hands))
+    shards = [
+        Shard(hands // processes + (1 if index < hands % processes else 0), players, policies, seed + index, stack, fuzz)
+        for index in range(processes)
+    ]
+    if processes == 1:
+        results = [run_shard(shards[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(run_shard, shards))
+
+    total = SimulationResult()
+    for result in results:
+        total.merge(result)
+    return total
+
+def format_report(result: SimulationResult, processes: int, wall: float) -> str:
+    lines = [
+        f"simulated {result.hands:,} hands ({result.actions:,} actions, {result.rebuys:,} rebuys) "
+        f"on {processes} processes in {wall:.2f}s: {result.hands / wall:,.0f} hands/s",
+        f"{'phase':<10}{'calls':>12}{'total s':>10}{'us/call':>10}",
+    ]
+    for phase in PHASES:
+        calls = result.calls[phase]
+        seconds = result.timings[phase]
+        lines.append(f"{phase:<10}{calls:>12,}{seconds:>10.2f}{seconds / calls * 1e6 if calls else 0:>10.2f}")
+    checked = f"{result.hands:,} hands checked"
+    if result.fuzzed:
+        checked += f", {result.fuzzed:,} illegal actions tried"
+    lines.append(f"invariants: {checked}, {result.violation_count} violations")
+    lines.extend(f"  {violation}" for violation in result.violations)
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--policies", default="random", help="comma-separated policy names or module:function, by seat")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stack", type=int, default=2000)
+    parser.add_argument("--fuzz", type=float, default=0.0, help="chance of trying an illegal action before each move")
+    args = parser.parse_args()
+
+    if not 2 <= args.players <= 9:
+        parser.error("--players must be between 2 and 9")
+    start = time.perf_counter()
+    try:
+        result = simulate(args.hands, args.players, args.policies.split(","), args.processes,
+                          args.seed, args.stack, args.fuzz)
+    except (ValueError, ImportError, AttributeError) as e:
+        parser.error(str(e))
+    print(format_report(result, min(args.processes, args.hands), time.perf_counter() - start))
+    sys.exit(1 if result.violation_count else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Per-table push channel for game-state deltas.
+
+Every mutation of a table publishes its new state to the table's channel.
+The channel diffs it against the previously published state, numbers the
+result with a monotonically increasing version, serializes it to JSON once
+and hands the same payload to every subscriber (WebSocket or SSE), so
+fan-out costs one serialization per event rather than one per spectator.
+
+Messages are either full snapshots::
+
+    {"type": "snapshot", "version": 7, "state": {...}}
+
+or deltas against the previous version::
+
+    {"type": "delta", "version": 8, "base_version": 7,
+     "players": {"2": {"stack": 960, "current_bet": 40}},
+     "actions": [<actions appended since version 7>],
+     "community_cards": [<cards dealt since version 7>],
+     "state": {"pot_amount": 100, "current_player_index": 3}}
+
+A subscriber that falls too far behind has its backlog dropped and
+receives a fresh snapshot instead.
+"""
+import asyncio
+from typing import Any, Dict, Optional, Set, Tuple
+
+from serialization import dumps
+
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Queue items are (version, payload); a None item means the channel closed
+Event = Optional[Tuple[int, str]]
+
+def diff_state(previous: Dict[str, Any], state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the delta from ``previous`` to ``state``, or None if only a
+    snapshot can describe the change (e.g. a new hand or new seating)"""
+    old_players, new_players = previous["players"], state["players"]
+    if [p["name"] for p in old_players] != [p["name"] for p in new_players]:
+        return None
+    old_actions, new_actions = previous["actions"], state["actions"]
+    old_cards, new_cards = previous["community_cards"], state["community_cards"]
+    if len(new_actions) < len(old_actions) or new_cards[:len(old_cards)] != old_cards:
+        return None
+
+    delta: Dict[str, Any] = {}
+    players = {}
+    for index, (old, new) in enumerate(zip(old_players, new_players)):
+        changed = {key: value for key, value in new.items() if old.get(key) != value}
+        if changed:
+            players[str(index)] = changed
+    if players:
+        delta["players"] = players
+    if len(new_actions) > len(old_actions):
+        delta["actions"] = new_actions[len(old_actions):]
+    if len(new_cards) > len(old_cards):
+        delta["community_cards"] = new_cards[len(old_cards):]
+
+    scalars = {
+        key: value for key, value in state.items()
+        if key not in ("players", "actions", "community_cards") and previous.get(key) != value
+    }
+    if scalars:
+        delta["state"] = scalars
+    return delta
+
+class Subscriber:
+    """One WebSocket or SSE connection's queue of pending events"""
+
+    def __init__(self, channel: "TableChannel", loop: asyncio.AbstractEventLoop):
+        self.channel = channel
+        self.loop = loop
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def deliver(self, event: Event):
+        """Queue an event from any thread or event loop"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._put(event)
+        else:
+            self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: Event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind to catch up on deltas; start over from a snapshot
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(self.channel.snapshot_event() if event is not None else None)
+
+    async def get(self) -> Event:
+        return await self.queue.get()
+
+class TableChannel:
+    """Versioned state-delta broadcaster for one table"""
+
+    def __init__(self):
+        self.version = 0
+        self.published = 0
+        self._state: Optional[Dict[str, Any]] = None
+        self._subscribers: Set[Subscriber] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def snapshot_event(self) -> Optional[Tuple[int, str]]:
+        if self._state is None:
+            return None
+        message = {"type": "snapshot", "version": self.version, "state": self._state}
+        return self.version, dumps(message).decode()
+
+    def publish(self, state: Dict[str, Any], reset: bool = False) -> int:
+        """Record a new table state and push it to subscribers; returns its version"""
+        if not self._subscribers:
+            # Nobody to diff for; new subscribers start from a snapshot anyway
+            self.version += 1
+            self._state = state
+            return self.version
+
+        delta = None if reset or self._state is None else diff_state(self._state, state)
+        if delta == {}:
+            return self.version
+
+        base_version = self.version
+        self.version += 1
+        self._state = state
+        if delta is None:
+            event = self.snapshot_event()
+        else:
+            message = {"type": "delta", "version": self.version, "base_version": base_version, **delta}
+            event = (self.version, dumps(message).decode())
+
+        for subscriber in list(self._subscribers):
+            subscriber.deliver(event)
+        self.published += 1
+        return self.version
+
+    def subscribe(self, state: Optional[Dict[str, Any]] = None) -> Subscriber:
+        """Register a subscriber, queueing a snapshot of the current state first"""
+        if state is not None:
+            self.publish(state)
+        subscriber = Subscriber(self, asyncio.get_running_loop())
+        snapshot = self.snapshot_event()
+        if snapshot is not None:
+            subscriber.queue.put_nowait(snapshot)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def close(self):
+        """Tell every subscriber the table is gone"""
+        for subscriber in list(self._subscribers):
+            subscriber.deliver(None)
+        self._subscribers.clear()
@@ -0,0 +1,116 @@
+"""Registry of live poker tables.
+
+Each table owns its own ``PokerGame`` (which keeps the seated players and
+their stacks between requests), its own ``asyncio.Lock`` and a
+``TableChannel`` that pushes state changes to spectators. Requests for
+different tables never contend: the registry itself is only touched from
+the event loop thread, so looking a table up needs no lock at all. Tables
+that see no requests for ``idle_timeout`` seconds are evicted. Opens and
+closes are logged to ``wal`` (a ``TableWAL``) once one is attached.
+"""
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from game_logic import PokerGame
+from table_events import TableChannel
+
+DEFAULT_TABLE_ID = "default"
+TABLE_IDLE_TIMEOUT = float(os.getenv("TABLE_IDLE_TIMEOUT", "1800"))
+EVICTION_INTERVAL = float(os.getenv("TABLE_EVICTION_INTERVAL", "60"))
+
+@dataclass
+class Table:
+    table_id: str
+    game: PokerGame = field(default_factory=PokerGame)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    channel: TableChannel = field(default_factory=TableChannel)
+    # Serialized state of the last version anyone asked for (see game_router)
+    state_cache: Optional[Any] = None
+    created_at: float = field(default_factory=time.monotonic)
+    last_active: float = field(default_factory=time.monotonic)
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+class TableNotFoundError(KeyError):
+    pass
+
+class TableRegistry:
+    """Tables keyed by table id, with idle-table eviction"""
+
+    def __init__(self, idle_timeout: float = TABLE_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self.evicted = 0
+        self.wal = None
+        self._tables: Dict[str, Table] = {}
+
+    def create(self, table_id: Optional[str] = None) -> Table:
+        """Open a new table, generating an id if none is given"""
+        table_id = table_id or uuid.uuid4().hex
+        if table_id in self._tables:
+            raise ValueError(f"Table {table_id} already exists")
+        table = Table(table_id)
+        self._tables[table_id] = table
+        if self.wal is not None:
+            self.wal.log_open(table_id)
+        return table
+
+    def get(self, table_id: str) -> Table:
+        """Return an open table, raising TableNotFoundError if there is none"""
+        table = self._tables.get(table_id)
+        if table is None:
+            raise TableNotFoundError(table_id)
+        table.touch()
+        return table
+
+    def get_or_create(self, table_id: str) -> Table:
+        """Return an open table, opening it on first use"""
+        table = self._tables.get(table_id)
+        if table is None:
+            table = self.create(table_id)
+        table.touch()
+        return table
+
+    def remove(self, table_id: str) -> bool:
+        """Close a table; returns False if it was not open"""
+        table = self._tables.pop(table_id, None)
+        if table is None:
+            return False
+        table.channel.close()
+        if self.wal is not None:
+            self.wal.log_close(table_id)
+        return True
+
+    def table_ids(self) -> List[str]:
+        return list(self._tables)
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Close tables idle for longer than the timeout; returns how many"""
+        now = time.monotonic() if now is None else now
+        idle = [
+            table_id for table_id, table in self._tables.items()
+            if now - table.last_active > self.idle_timeout and not table.lock.locked()
+        ]
+        for table_id in idle:
+            self._tables.pop(table_id).channel.close()
+            if self.wal is not None:
+                self.wal.log_close(table_id)
+        self.evicted += len(idle)
+        return len(idle)
+
+    async def run_eviction(self, interval: float = EVICTION_INTERVAL):
+        """Background task that periodically evicts idle tables"""
+        while True:
+            await asyncio.sleep(interval)
+            evicted = self.evict_idle()
+            if evicted:
+                print(f"Evicted {evicted} idle tables")
+
+table_registry = TableRegistry()
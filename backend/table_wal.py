@@ -0,0 +1,383 @@
+"""Write-ahead log of live tables, so in-progress hands survive a restart.
+
+Every table open and close, and every hand event (see ``PokerGame.events``),
+is appended to a local log before the next fsync. On startup the log is
+read back and each open table's current hand is replayed through
+``hand_replay.apply_event``, which leaves the table as it was.
+
+The log is off unless WAL_DIR names a directory. One process owns the
+directory, holding a lock on it for as long as the log is open; a second
+process (say another uvicorn worker) finds it locked and runs without a
+log, since its tables could not be recovered alongside the first's anyway.
+
+Records are JSON lines prefixed with their CRC32. A torn record at the end
+of the log (a crash mid-write) fails its check and ends the scan.
+Appends go into a buffer that a background thread writes and fsyncs every
+``fsync_interval`` seconds, so one fsync covers every table's changes in
+that window. ``synced()`` waits for the fsync covering everything appended
+so far; the game routes await it before answering, so an acknowledged
+action is on disk. With an interval of 0 each append is written and
+fsynced before it returns.
+
+The log is split into segments of about ``segment_bytes``. Only the
+current hand of each open table is needed to recover, so once there are
+``compact_segments`` segments the log is compacted: a checkpoint of that
+state goes into a new segment and the older segments are deleted.
+"""
+import asyncio
+import os
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import orjson
+
+from hand_replay import apply_event
+
+WAL_DIR = os.getenv("WAL_DIR") or None
+WAL_FSYNC_INTERVAL = float(os.getenv("WAL_FSYNC_INTERVAL", "0.005"))
+WAL_SEGMENT_BYTES = int(os.getenv("WAL_SEGMENT_BYTES", str(16 * 1024 * 1024)))
+WAL_COMPACT_SEGMENTS = int(os.getenv("WAL_COMPACT_SEGMENTS", "4"))
+
+SEGMENT_SUFFIX = ".wal"
+LOCK_NAME = "LOCK"
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    body = orjson.dumps(record)
+    return b"%08x %s\n" % (zlib.crc32(body), body)
+
+def decode_record(line: bytes) -> Optional[Dict[str, Any]]:
+    """The record on one log line, or None if it is torn or corrupt"""
+    if len(line) < 10 or not line.endswith(b"\n") or line[8:9] != b" ":
+        return None
+    body = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(body):
+            return None
+        return orjson.loads(body)
+    except ValueError:
+        return None
+
+class TableWAL:
+    """Segmented, group-committed log of table opens, closes and hand events"""
+
+    def __init__(
+        self,
+        directory: Optional[str] = WAL_DIR,
+        fsync_interval: float = WAL_FSYNC_INTERVAL,
+        segment_bytes: int = WAL_SEGMENT_BYTES,
+        compact_segments: int = WAL_COMPACT_SEGMENTS,
+    ):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.segment_bytes = segment_bytes
+        self.compact_segments = max(compact_segments, 2)
+        # Current hand's events of each open table, the state a checkpoint holds
+        self._live: Dict[str, List[Dict[str, Any]]] = {}
+        self._buffer: List[bytes] = []
+        self._segments: List[str] = []
+        self._file = None
+        self._segment_size = 0
+        self._lock = threading.Lock()
+        self._pending = threading.Condition(self._lock)
+        self._io_lock = threading.Lock()  # Held while writing, so a sync waits for the writer
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._lock_file = None
+        # Records on disk so far, and (record count, future) of everyone waiting for more
+        self._synced = 0
+        self._waiters: List[Tuple[int, asyncio.Future]] = []
+        # Metrics
+        self.records = 0
+        self.fsyncs = 0
+        self.rotations = 0
+        self.compactions = 0
+        self.torn_records = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def read(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Open tables in the log on disk, each with its current hand's events"""
+        tables: Dict[str, List[Dict[str, Any]]] = {}
+        for path in self._segment_paths():
+            with open(path, "rb") as segment:
+                for line in segment:
+                    record = decode_record(line)
+                    if record is None:
+                        self.torn_records += 1
+                        print(f"Write-ahead log ends in a torn record in {path}")
+                        return tables
+                    op = record["op"]
+                    if op == "checkpoint":
+                        tables.clear()
+                    elif op == "open":
+                        tables.setdefault(record["table"], [])
+                    elif op == "close":
+                        tables.pop(record["table"], None)
+                    elif op == "event":
+                        events = tables.setdefault(record["table"], [])
+                        if record["event"]["type"] == "start":
+                            events.clear()
+                        events.append(record["event"])
+        return tables
+
+    def recover(self, registry) -> int:
+        """Reopen the logged tables in ``registry``, then start logging its changes.
+
+        Returns how many tables were recovered. A table whose events no
+        longer replay is dropped. If another process holds the log
+        directory, nothing is recovered or logged.
+        """
+        if not self._acquire():
+            return 0
+        recovered = 0
+        for table_id, events in self.read().items():
+            table = registry.get_or_create(table_id)
+            try:
+                for event in events:
+                    apply_event(table.game, event)
+            except (ValueError, KeyError, IndexError) as e:
+                print(f"Error recovering table {table_id}: {e}")
+                registry.remove(table_id)
+                continue
+            self._live[table_id] = list(table.game.events)
+            recovered += 1
+        self.open()
+        registry.wal = self
+        return recovered
+
+    def open(self):
+        """Start a fresh log holding a checkpoint of the tables tracked so far"""
+        if not self._acquire():
+            return
+        self._segments = self._segment_paths()
+        with self._io_lock:
+            self._checkpoint()
+        if self.fsync_interval > 0:
+            self._stopping = False
+            self._thread = threading.Thread(target=self.run, name="table-wal", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Write out everything appended so far and stop"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._pending.notify()
+        if thread is not None:
+            thread.join()
+        with self._io_lock:
+            self._write(*self._take())
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self._release()
+        # Nothing more will be written; let anyone still waiting go
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+        _wake([future for _, future in waiters])
+
+    def log_open(self, table_id: str):
+        self._append(table_id, {"op": "open", "table": table_id})
+
+    def log_close(self, table_id: str):
+        self._append(table_id, {"op": "close", "table": table_id})
+
+    def log_events(self, table_id: str, game):
+        """Append the events ``game`` has logged since the last call for this table"""
+        if not self.is_open:
+            return
+        logged = self._live.get(table_id)
+        events = game.events
+        if logged and events and logged[0] is events[0]:
+            new_events = events[len(logged):]
+        else:
+            new_events = events  # A new hand
+        for event in new_events:
+            self._append(table_id, {"op": "event", "table": table_id, "event": event})
+
+    def sync(self):
+        """Write and fsync everything appended so far"""
+        with self._io_lock:
+            self._write(*self._take())
+
+    async def synced(self):
+        """Wait until everything appended so far is fsynced"""
+        with self._lock:
+            if self._thread is None or self._synced >= self.records:
+                return
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append((self.records, future))
+        await future
+
+    def _acquire(self) -> bool:
+        """Lock the log directory for this process; False if another process holds it"""
+        if self._lock_file is not None:
+            return True
+        os.makedirs(self.directory, exist_ok=True)
+        lock_file = open(os.path.join(self.directory, LOCK_NAME), "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            print(f"Write-ahead log at {self.directory} is in use by another process; tables will not be logged")
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _release(self):
+        if self._lock_file is not None:
+            # Closing the file drops the lock
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _append(self, table_id: str, record: Dict[str, Any]):
+        if not self.is_open:
+            return
+        line = encode_record(record)
+        with self._lock:
+            op = record["op"]
+            if op == "close":
+                self._live.pop(table_id, None)
+            else:
+                events = self._live.setdefault(table_id, [])
+                if op == "event":
+                    if record["event"]["type"] == "start":
+                        events.clear()
+                    events.append(record["event"])
+            self._buffer.append(line)
+            self.records += 1
+            if self._thread is not None:
+                if len(self._buffer) == 1:
+                    self._pending.notify()
+                return
+        self.sync()
+
+    def _take(self) -> Tuple[List[bytes], int]:
+        """The buffered lines, and the record count they bring the log up to"""
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            return lines, self.records
+
+    def _write(self, lines: List[bytes], upto: int):
+        """Append lines to the current segment and fsync; rotates and compacts as segments fill"""
+        if not lines or self._file is None:
+            return
+        data = b"".join(lines)
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.fsyncs += 1
+        self._mark_synced(upto)
+        self._segment_size += len(data)
+        if self._segment_size >= self.segment_bytes:
+            if len(self._segments) >= self.compact_segments:
+                self._checkpoint()
+            else:
+                self._new_segment()
+                self.rotations += 1
+
+    def _checkpoint(self):
+        """Start a segment with every open table's current hand, then delete the older segments"""
+        with self._lock:
+            # The snapshot already includes anything still buffered
+            self._buffer = []
+            records = [{"op": "checkpoint"}]
+            for table_id, events in self._live.items():
+                records.append({"op": "open", "table": table_id})
+                records.extend({"op": "event", "table": table_id, "event": event} for event in events)
+            lines = [encode_record(record) for record in records]
+            upto = self.records
+        obsolete = list(self._segments)
+        self._new_segment()
+        data = b"".join(lines)
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._segment_size = len(data)
+        self._mark_synced(upto)
+        for path in obsolete:
+            os.remove(path)
+        self._segments = self._segments[-1:]
+        self.compactions += 1
+
+    def _mark_synced(self, upto: int):
+        """Record that the first ``upto`` records are on disk and wake their waiters"""
+        with self._lock:
+            self._synced = max(self._synced, upto)
+            ready = [future for count, future in self._waiters if count <= self._synced]
+            self._waiters = [(count, future) for count, future in self._waiters if count > self._synced]
+        _wake(ready)
+
+    def _new_segment(self):
+        if self._file is not None:
+            self._file.close()
+        number = int(os.path.basename(self._segments[-1])[:-len(SEGMENT_SUFFIX)]) + 1 if self._segments else 1
+        path = os.path.join(self.directory, f"{number:010d}{SEGMENT_SUFFIX}")
+        self._file = open(path, "ab")
+        self._segment_size = 0
+        self._segments.append(path)
+        # Make the new file's directory entry durable too
+        directory = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def _segment_paths(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(SEGMENT_SUFFIX))
+        return [os.path.join(self.directory, name) for name in names]
+
+    def run(self):
+        while True:
+            with self._lock:
+                while not self._stopping and not self._buffer:
+                    self._pending.wait()
+                if self._stopping:
+                    return
+                # Let the window's appends gather before paying for one fsync
+                self._pending.wait(self.fsync_interval)
+            with self._io_lock:
+                self._write(*self._take())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open": self.is_open,
+                "tables": len(self._live),
+                "buffered": len(self._buffer),
+                "segments": len(self._segments),
+                "records": self.records,
+                "fsyncs": self.fsyncs,
+                "rotations": self.rotations,
+                "compactions": self.compactions,
+                "torn_records": self.torn_records,
+            }
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+def _wake(futures: List[asyncio.Future]):
+    """Resolve futures from the writer thread, on their own event loops"""
+    for future in futures:
+        try:
+            future.get_loop().call_soon_threadsafe(_resolve, future)
+        except RuntimeError:
+            pass  # The loop has closed; nobody is waiting any more
+
+table_wal = TableWAL()
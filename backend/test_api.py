@@ -2,6 +2,7 @@ import pytest
 from fastapi.testclient import TestClient
 from main import app
 import json
+from dataclasses import replace
 
 client = TestClient(app)
 
@@ -109,6 +110,8 @@ class TestGameAPI:
         data = response.json()
         assert data["game_state"]["current_street"] == "flop"
         assert len(data["community_cards"]) == 3
+        assert data["game_state"]["community_cards"] == data["community_cards"]
+        assert all(isinstance(card, str) and len(card) == 2 for card in data["community_cards"])
     
     def test_deal_turn(self):
         """Test dealing the turn"""
@@ -176,6 +179,250 @@ class TestGameAPI:
         assert "community_cards" in data
         assert "pot_amount" in data
 
+class TestTablesAPI:
+    """Test cases for the table-scoped endpoints"""
+    
+    def test_tables_are_independent(self):
+        """Test that hands on different tables do not interfere"""
+        players = [
+            {"name": "Alice", "stack": 1000},
+            {"name": "Bob", "stack": 1000}
+        ]
+        client.post("/api/tables/table-a/start-hand", json=players)
+        client.post("/api/tables/table-b/start-hand", json=players)
+        
+        client.post("/api/tables/table-a/deal-flop")
+        
+        assert client.get("/api/tables/table-a/state").json()["current_street"] == "flop"
+        assert client.get("/api/tables/table-b/state").json()["current_street"] == "preflop"
+    
+    def test_players_persist_between_requests(self):
+        """Test that actions apply to the players seated at the table"""
+        players = [
+            {"name": "Alice", "stack": 500},
+            {"name": "Bob", "stack": 700}
+        ]
+        start = client.post("/api/tables/table-c/start-hand", json=players).json()
+        current = start["game_state"]["current_player_index"]
+        
+        response = client.post("/api/tables/table-c/action", json={"player_index": current, "action_type": "fold"})
+        
+        assert response.status_code == 200
+        state = client.get("/api/tables/table-c/state").json()
+        assert [p["name"] for p in state["players"]] == ["Alice", "Bob"]
+        assert state["players"][current]["is_active"] == False
+    
+    def test_legal_actions(self):
+        """Test listing the actions open to the player to act"""
+        players = [
+            {"name": "Alice", "stack": 1000},
+            {"name": "Bob", "stack": 1000}
+        ]
+        client.post("/api/tables/table-d/start-hand", json=players)
+        
+        data = client.get("/api/tables/table-d/legal-actions").json()
+        
+        assert data["actions"]["call"] == {"amount": 20}
+        assert "check" not in data["actions"]
+        assert data["street_complete"] == False
+    
+    def test_create_list_and_close_table(self):
+        """Test the table lifecycle endpoints"""
+        table_id = client.post("/api/tables/").json()["table_id"]
+        assert table_id in client.get("/api/tables/").json()["tables"]
+        
+        assert client.delete(f"/api/tables/{table_id}").status_code == 200
+        assert client.get(f"/api/tables/{table_id}/state").status_code == 404
+    
+    def test_idle_tables_are_evicted(self):
+        """Test evicting tables idle beyond the timeout"""
+        from table_registry import TableRegistry
+        registry = TableRegistry(idle_timeout=60)
+        table = registry.create("idle")
+        registry.create("busy").touch()
+        
+        assert registry.evict_idle(now=table.last_active + 30) == 0
+        assert registry.evict_idle(now=table.last_active + 120) == 2
+        assert len(registry) == 0
+
+class TestConditionalStateAPI:
+    """Test cases for versioned state polling"""
+    
+    players = [
+        {"name": "Alice", "stack": 1000},
+        {"name": "Bob", "stack": 1000}
+    ]
+    
+    def test_not_modified_until_state_changes(self):
+        """Test that a matching If-None-Match gets a 304 until the next change"""
+        client.post("/api/tables/etag-table/start-hand", json=self.players)
+        first = client.get("/api/tables/etag-table/state")
+        etag = first.headers["etag"]
+        
+        unchanged = client.get("/api/tables/etag-table/state", headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+        
+        client.post("/api/tables/etag-table/deal-flop")
+        changed = client.get("/api/tables/etag-table/state", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert changed.json()["version"] > first.json()["version"]
+    
+    def test_actions_since_version(self):
+        """Test that since_version returns only the newer actions"""
+        start = client.post("/api/tables/since-table/start-hand", json=self.players).json()["game_state"]
+        version = start["version"]
+        client.post("/api/tables/since-table/action", json={"player_index": start["current_player_index"], "action_type": "call"})
+        
+        changes = client.get(f"/api/tables/since-table/state?since_version={version}").json()
+        
+        assert [a["action_type"] for a in changes["actions"]] == ["call"]
+        assert changes["since_version"] == version
+        assert changes["state"] is None
+        
+        resync = client.get("/api/tables/since-table/state?since_version=0").json()
+        assert resync["state"]["version"] == changes["version"]
+        
+        assert client.get("/api/tables/since-table/state?since_version=99999").status_code == 400
+
+class TestTableUpdatesAPI:
+    """Test cases for pushing table state to spectators"""
+    
+    players = [
+        {"name": "Alice", "stack": 1000},
+        {"name": "Bob", "stack": 1000}
+    ]
+    
+    def test_websocket_snapshot_and_deltas(self):
+        """Test that a WebSocket subscriber gets a snapshot then deltas"""
+        client.post("/api/tables/ws-table/start-hand", json=self.players)
+        
+        with client.websocket_connect("/api/tables/ws-table/ws") as websocket:
+            snapshot = websocket.receive_json()
+            assert snapshot["type"] == "snapshot"
+            assert snapshot["state"]["current_street"] == "preflop"
+            
+            client.post("/api/tables/ws-table/deal-flop")
+            delta = websocket.receive_json()
+        
+        assert delta["type"] == "delta"
+        assert delta["base_version"] == snapshot["version"]
+        assert len(delta["community_cards"]) == 3
+        assert delta["state"]["current_street"] == "flop"
+    
+    def test_websocket_ignores_client_messages(self):
+        """Test that a message from the client, such as a keepalive, does not end the subscription"""
+        client.post("/api/tables/ws-table/start-hand", json=self.players)
+        
+        with client.websocket_connect("/api/tables/ws-table/ws") as websocket:
+            websocket.receive_json()
+            websocket.send_text("ping")
+            websocket.send_json({"type": "keepalive"})
+            client.post("/api/tables/ws-table/deal-flop")
+            delta = websocket.receive_json()
+        
+        assert delta["type"] == "delta"
+        assert delta["state"]["current_street"] == "flop"
+    
+    def test_websocket_unknown_table(self):
+        """Test that subscribing to a missing table is refused"""
+        from starlette.websockets import WebSocketDisconnect
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/api/tables/no-such-table/ws") as websocket:
+                websocket.receive_json()
+    
+    def test_event_stream(self):
+        """Test the server-sent events fallback until the table closes"""
+        import asyncio
+        import httpx
+        
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                await async_client.post("/api/tables/sse-table/start-hand", json=self.players)
+                stream = asyncio.ensure_future(async_client.get("/api/tables/sse-table/events"))
+                await asyncio.sleep(0.05)
+                await async_client.post("/api/tables/sse-table/deal-flop")
+                await async_client.delete("/api/tables/sse-table")
+                return await stream
+        
+        response = asyncio.run(scenario())
+        
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            json.loads(line[len("data: "):])
+            for line in response.text.splitlines() if line.startswith("data: ")
+        ]
+        assert [event["type"] for event in events] == ["snapshot", "delta"]
+        assert events[1]["version"] == events[0]["version"] + 1
+
+class TestEquityAPI:
+    """Test cases for the equity endpoint"""
+    
+    def test_equity_for_given_hands(self):
+        """Test Monte Carlo equity for explicit hands"""
+        response = client.get("/api/game/equity", params={"hands": "AhAd,7c2d", "mode": "monte_carlo", "iterations": 20000})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["iterations"] <= 20000
+        assert abs(sum(data["equities"]) - 1) < 1e-9
+        assert data["players"][0]["equity"] > 0.8
+    
+    def test_equity_on_complete_board(self):
+        """Test that a complete board needs a single evaluation"""
+        params = {"hands": "AhAd,KdKc", "board": "2h3d4c5s6s"}
+        response = client.get("/api/game/equity", params=params)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["iterations"] == 1
+        assert data["equities"] == [0.5, 0.5]
+    
+    def test_equity_for_current_hand(self):
+        """Test equity for the live hand"""
+        players = [
+            {"name": "Alice", "stack": 1000},
+            {"name": "Bob", "stack": 1000}
+        ]
+        client.post("/api/game/start-hand", json=players)
+        
+        response = client.get("/api/game/equity")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["name"] for p in data["players"]] == ["Alice", "Bob"]
+    
+    def test_preflop_equity_lookup(self):
+        """Test looking up preflop equity by starting-hand class"""
+        response = client.get("/api/game/equity/preflop", params={"hand": "AA", "versus": "KK"})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["hand"] == "AA"
+        assert data["equity"] > 0.75
+        
+        response = client.get("/api/game/equity/preflop", params={"hand": "AKx"})
+        assert response.status_code == 400
+    
+    def test_equity_invalid_cards(self):
+        """Test rejecting duplicated cards"""
+        response = client.get("/api/game/equity", params={"hands": "AhAd,AhKc"})
+        assert response.status_code == 400
+    
+    def test_exact_equity_runout_limit(self):
+        """Test that exact equity is refused for deals with too many runouts to enumerate"""
+        response = client.get("/api/game/equity", params={"hands": "AhAd,KdKc", "mode": "exact"})
+        
+        assert response.status_code == 400
+        assert "runouts" in response.json()["detail"]
+    
+    def test_equity_limits(self):
+        """Test rejecting iteration counts, time budgets and precision targets out of range"""
+        for params in ({"iterations": 10 ** 7}, {"iterations": 0}, {"time_budget_ms": 10 ** 9}, {"target_ci": 0}):
+            response = client.get("/api/game/equity", params={"hands": "AhAd,KdKc", **params})
+            assert response.status_code == 422, params
+
 class TestHandHistoryAPI:
     """Test cases for the hand history API endpoints"""
     
@@ -217,6 +464,141 @@ class TestHandHistoryAPI:
         data = response.json()
         assert "actions" in data
         assert isinstance(data["actions"], list)
+    
+    def test_keyset_pagination(self, monkeypatch):
+        """Test that pages chain through next_cursor"""
+        from datetime import datetime, timedelta
+        from models import HandHistory
+        from routers import hand_router
+        
+        base = datetime(2024, 1, 1, 12, 0, 0)
+        stored = [
+            HandHistory(f"hand-{i}", [], [], 60, {}, base + timedelta(seconds=i // 2), id=i)
+            for i in range(7)
+        ]
+        
+        class FakeRepository:
+            async def get_hand_history(self, limit=10, before=None, include_actions=False):
+                rows = sorted(stored, key=lambda h: (h.created_at, h.id), reverse=True)
+                if before is not None:
+                    rows = [h for h in rows if (h.created_at, h.id) < before]
+                return rows[:limit]
+        
+        monkeypatch.setattr(hand_router, "hand_repository", FakeRepository())
+        
+        seen = []
+        cursor = None
+        while True:
+            url = "/api/hands?limit=3" + (f"&cursor={cursor}" if cursor else "")
+            data = client.get(url).json()
+            seen.extend(h["hand_id"] for h in data["hands"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        
+        assert seen == [f"hand-{i}" for i in reversed(range(7))]
+    
+    def test_hand_details_and_included_actions(self, monkeypatch):
+        """Test that hands come back with their actions in one response"""
+        from datetime import datetime
+        from models import Action, HandHistory, Player
+        from routers import hand_router
+        
+        hand = HandHistory(
+            "hand-1", [Player("Alice", 1000, ["Ah", "Kd"])], ["2h", "7d", "9c"], 60, {"winner": "Alice"},
+            datetime(2024, 1, 1), id=1, actions=[Action("Alice", "bet", 40, "flop")]
+        )
+        
+        class FakeRepository:
+            async def get_hand(self, hand_id):
+                return hand if hand_id == "hand-1" else None
+            
+            async def get_hand_history(self, limit=10, before=None, include_actions=False):
+                return [hand] if include_actions else [replace(hand, actions=None)]
+        
+        monkeypatch.setattr(hand_router, "hand_repository", FakeRepository())
+        
+        details = client.get("/api/hands/hand-1").json()
+        assert details["pot_amount"] == 60
+        assert details["actions"] == [{"player_name": "Alice", "action_type": "bet", "amount": 40, "street": "flop"}]
+        assert client.get("/api/hands/missing").status_code == 404
+        
+        assert "actions" not in client.get("/api/hands").json()["hands"][0]
+        assert client.get("/api/hands?include=actions").json()["hands"][0]["actions"][0]["amount"] == 40
+        assert client.get("/api/hands?include=players").status_code == 400
+    
+    def test_invalid_paging_parameters(self):
+        """Test rejecting bad cursors and page sizes"""
+        assert client.get("/api/hands?cursor=not-a-cursor").status_code == 400
+        assert client.get("/api/hands?limit=0").status_code == 400
+        assert client.get("/api/hands?limit=1000").status_code == 400
+
+class TestRepositoryConcurrency:
+    """Test that database I/O does not block the event loop"""
+    
+    def test_actions_responsive_during_slow_history_query(self, monkeypatch):
+        """Test that table actions complete while a history query is running"""
+        import asyncio
+        import time
+        import httpx
+        from repositories.hand_repository import HandRepository
+        from repositories.async_hand_repository import AsyncHandRepository
+        from routers import hand_router
+        
+        class SlowHandRepository(HandRepository):
+            def get_hand_history(self, limit: int = 10, before=None, include_actions=False):
+                time.sleep(0.5)
+                return []
+        
+        repository = AsyncHandRepository(SlowHandRepository(), max_workers=2)
+        monkeypatch.setattr(hand_router, "hand_repository", repository)
+        players = [
+            {"name": "Alice", "stack": 1000},
+            {"name": "Bob", "stack": 1000}
+        ]
+        
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                history = asyncio.ensure_future(async_client.get("/api/hands/"))
+                await asyncio.sleep(0.05)
+                start = time.perf_counter()
+                response = await async_client.post("/api/tables/busy-table/start-hand", json=players)
+                action_latency = time.perf_counter() - start
+                history_done_first = history.done()
+                await history
+                return response, action_latency, history_done_first
+        
+        response, action_latency, history_done_first = asyncio.run(scenario())
+        repository.shutdown()
+        
+        assert response.status_code == 200
+        assert not history_done_first
+        assert action_latency < 0.25
+
+class TestEvalAPI:
+    """Test cases for the evaluation API endpoints"""
+    
+    def test_batch_evaluation(self):
+        """Test ranking a batch of hands"""
+        # Ah Ad vs Kd Qc on a 2h 7d 9c Js Kh board
+        request = {
+            "hands": [[48, 49], [45, 42]],
+            "board": [0, 21, 30, 39, 44],
+            "include_descriptions": True
+        }
+        response = client.post("/api/eval/batch", json=request)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["ranks"]) == 2
+        assert data["ranks"][0] > data["ranks"][1]
+        assert data["descriptions"] == ["One pair", "One pair"]
+    
+    def test_batch_evaluation_invalid_cards(self):
+        """Test rejecting invalid card codes"""
+        response = client.post("/api/eval/batch", json={"hands": [[0, 1, 2, 3, 99]]})
+        assert response.status_code == 400
 
 class TestRootEndpoint:
     """Test cases for the root endpoint"""
@@ -0,0 +1,122 @@
+import random
+
+from deck_provider import SeededDeckProvider
+from game_logic import PokerGame
+from models import Player
+
+def new_hand(stacks):
+    game = PokerGame(deck_provider=SeededDeckProvider(7))
+    players = [Player(f"Player{i}", stack, []) for i, stack in enumerate(stacks)]
+    game.start_new_hand(players)
+    return game, players
+
+def act(game, players, action_type, amount=0):
+    assert game.make_action(players, game.current_player_index, action_type, amount)
+
+class TestBettingLedger:
+    """Test cases for the incremental betting ledger"""
+
+    def test_matches_full_recount(self):
+        """Test that the ledger agrees with recounting the players after every action"""
+        rng = random.Random(3)
+        for _ in range(200):
+            game, players = new_hand([rng.choice([100, 1000, 5000]) for _ in range(rng.randint(2, 6))])
+            for _ in range(20):
+                legal = game.legal_actions(players, game.current_player_index)
+                if not legal or game.ledger.active_count < 2:
+                    break
+                action_type = rng.choice(sorted(legal))
+                options = legal[action_type]
+                amount = rng.randint(options["min"], options["max"]) if "min" in options else 0
+                act(game, players, action_type, amount)
+
+                active = [p for p in players if p.is_active]
+                max_bet = max(p.current_bet for p in active)
+                ledger = game.ledger
+                assert ledger.max_bet == max_bet
+                assert ledger.active_count == len(active)
+                assert ledger.all_in_count == sum(p.is_all_in for p in active)
+                assert ledger.unmatched_count == sum(
+                    1 for p in active if not p.is_all_in and p.current_bet < max_bet
+                )
+
+    def test_street_completes_after_everyone_acts(self):
+        """Test that a street is complete once the big blind has had the option"""
+        game, players = new_hand([1000, 1000, 1000])
+        act(game, players, "call")
+        act(game, players, "call")
+        assert not game.is_hand_complete(players)
+
+        act(game, players, "check")
+        assert game.is_hand_complete(players)
+
+    def test_raise_reopens_action(self):
+        """Test that a raise makes players who already acted act again"""
+        game, players = new_hand([1000, 1000, 1000])
+        game.deal_flop(players)
+        act(game, players, "check")
+        act(game, players, "bet", 100)
+        assert not game.is_hand_complete(players)
+
+        act(game, players, "call")
+        assert not game.is_hand_complete(players)
+        act(game, players, "call")
+        assert game.is_hand_complete(players)
+
+    def test_legal_actions_facing_a_bet(self):
+        """Test the actions offered to a player facing the big blind"""
+        game, players = new_hand([1000, 1000, 1000])
+        legal = game.legal_actions(players, game.current_player_index)
+
+        assert "check" not in legal
+        assert legal["call"] == {"amount": 40}
+        assert legal["raise"]["min"] == 40
+        assert legal["all_in"] == {"amount": 1000}
+        assert game.legal_actions(players, (game.current_player_index + 1) % 3) == {}
+
+    def test_bet_facing_a_bet_must_be_a_full_raise(self):
+        """Test that a bet smaller than the outstanding bet is refused, and a full one counts as a raise"""
+        game, players = new_hand([5000, 5000, 5000])
+        act(game, players, "bet", 1000)
+        player = players[game.current_player_index]
+        assert "bet" not in game.legal_actions(players, game.current_player_index)
+
+        assert game.make_action(players, game.current_player_index, "bet", game.min_bet // 2) is False
+        assert player.stack + player.current_bet == 5000
+        act(game, players, "bet", game._get_min_raise(players))
+        assert game.actions[-1].action_type == "raise"
+        assert player.current_bet > 1000
+
+    def test_everyone_all_in_does_not_spin(self):
+        """Test that moving on when nobody can act leaves the turn where it is"""
+        game, players = new_hand([1000, 1000])
+        act(game, players, "all_in")
+        act(game, players, "all_in")
+
+        assert game.ledger.can_act_count == 0
+        assert game.is_hand_complete(players)
+
+    def test_streets_open_with_a_player_who_can_act(self):
+        """Test that a folded seat left of the button does not get the first action on the flop"""
+        game, players = new_hand([1000, 1000, 1000])
+        act(game, players, "call")
+        act(game, players, "fold")
+        act(game, players, "check")
+        game.deal_flop(players)
+
+        assert game.current_player_index == 0
+        assert game.legal_actions(players, game.current_player_index)
+
+    def test_short_stacks_go_all_in(self):
+        """Test that posting a whole stack as a blind, or calling it off, puts the player all-in"""
+        game, players = new_hand([40, 1000, 1000])
+        assert players[0].is_all_in
+
+        game, players = new_hand([1000, 40, 1000])
+        act(game, players, "call")
+        assert players[1].is_all_in
+        act(game, players, "call")
+        # The big blind has nothing to call
+        assert game.make_action(players, game.current_player_index, "call") is False
+        act(game, players, "check")
+        assert game.is_hand_complete(players)
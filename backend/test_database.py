@@ -0,0 +1,177 @@
+import threading
+
+import psycopg2
+import psycopg2.extensions
+import pytest
+
+from database import ConnectionPool, PoolTimeout
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, params=None):
+        if self.connection.broken:
+            raise psycopg2.OperationalError("server closed the connection")
+        self.connection.queries.append(query)
+        self.connection.status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    """Stands in for a psycopg2 connection so the pool logic runs without a server"""
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.queries = []
+        self.rollbacks = 0
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+def make_pool(**options):
+    connections = []
+
+    def connect():
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    options.setdefault("min_size", 0)
+    options.setdefault("max_size", 2)
+    return ConnectionPool(connect=connect, **options), connections
+
+class TestConnectionPool:
+    """Test cases for the database connection pool"""
+
+    def test_connections_are_reused(self):
+        """Test that released connections are handed out again"""
+        pool, connections = make_pool(min_size=1)
+        pool.open()
+
+        for _ in range(5):
+            with pool.connection() as conn:
+                assert conn is connections[0]
+
+        stats = pool.stats()
+        assert stats["created"] == 1
+        assert stats["acquired"] == 5
+        assert stats["idle"] == 1
+
+    def test_acquire_times_out_when_exhausted(self):
+        """Test that callers give up after the acquire timeout"""
+        pool, _ = make_pool(max_size=1)
+        held = pool.acquire()
+
+        with pytest.raises(PoolTimeout):
+            pool.acquire(timeout=0.05)
+
+        assert pool.stats()["timeouts"] == 1
+        pool.release(held)
+
+    def test_waiter_gets_released_connection(self):
+        """Test that a waiting caller is woken by a release"""
+        pool, connections = make_pool(max_size=1)
+        held = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=5)))
+        waiter.start()
+
+        pool.release(held)
+        waiter.join()
+
+        assert acquired == [connections[0]]
+
+    def test_concurrent_acquires_respect_max_size(self):
+        """Test that callers connecting at the same time never open more than max_size connections"""
+        class SlowConnectPool(ConnectionPool):
+            def _new_connection(self):
+                # Widen the gap between the size check and the connection attempt
+                threading.Event().wait(0.02)
+                return super()._new_connection()
+
+        connections = []
+        started = threading.Barrier(8)
+
+        def connect():
+            connections.append(FakeConnection())
+            return connections[-1]
+
+        pool = SlowConnectPool(connect=connect, min_size=0, max_size=2, acquire_timeout=5)
+
+        def borrow():
+            started.wait()
+            with pool.connection():
+                threading.Event().wait(0.01)
+
+        threads = [threading.Thread(target=borrow) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(connections) == 2
+        assert pool.stats()["size"] == 2
+
+    def test_failed_connect_frees_its_slot(self):
+        """Test that a connection attempt that fails does not use up a slot"""
+        attempts = []
+
+        def connect():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise psycopg2.OperationalError("connection refused")
+            return FakeConnection()
+
+        pool = ConnectionPool(connect=connect, min_size=0, max_size=1, acquire_timeout=0.1)
+        with pytest.raises(psycopg2.OperationalError):
+            pool.acquire()
+
+        assert pool.stats()["size"] == 0
+        assert pool.acquire() is not None
+
+    def test_open_transaction_rolled_back_on_release(self):
+        """Test that a connection is returned without leftover transaction state"""
+        pool, connections = make_pool()
+        with pool.connection() as conn:
+            conn.cursor().execute("SELECT 1")
+
+        assert connections[0].rollbacks == 1
+
+    def test_stale_connection_replaced(self):
+        """Test that a connection failing its health check is discarded"""
+        pool, connections = make_pool(health_check_interval=0)
+        with pool.connection():
+            pass
+        connections[0].broken = True
+
+        with pool.connection() as conn:
+            assert conn is connections[1]
+
+        assert connections[0].closed
+        assert pool.stats()["discarded"] == 1
+
+    def test_closed_connection_not_returned_to_pool(self):
+        """Test that a connection closed while in use is dropped on release"""
+        pool, connections = make_pool()
+        with pool.connection() as conn:
+            conn.close()
+
+        assert pool.stats()["size"] == 0
+
+    def test_invalid_sizes(self):
+        """Test rejecting inconsistent pool sizes"""
+        with pytest.raises(ValueError):
+            ConnectionPool(connect=FakeConnection, min_size=3, max_size=2)
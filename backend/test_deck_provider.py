@@ -0,0 +1,67 @@
+import time
+
+import numpy as np
+
+from deck_provider import DeckPool, SeededDeckProvider, shuffled_decks
+from game_logic import PokerGame
+from models import Player
+
+FULL_DECK = list(range(52))
+
+def wait_for_ready(pool: DeckPool, ready: int):
+    deadline = time.monotonic() + 5
+    while pool.stats()["ready"] < ready and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+def deal_hand(game: PokerGame):
+    players = [Player("Alice", 1000, []), Player("Bob", 1000, [])]
+    game.start_new_hand(players)
+    game.deal_flop(players)
+    return [p.cards for p in players], list(game.community_cards)
+
+class TestShuffledDecks:
+    """Test cases for bulk deck generation"""
+
+    def test_rows_are_permutations(self):
+        """Test that every generated row is a full deck"""
+        decks = shuffled_decks(np.random.default_rng(1), 100)
+
+        assert decks.shape == (100, 52)
+        assert all(sorted(row) == FULL_DECK for row in decks.tolist())
+        assert len({tuple(row) for row in decks.tolist()}) == 100
+
+    def test_seeded_provider_is_reproducible(self):
+        """Test that the same seed deals the same hands"""
+        first = PokerGame(deck_provider=SeededDeckProvider(42))
+        second = PokerGame(deck_provider=SeededDeckProvider(42))
+
+        assert [deal_hand(first) for _ in range(3)] == [deal_hand(second) for _ in range(3)]
+
+class TestDeckPool:
+    """Test cases for the background-refilled deck ring buffer"""
+
+    def test_shuffles_inline_when_not_running(self):
+        """Test that a stopped pool still deals, counting each deck as a miss"""
+        pool = DeckPool(size=8, batch_size=4, seed=1)
+
+        assert sorted(pool.next_deck()) == FULL_DECK
+        assert pool.stats()["misses"] == 1
+
+    def test_refills_across_the_ring(self):
+        """Test that the pool keeps dealing full decks as the ring wraps around"""
+        pool = DeckPool(size=10, batch_size=4, seed=1)
+        pool.start()
+        try:
+            decks = []
+            for _ in range(50):
+                wait_for_ready(pool, 1)
+                decks.append(pool.next_deck())
+            stats = pool.stats()
+        finally:
+            pool.stop()
+
+        assert all(sorted(deck) == FULL_DECK for deck in decks)
+        assert stats["dealt"] == 50 and stats["misses"] == 0
+        assert stats["refills"] >= 50 // 4
+        assert stats["ready"] <= 10
+        assert not pool.running
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+
+from equity import EquityCalculator, LRUCache, canonicalize
+from hand_evaluator import parse_cards
+from preflop_tables import get_preflop_tables
+
+def run(coro):
+    return asyncio.run(coro)
+
+@pytest.fixture
+def calculator():
+    calculator = EquityCalculator(max_workers=1)
+    yield calculator
+    calculator.shutdown()
+
+class TestCanonicalize:
+    """Test cases for suit-isomorphic canonical deals"""
+
+    def test_suit_permutation_shares_key(self):
+        """Test that relabelled suits and reordered players map to one key"""
+        key_a, positions_a = canonicalize([parse_cards("AhKh"), parse_cards("QdQc")], parse_cards("2h7h9c"))
+        key_b, positions_b = canonicalize([parse_cards("QsQh"), parse_cards("AdKd")], parse_cards("9h2d7d"))
+
+        assert key_a == key_b
+        assert positions_a == list(reversed(positions_b))
+
+    def test_different_suit_structure(self):
+        """Test that non-isomorphic deals get different keys"""
+        key_a, _ = canonicalize([parse_cards("AhKh"), parse_cards("QdQc")], parse_cards("2h7h9c"))
+        key_b, _ = canonicalize([parse_cards("AhKd"), parse_cards("QdQc")], parse_cards("2h7h9c"))
+
+        assert key_a != key_b
+
+class TestEquityCalculator:
+    """Test cases for exact and Monte Carlo equity"""
+
+    def test_exact_river_equity(self, calculator):
+        """Test enumerating the river for a flush draw"""
+        result = run(calculator.exact([parse_cards("AhKh"), parse_cards("QdQc")], parse_cards("2h7h9c5s")))
+
+        # Nine hearts plus three aces and three kings win for AhKh out of 44 rivers
+        assert result.iterations == 44
+        assert result.equities[0] == pytest.approx(15 / 44)
+        assert result.confidence_interval == 0.0
+
+    def test_exact_results_are_memoized(self, calculator):
+        """Test that isomorphic deals hit the exact-equity cache"""
+        first = run(calculator.exact([parse_cards("AhKh"), parse_cards("QdQc")], parse_cards("2h7h9c")))
+        second = run(calculator.exact([parse_cards("QsQh"), parse_cards("AdKd")], parse_cards("9h2d7d")))
+
+        assert calculator.exact_cache.hits == 1
+        assert second.equities == list(reversed(first.equities))
+
+    def test_auto_mode_selection(self, calculator):
+        """Test that auto mode enumerates late streets and samples preflop"""
+        holes = [parse_cards("AhKh"), parse_cards("QdQc")]
+
+        assert run(calculator.calculate(holes, parse_cards("2h7h9c"))).method == "exact"
+        multiway = holes + [parse_cards("9s8s")]
+        preflop = run(calculator.calculate(multiway, [], max_iterations=4000))
+        assert preflop.method == "monte_carlo"
+        assert preflop.iterations <= 4000
+
+    def test_auto_mode_uses_preflop_tables(self, calculator):
+        """Test that heads-up preflop equity comes from the preflop tables"""
+        if get_preflop_tables() is None:
+            pytest.skip("preflop table file has not been built")
+        result = run(calculator.calculate([parse_cards("AhAd"), parse_cards("KsKc")], []))
+
+        assert result.method == "preflop_table"
+        assert result.equities[0] == pytest.approx(0.82, abs=0.02)
+
+    def test_monte_carlo_close_to_exact(self, calculator):
+        """Test that sampling converges on the enumerated equity"""
+        holes = [parse_cards("AhKh"), parse_cards("QdQc")]
+        board = parse_cards("2h7h9c")
+
+        exact = run(calculator.exact(holes, board))
+        sampled = run(calculator.monte_carlo(holes, board, max_iterations=40000, target_ci=0, time_budget=30))
+
+        assert sampled.equities[0] == pytest.approx(exact.equities[0], abs=0.02)
+
+class TestLRUCache:
+    """Test cases for the bounded LRU cache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted first"""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert len(cache) == 2
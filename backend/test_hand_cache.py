@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+import cache
+from cache import LRUCache
+from hand_cache import HandCache
+from main import app
+from models import Action, Hand, HandHistory, Player
+from repositories.async_hand_repository import AsyncHandRepository
+
+client = TestClient(app)
+
+def make_history(hand_id: str) -> HandHistory:
+    return HandHistory(hand_id, [Player("Alice", 1000, ["Ah", "Kd"])], [], 60, {}, datetime(2024, 1, 1), id=1, actions=[])
+
+class CountingRepository:
+    """Synchronous repository stand-in that counts database round-trips"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_hand(self, hand_id):
+        self.calls += 1
+        return make_history(hand_id) if hand_id != "missing" else None
+
+    def get_hand_history(self, limit=10, before=None, include_actions=False):
+        self.calls += 1
+        return [make_history(f"hand-{n}") for n in range(limit)]
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+class TestLRUCacheTTL:
+    """Test cases for time-limited cache entries"""
+
+    def test_entries_expire(self, monkeypatch):
+        """Test that an entry older than the TTL is a miss"""
+        now = [100.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        entries = LRUCache(10, ttl=5)
+        entries.put("a", 1)
+
+        now[0] = 104.0
+        assert entries.get("a") == 1
+        now[0] = 106.0
+        assert entries.get("a") is None
+
+        assert entries.stats()["expired"] == 1
+        assert len(entries) == 0
+
+class TestCachedRepository:
+    """Test cases for the read-through hand cache"""
+
+    def test_hand_details_read_through(self):
+        """Test that a hand is fetched once and then served from the cache"""
+        repository = CountingRepository()
+        hand_cache = HandCache()
+        cached = AsyncHandRepository(repository, max_workers=1, cache=hand_cache)
+
+        first = run(cached.get_hand("hand-1"))
+        second = run(cached.get_hand("hand-1"))
+        assert run(cached.get_hand("missing")) is None
+        cached.shutdown()
+
+        assert first is second
+        assert repository.calls == 2
+        assert hand_cache.stats()["hands"]["hits"] == 1
+
+    def test_first_page_invalidated_by_new_hand(self):
+        """Test that a completed hand drops cached history pages"""
+        repository = CountingRepository()
+        hand_cache = HandCache()
+        cached = AsyncHandRepository(repository, max_workers=1, cache=hand_cache)
+
+        run(cached.get_hand_history(5))
+        run(cached.get_hand_history(5))
+        assert repository.calls == 1
+
+        hand_cache.add_completed(Hand("new-hand", [], [], 60, actions=[Action("Alice", "fold")]))
+        run(cached.get_hand_history(5))
+        cached.shutdown()
+
+        assert repository.calls == 2
+        assert hand_cache.get_hand("new-hand").actions[0].action_type == "fold"
+
+    def test_deeper_pages_not_cached(self):
+        """Test that cursor pages always go to the database"""
+        repository = CountingRepository()
+        cached = AsyncHandRepository(repository, max_workers=1, cache=HandCache())
+
+        for _ in range(2):
+            run(cached.get_hand_history(5, (datetime(2024, 1, 1), 10)))
+        cached.shutdown()
+
+        assert repository.calls == 2
+
+class TestCompletedHandAPI:
+    """Test that completed hands are readable before they reach the database"""
+
+    def test_completed_hand_served_from_cache(self):
+        """Test reading a hand right after completing it"""
+        players = [
+            {"name": "Alice", "stack": 1000},
+            {"name": "Bob", "stack": 1000}
+        ]
+        hand_id = client.post("/api/tables/cache-table/start-hand", json=players).json()["hand_id"]
+        client.post("/api/tables/cache-table/complete-hand")
+
+        response = client.get(f"/api/hands/{hand_id}")
+
+        assert response.status_code == 200
+        assert [p["name"] for p in response.json()["players"]] == ["Alice", "Bob"]
+        assert client.get("/api/db/cache").json()["hands"]["hits"] >= 1
@@ -0,0 +1,124 @@
+import random
+import numpy as np
+import pytest
+from pokerkit import StandardHighHand
+
+from hand_evaluator import (
+    evaluate, evaluate_batch, evaluate_hand, card_to_int, int_to_card, parse_cards, format_cards, cards_mask,
+)
+from game_logic import PokerGame
+from models import Player
+
+class TestHandEvaluator:
+    """Test cases for the lookup-table hand evaluator"""
+
+    def test_card_round_trip(self):
+        """Test converting cards between strings and integer codes"""
+        for code in range(52):
+            assert card_to_int(int_to_card(code)) == code
+        assert card_to_int("Ah") == 48
+
+    def test_format_and_mask(self):
+        """Test formatting integer codes and packing them into a bitmask"""
+        cards = parse_cards("Ah2hKd")
+        assert format_cards(cards) == ["Ah", "2h", "Kd"]
+        assert cards_mask(cards) == (1 << 48) | (1 << 0) | (1 << 45)
+
+    def test_hand_classes(self):
+        """Test describing each hand class"""
+        assert evaluate_hand(["2h", "7d", "9c", "Js", "Kh"])[1] == "High card"
+        assert evaluate_hand(["Ah", "Ad", "9c", "Js", "Kh"])[1] == "One pair"
+        assert evaluate_hand(["Ah", "Ad", "9c", "9s", "Kh"])[1] == "Two pair"
+        assert evaluate_hand(["Ah", "Ad", "Ac", "9s", "Kh"])[1] == "Three of a kind"
+        assert evaluate_hand(["Ah", "2d", "3c", "4s", "5h"])[1] == "Straight"
+        assert evaluate_hand(["Ah", "2h", "7h", "9h", "Kh"])[1] == "Flush"
+        assert evaluate_hand(["Ah", "Ad", "Ac", "9s", "9h"])[1] == "Full house"
+        assert evaluate_hand(["Ah", "Ad", "Ac", "As", "9h"])[1] == "Four of a kind"
+        assert evaluate_hand(["Th", "Jh", "Qh", "Kh", "Ah", "2c", "3d"])[1] == "Straight flush"
+
+    def test_wheel_is_lowest_straight(self):
+        """Test that the wheel ranks below a six-high straight"""
+        wheel = evaluate_hand(["Ah", "2d", "3c", "4s", "5h"])[0]
+        six_high = evaluate_hand(["6h", "2d", "3c", "4s", "5h"])[0]
+        assert wheel < six_high
+
+    def test_matches_pokerkit_ordering(self):
+        """Test that random 7-card hands order exactly like pokerkit"""
+        rng = random.Random(7)
+        deck = list(range(52))
+        hands = []
+        for _ in range(300):
+            cards = rng.sample(deck, 7)
+            text = "".join(int_to_card(card) for card in cards)
+            hands.append((evaluate_hand(cards), StandardHighHand.from_game(text[:4], text[4:])))
+
+        for (strength_a, label_a), kit_a in hands:
+            assert label_a == kit_a.entry.label.value
+        for ((a, _), kit_a), ((b, _), kit_b) in zip(hands, hands[1:]):
+            assert (a < b) == (kit_a < kit_b)
+            assert (a == b) == (kit_a == kit_b)
+
+    def test_invalid_hand(self):
+        """Test rejecting duplicate cards and wrong card counts"""
+        with pytest.raises(ValueError):
+            evaluate_hand(["Ah", "Ah", "2c", "3d", "4s"])
+        with pytest.raises(ValueError):
+            evaluate_hand(["Ah", "Kh", "2c", "3d"])
+
+    def test_batch_matches_single_evaluation(self):
+        """Test that vectorized batch ranks equal single-hand ranks"""
+        rng = np.random.default_rng(11)
+        hands = np.argsort(rng.random((2000, 52)), axis=1)[:, :7]
+
+        ranks = evaluate_batch(hands)
+
+        assert ranks.tolist() == [evaluate(hand) for hand in hands.tolist()]
+
+    def test_batch_with_shared_board(self):
+        """Test appending a shared board to every hand in a batch"""
+        board = [card_to_int(card) for card in ["2h", "7d", "9c", "Js", "Kh"]]
+        holes = [[card_to_int("Ah"), card_to_int("Ad")], [card_to_int("Kd"), card_to_int("Qc")]]
+
+        ranks = evaluate_batch(holes, board)
+
+        assert ranks.tolist() == [evaluate(hole + board) for hole in holes]
+
+    def test_batch_rejects_duplicates(self):
+        """Test that batch evaluation rejects duplicate cards"""
+        with pytest.raises(ValueError):
+            evaluate_batch([[0, 0, 5, 9, 13, 17, 21]])
+
+class TestEvaluateWinner:
+    """Test cases for showdown evaluation in PokerGame"""
+
+    def test_best_hand_wins_pot(self):
+        """Test that the best hand is awarded the pot"""
+        game = PokerGame()
+        game.community_cards = parse_cards("2h7d9cJsKh")
+        game.pot = 200
+        players = [
+            Player("Alice", 900, parse_cards("AhAd")),
+            Player("Bob", 900, parse_cards("KdQc")),
+        ]
+
+        result = game.evaluate_winner(players)
+
+        assert result["winner"] == "Alice"
+        assert result["hand_rank"] == "One pair"
+        assert players[0].stack == 1100
+
+    def test_split_pot(self):
+        """Test that tied hands split the pot"""
+        game = PokerGame()
+        game.community_cards = parse_cards("ThJhQhKhAh")
+        game.pot = 200
+        players = [
+            Player("Alice", 900, parse_cards("2c3d")),
+            Player("Bob", 900, parse_cards("4c5d")),
+        ]
+
+        result = game.evaluate_winner(players)
+
+        assert result["winners"] == ["Alice", "Bob"]
+        assert result["hand_rank"] == "Straight flush"
+        assert players[0].stack == players[1].stack == 1000
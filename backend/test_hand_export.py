@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from hand_export import CSV_COLUMNS, csv_chunks, ndjson_chunks
+from hand_import import iter_ndjson
+from main import app
+from repositories.hand_repository import HandRepository
+
+client = TestClient(app)
+
+def make_record(number: int) -> dict:
+    return {
+        "hand_id": f"hand-{number}",
+        "players": [{"name": "Alice", "stack": 1000, "cards": ["Ah", "Kd"]}],
+        "community_cards": ["2h", "7d", "9c"],
+        "pot_amount": 60 + number,
+        "winner": {"winner": "Alice", "reason": "Best hand: Pair, \"aces\""},
+        "created_at": f"2024-01-01T00:00:{number:02d}",
+        "actions": [{"player_name": "Alice", "action_type": "bet", "amount": 40, "street": "flop"}],
+    }
+
+CHUNKS = [[make_record(0), make_record(1)], [make_record(2)]]
+
+class TestExportFormats:
+    """Test cases for formatting exported hands"""
+
+    def test_ndjson_round_trips_through_import(self):
+        """Test that exported NDJSON is valid import input"""
+        text = "".join(ndjson_chunks(CHUNKS))
+        assert list(iter_ndjson(text.splitlines())) == [make_record(n) for n in range(3)]
+
+    def test_csv(self):
+        """Test the CSV header and JSON-encoded nested fields"""
+        text = "".join(csv_chunks(CHUNKS))
+
+        rows = list(csv.reader(io.StringIO(text)))
+
+        assert rows[0] == CSV_COLUMNS
+        assert len(rows) == 4
+        assert rows[1][3] == "2h 7d 9c"
+        assert json.loads(rows[1][5]) == make_record(0)["winner"]
+        assert json.loads(rows[3][6])[0]["amount"] == 40
+
+class TestExportAPI:
+    """Test cases for GET /api/hands/export"""
+
+    def test_streams_all_chunks(self, monkeypatch):
+        """Test that every chunk from the cursor reaches the response"""
+        monkeypatch.setattr(HandRepository, "iter_hand_chunks", lambda self, *args: iter(CHUNKS))
+
+        response = client.get("/api/hands/export?format=ndjson")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line)["hand_id"] for line in response.text.splitlines()] == ["hand-0", "hand-1", "hand-2"]
+
+    def test_database_failure_is_503(self, monkeypatch):
+        """Test that a failing query is reported before the stream starts"""
+        def failing(self, *args):
+            raise RuntimeError("connection refused")
+            yield
+
+        monkeypatch.setattr(HandRepository, "iter_hand_chunks", failing)
+
+        assert client.get("/api/hands/export").status_code == 503
+
+    def test_unknown_format(self):
+        """Test rejecting unsupported formats"""
+        assert client.get("/api/hands/export?format=xml").status_code == 400
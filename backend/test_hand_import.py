@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from hand_import import CopyStream, action_rows, chunked, hand_rows, iter_ndjson, unique_records
+from main import app
+
+client = TestClient(app)
+
+RECORD = {
+    "hand_id": "imported-1",
+    "players": [{"name": "O'Brien, Jr.", "stack": 1000, "cards": ["Ah", "Kd"]}],
+    "community_cards": ["2h", "7d", "9c"],
+    "pot_amount": 120,
+    "winner": {"winner": "O'Brien, Jr.", "reason": "Best hand: \"Pair\""},
+    "actions": [
+        {"player_name": "O'Brien, Jr.", "action_type": "check", "amount": None, "street": "flop"},
+        {"player_name": "O'Brien, Jr.", "action_type": "bet", "amount": 40, "street": "flop"},
+    ],
+}
+
+class TestNdjsonParsing:
+    """Test cases for reading import input"""
+
+    def test_parses_records_and_skips_blank_lines(self):
+        """Test reading hands one per line"""
+        lines = [json.dumps(RECORD), "", json.dumps({**RECORD, "hand_id": "imported-2"})]
+        assert [r["hand_id"] for r in iter_ndjson(lines)] == ["imported-1", "imported-2"]
+
+    def test_reports_bad_line(self):
+        """Test that errors name the offending line"""
+        with pytest.raises(ValueError, match="Line 2: invalid JSON"):
+            list(iter_ndjson([json.dumps(RECORD), "{not json"]))
+        with pytest.raises(ValueError, match="Line 1: missing pot_amount"):
+            list(iter_ndjson([json.dumps({"hand_id": "x", "players": [], "community_cards": []})]))
+
+    def test_rejects_malformed_records(self):
+        """Test that records that would not load back into players and actions are refused"""
+        bad_records = [
+            {**RECORD, "players": [{"name": "Alice", "stack": "1000", "cards": []}]},
+            {**RECORD, "players": [{"name": "Alice", "stack": 1000, "cards": [], "seat": 1}]},
+            {**RECORD, "players": {"name": "Alice"}},
+            {**RECORD, "pot_amount": True},
+            {**RECORD, "actions": [{"player_name": "Alice", "amount": 40}]},
+            {**RECORD, "hand_id": "x" * 51},
+        ]
+        for record in bad_records:
+            with pytest.raises(ValueError, match="Line 1"):
+                list(iter_ndjson([json.dumps(record)]))
+
+    def test_rejects_records_the_columns_cannot_hold(self):
+        """Test that values Postgres would reject fail here, naming their line and field"""
+        long_name = {"player_name": "x" * 101, "action_type": "call", "amount": 40, "street": "flop"}
+        cases = [
+            ({**RECORD, "created_at": "31/01/2024 noon"}, "created_at"),
+            ({**RECORD, "actions": [long_name]}, "actions\\[0\\].player_name is longer than 100"),
+            ({**RECORD, "actions": [{**long_name, "player_name": "Alice", "street": "s" * 21}]}, "street"),
+            ({**RECORD, "pot_amount": 2 ** 31}, "pot_amount"),
+        ]
+        for record, field in cases:
+            with pytest.raises(ValueError, match=f"Line 2 .*{field}"):
+                list(iter_ndjson([json.dumps(RECORD), json.dumps(record)]))
+        assert list(iter_ndjson([json.dumps({**RECORD, "created_at": "2024-01-31T12:00:00"})]))
+
+    def test_repeated_hand_id_keeps_first_record(self):
+        """Test that a hand_id repeated within a chunk contributes one hand and one set of actions"""
+        records = unique_records([RECORD, {**RECORD, "pot_amount": 999}, {**RECORD, "hand_id": "imported-2"}])
+
+        assert [(r["hand_id"], r["pot_amount"]) for r in records] == [("imported-1", 120), ("imported-2", 120)]
+        assert len(list(action_rows(records))) == 4
+
+    def test_chunked(self):
+        """Test splitting records into chunks"""
+        assert [len(chunk) for chunk in chunked(range(7), 3)] == [3, 3, 1]
+
+class TestCopyStream:
+    """Test cases for the CSV stream handed to COPY"""
+
+    def test_rows_survive_csv_round_trip(self):
+        """Test that JSON with commas and quotes is quoted correctly"""
+        stream = CopyStream(hand_rows([RECORD]))
+        text = "".join(iter(lambda: stream.read(16), ""))
+
+        row = next(csv.reader(io.StringIO(text)))
+
+        assert row[0] == "imported-1"
+        assert json.loads(row[1]) == RECORD["players"]
+        assert json.loads(row[4]) == RECORD["winner"]
+        assert row[3] == "120"
+
+    def test_action_rows(self):
+        """Test that actions keep their order and missing amounts are empty"""
+        text = CopyStream(action_rows([RECORD])).read()
+
+        lines = text.splitlines()
+        assert lines[0] == '"imported-1",0,"O\'Brien, Jr.","check","","flop"'
+        assert lines[1] == '"imported-1",1,"O\'Brien, Jr.","bet",40,"flop"'
+
+class TestImportAPI:
+    """Test cases for POST /api/hands/import"""
+
+    def test_rejects_invalid_line(self):
+        """Test that malformed input is rejected before touching the database"""
+        body = json.dumps(RECORD) + "\n{broken\n"
+        response = client.post("/api/hands/import", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+        assert response.status_code == 400
+        assert "Line 2" in response.json()["detail"]["message"]
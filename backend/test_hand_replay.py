@@ -0,0 +1,105 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from deck_provider import SeededDeckProvider
+from game_logic import PokerGame
+from hand_replay import HandReplay, public_event
+from main import app
+from models import Player
+from serialization import game_state_dict
+
+client = TestClient(app)
+
+def play_hand(seed, seats=4):
+    """Play one hand to showdown with random legal actions, keeping every intermediate state"""
+    rng = random.Random(seed)
+    game = PokerGame(deck_provider=SeededDeckProvider(seed))
+    players = [Player(f"Player{i}", rng.choice([200, 1000, 5000]), []) for i in range(seats)]
+    game.start_new_hand(players)
+    states = [None, game_state_dict(game)]
+    for street in ("flop", "turn", "river", None):
+        while not game.is_hand_complete(players):
+            legal = game.legal_actions(players, game.current_player_index)
+            if not legal:
+                break
+            action_type = rng.choice(sorted(legal))
+            options = legal[action_type]
+            amount = rng.randint(options["min"], options["max"]) if "min" in options else 0
+            assert game.make_action(players, game.current_player_index, action_type, amount)
+            states.append(game_state_dict(game))
+        if street is None or game.ledger.active_count < 2:
+            break
+        getattr(game, f"deal_{street}")(players)
+        states.append(game_state_dict(game))
+    game.evaluate_winner(players)
+    states.append(game_state_dict(game))
+    return game, states
+
+def comparable(state):
+    # Versions count changes since the game object was created, not since the hand started
+    return {key: value for key, value in state.items() if key != "version"}
+
+class TestHandReplay:
+    """Test cases for rebuilding hands from their event logs"""
+
+    def test_every_step_matches_the_live_game(self):
+        """Test that replaying to each step gives the state the live game had after that event"""
+        for seed in range(30):
+            game, states = play_hand(seed)
+            replay = HandReplay(game.events, snapshot_interval=3)
+
+            assert replay.steps == len(states) - 1
+            for step in range(1, replay.steps + 1):
+                assert comparable(game_state_dict(replay.state_at(step))) == comparable(states[step])
+            assert replay.state_at(replay.steps).events == game.events
+
+    def test_snapshots_bound_the_events_applied(self):
+        """Test that a late step is rebuilt from the nearest snapshot"""
+        game, _ = play_hand(5)
+        replay = HandReplay(game.events, snapshot_interval=2)
+        replay.state_at(replay.steps)
+
+        assert sorted(replay._snapshots) == list(range(0, replay.steps + 1, 2))
+        assert len(replay.state_at(replay.steps - 1).events) == replay.steps - 1
+
+    def test_showdown_replays_recorded_payouts(self):
+        """Test that a preflop showdown, decided at random, replays to the same stacks"""
+        game = PokerGame(deck_provider=SeededDeckProvider(1))
+        players = [Player("Alice", 1000, []), Player("Bob", 1000, [])]
+        game.start_new_hand(players)
+        for _ in range(2):
+            game.make_action(players, game.current_player_index, "all_in")
+        game.evaluate_winner(players)
+
+        replayed = HandReplay(game.events).state_at(len(game.events))
+        assert [p.stack for p in replayed.players] == [p.stack for p in players]
+
+    def test_public_event_hides_the_deck(self):
+        """Test that the undealt deck order never leaves the server"""
+        game, _ = play_hand(2)
+
+        assert "deck" in game.events[0]
+        assert "deck" not in public_event(game.events[0])
+
+class TestHandReplayAPI:
+    """Test cases for the replay endpoint"""
+
+    def test_replay_completed_hand(self):
+        """Test stepping through a hand completed on a table"""
+        players = [{"name": "Alice", "stack": 1000}, {"name": "Bob", "stack": 1000}]
+        hand_id = client.post("/api/tables/replay/start-hand", json=players).json()["hand_id"]
+        for street in ("flop", "turn", "river"):
+            client.post(f"/api/tables/replay/deal-{street}")
+        final_state = client.post("/api/tables/replay/complete-hand").json()["final_game_state"]
+
+        replay = client.get(f"/api/hands/{hand_id}/replay").json()
+        assert replay["steps"] == 5
+        assert replay["event"]["type"] == "showdown"
+        assert replay["state"]["players"] == final_state["players"]
+
+        flop = client.get(f"/api/hands/{hand_id}/replay?step=2").json()
+        assert flop["event"] == {"type": "deal", "street": "flop", "cards": flop["state"]["community_cards"]}
+        assert client.get(f"/api/hands/{hand_id}/replay?step=0").json()["state"]["players"] == []
+        assert client.get(f"/api/hands/{hand_id}/replay?step=6").status_code == 400
+        assert client.get("/api/hands/missing/replay").status_code == 404
@@ -0,0 +1,188 @@
+import asyncio
+import csv
+import io
+import json
+
+from deck_provider import SeededDeckProvider
+from game_logic import PokerGame
+from hand_import import CopyStream, hand_rows, iter_ndjson
+from hand_replay import HandReplay
+from hand_writer import HandWriter
+from models import Hand, Player
+from routers.game_router import create_hand_from_game_state
+
+def make_hand(number: int) -> Hand:
+    return Hand(
+        hand_id=f"hand-{number}",
+        players=[],
+        community_cards=[],
+        pot_amount=60,
+        winner={"winner": "Alice"},
+        actions=[],
+    )
+
+class RecordingRepository:
+    """Collects the batches it is asked to save"""
+
+    def __init__(self, delay: float = 0, succeed: bool = True, failures: int = 0):
+        self.delay = delay
+        self.succeed = succeed
+        self.failures = failures  # Saves that fail before the repository recovers
+        self.batches = []
+
+    async def save_hands(self, hands):
+        await asyncio.sleep(self.delay)
+        self.batches.append([hand.hand_id for hand in hands])
+        if self.failures:
+            self.failures -= 1
+            return False
+        return self.succeed
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+class TestHandWriter:
+    """Test cases for the write-behind hand queue"""
+
+    def test_flushes_full_batches(self):
+        """Test that queued hands are written in batches of batch_size"""
+        async def scenario():
+            repository = RecordingRepository()
+            writer = HandWriter(repository, batch_size=4, flush_interval=10)
+            writer.start()
+            for number in range(8):
+                await writer.submit(make_hand(number))
+            await asyncio.sleep(0.01)
+            batches = list(repository.batches)
+            await writer.stop()
+            return batches, writer.stats()
+
+        batches, stats = run(scenario())
+
+        assert [len(batch) for batch in batches] == [4, 4]
+        assert stats["written"] == 8
+        assert stats["batches"] == 2
+
+    def test_flushes_partial_batch_after_interval(self):
+        """Test that a partial batch is written once the flush interval passes"""
+        async def scenario():
+            repository = RecordingRepository()
+            writer = HandWriter(repository, batch_size=100, flush_interval=0.02)
+            writer.start()
+            await writer.submit(make_hand(1))
+            await asyncio.sleep(0.1)
+            batches = list(repository.batches)
+            await writer.stop()
+            return batches
+
+        assert run(scenario()) == [["hand-1"]]
+
+    def test_stop_drains_queue(self):
+        """Test that stopping writes every hand still queued"""
+        async def scenario():
+            repository = RecordingRepository()
+            writer = HandWriter(repository, batch_size=3, flush_interval=10)
+            writer.start()
+            for number in range(7):
+                await writer.submit(make_hand(number))
+            await writer.stop()
+            return repository.batches
+
+        batches = run(scenario())
+
+        assert sorted(hand_id for batch in batches for hand_id in batch) == sorted(f"hand-{n}" for n in range(7))
+
+    def test_backpressure_when_queue_full(self):
+        """Test that submit waits for room instead of growing the queue"""
+        async def scenario():
+            repository = RecordingRepository(delay=0.05)
+            writer = HandWriter(repository, batch_size=1, flush_interval=0, max_queue=2)
+            writer.start()
+            for number in range(6):
+                await writer.submit(make_hand(number))
+                assert writer.stats()["queued"] <= 2
+            await writer.stop()
+            return writer.stats()
+
+        stats = run(scenario())
+
+        assert stats["backpressure_waits"] > 0
+        assert stats["written"] == 6
+
+    def test_writes_through_when_not_running(self):
+        """Test that hands are saved directly when the writer was never started"""
+        async def scenario():
+            repository = RecordingRepository(succeed=False)
+            writer = HandWriter(repository)
+            await writer.submit(make_hand(1))
+            return repository.batches, writer.stats()
+
+        batches, stats = run(scenario())
+
+        assert batches == [["hand-1"]]
+        assert stats["failed"] == 1
+
+    def test_retries_failed_batch(self):
+        """Test that a batch that fails to save is retried until it succeeds"""
+        async def scenario():
+            repository = RecordingRepository(failures=2)
+            writer = HandWriter(repository, flush_interval=0, retries=3, retry_delay=0.001)
+            writer.start()
+            await writer.submit(make_hand(1))
+            await writer.stop()
+            return repository.batches, writer.stats()
+
+        batches, stats = run(scenario())
+
+        assert batches == [["hand-1"]] * 3
+        assert stats["retried"] == 2
+        assert stats["written"] == 1 and stats["failed"] == 0
+
+    def test_dead_letters_batch_after_retries(self, tmp_path):
+        """Test that a batch still failing after its retries is kept in a replayable file"""
+        dead_letter = tmp_path / "unsaved.ndjson"
+
+        async def scenario():
+            repository = RecordingRepository(succeed=False)
+            writer = HandWriter(repository, batch_size=2, flush_interval=10, retries=2, retry_delay=0.001,
+                                dead_letter=str(dead_letter))
+            writer.start()
+            for number in range(2):
+                await writer.submit(make_hand(number))
+            await writer.stop()
+            return repository.batches, writer.stats()
+
+        batches, stats = run(scenario())
+
+        assert len(batches) == 3
+        assert stats["failed"] == 2 and stats["dead_lettered"] == 2
+        with open(dead_letter) as f:
+            records = list(iter_ndjson(f))
+        assert [record["hand_id"] for record in records] == ["hand-0", "hand-1"]
+        assert records[0]["pot_amount"] == 60
+
+    def test_dead_letter_keeps_event_log_through_import(self, tmp_path):
+        """Test that a dead-lettered hand imports with the event log its replay needs"""
+        game = PokerGame(deck_provider=SeededDeckProvider(3))
+        game.start_new_hand([Player("Alice", 1000, []), Player("Bob", 1000, [])])
+        game.make_action(game.players, game.current_player_index, "call")
+        game.make_action(game.players, game.current_player_index, "check")
+        game.deal_flop(game.players)
+        hand = create_hand_from_game_state(game, game.evaluate_winner(game.players))
+        dead_letter = tmp_path / "unsaved.ndjson"
+
+        async def scenario():
+            writer = HandWriter(RecordingRepository(succeed=False), retries=0, dead_letter=str(dead_letter))
+            await writer.submit(hand)
+
+        run(scenario())
+        with open(dead_letter) as f:
+            records = list(iter_ndjson(f))
+        # The row the import COPYs into the hands table
+        row = next(csv.reader(io.StringIO(CopyStream(hand_rows(records)).read())))
+        events = json.loads(row[6])
+
+        assert events == json.loads(json.dumps(hand.events))
+        replayed = HandReplay(events)
+        assert replayed.steps == len(hand.events)
+        assert replayed.state_at(replayed.steps).events == hand.events
@@ -0,0 +1,143 @@
+import random
+
+from deck_provider import SeededDeckProvider
+from game_logic import PokerGame
+from hand_evaluator import parse_cards
+from models import Player
+from pots import resolve_pots, total_payouts
+
+def reference_payouts(contributions, live, strengths, first_seat, dead=0):
+    """Pot by pot, from the smallest contribution up, ranking the eligible hands again for each pot"""
+    seats = len(contributions)
+    payouts = [0] * seats
+    levels = sorted(set(c for c in contributions if c > 0))
+    previous = 0
+    carry = dead
+    layers = []
+    for level in levels:
+        amount = sum(min(c, level) - min(c, previous) for c in contributions)
+        eligible = [s for s in range(seats) if live[s] and contributions[s] >= level]
+        if layers and layers[-1][1] == eligible:
+            # Same players contest it: one pot, not two
+            amount += layers.pop()[0]
+        layers.append((amount, eligible))
+        previous = level
+    # Chips above every live seat's contribution go to the highest live layer
+    while layers and not layers[-1][1]:
+        amount, _ = layers.pop()
+        layers[-1] = (layers[-1][0] + amount, layers[-1][1])
+    if not layers:
+        layers = [(0, [s for s in range(seats) if live[s]])]
+    for index, (amount, eligible) in enumerate(layers):
+        if index == 0:
+            amount += carry
+        best = max(strengths[s] for s in eligible)
+        winners = sorted((s for s in eligible if strengths[s] == best), key=lambda s: (s - first_seat) % seats)
+        share, odd = divmod(amount, len(winners))
+        for position, seat in enumerate(winners):
+            payouts[seat] += share + (1 if position < odd else 0)
+    return payouts
+
+def random_scenario(rng):
+    seats = rng.randint(2, 9)
+    contributions = [rng.choice([0, rng.randint(1, 50), rng.randint(1, 5000)]) for _ in range(seats)]
+    live = [rng.random() < 0.7 for _ in range(seats)]
+    if not any(live[s] and contributions[s] for s in range(seats)):
+        live[0], contributions[0] = True, max(contributions[0], 1)
+    # Folded seats never put in more than the largest live contribution
+    cap = max(c for c, alive in zip(contributions, live) if alive)
+    contributions = [c if alive else min(c, cap) for c, alive in zip(contributions, live)]
+    strengths = [rng.randint(0, 4) if alive else None for alive in live]
+    return contributions, live, strengths, rng.randrange(seats)
+
+class TestResolvePots:
+    """Property tests for side pot resolution over random scenarios"""
+
+    def test_properties(self):
+        """Test chip conservation, eligibility and agreement with a per-pot reference"""
+        rng = random.Random(11)
+        for _ in range(3000):
+            contributions, live, strengths, first_seat = random_scenario(rng)
+            dead = rng.choice([0, 0, rng.randint(1, 99)])
+
+            pots = resolve_pots(contributions, live, strengths, first_seat, dead)
+            payouts = total_payouts(pots)
+
+            assert sum(payouts.values()) == sum(contributions) + dead
+            assert sum(pot.amount for pot in pots) == sum(contributions) + dead
+            assert all(live[seat] for seat in payouts)
+            for seat, amount in payouts.items():
+                assert amount <= sum(min(c, contributions[seat]) for c in contributions) + dead
+            expected = reference_payouts(contributions, live, strengths, first_seat, dead)
+            assert [payouts.get(seat, 0) for seat in range(len(contributions))] == expected
+
+    def test_short_stack_wins_main_pot_only(self):
+        """Test that an all-in player can only win what everyone matched of their stack"""
+        pots = resolve_pots([100, 300, 300], [True, True, True], [9, 5, 1])
+
+        assert [pot.amount for pot in pots] == [300, 400]
+        assert total_payouts(pots) == {0: 300, 1: 400}
+
+    def test_odd_chip_goes_left_of_button(self):
+        """Test that the odd chip of a split goes to the first winner after the button"""
+        pots = resolve_pots([50, 21, 50], [True, False, True], [7, None, 7], first_seat=2)
+
+        assert pots[0].winners == [2, 0]
+        assert total_payouts(pots) == {2: 61, 0: 60}
+
+class TestSidePotShowdown:
+    """Test side pots awarded by evaluate_winner"""
+
+    def test_three_way_all_in(self):
+        """Test that each pot goes to the best hand among the players in it"""
+        game = PokerGame(deck_provider=SeededDeckProvider(1))
+        players = [Player("Alice", 100, []), Player("Bob", 300, []), Player("Carol", 1000, [])]
+        game.start_new_hand(players)
+        for _ in range(3):
+            game.make_action(players, game.current_player_index, "all_in")
+        game.community_cards = parse_cards("2h7d9cJsQh")
+        players[0].cards = parse_cards("AhAd")
+        players[1].cards = parse_cards("KdKc")
+        players[2].cards = parse_cards("3c4d")
+
+        result = game.evaluate_winner(players)
+
+        assert result["payouts"] == {"Alice": 300, "Bob": 400, "Carol": 700}
+        assert [pot["winners"] for pot in result["pots"]] == [["Alice"], ["Bob"], ["Carol"]]
+        assert result["hand_rank"] == "One pair"
+        assert sum(p.stack for p in players) == 1400
+
+    def test_uncalled_excess_is_not_a_win(self):
+        """Test that chips handed back uncalled leave their owner out of the winners"""
+        game = PokerGame(deck_provider=SeededDeckProvider(1))
+        players = [Player("Alice", 100, []), Player("Bob", 300, []), Player("Carol", 1000, [])]
+        game.start_new_hand(players)
+        for _ in range(3):
+            game.make_action(players, game.current_player_index, "all_in")
+        game.community_cards = parse_cards("2h7d9cJsQh")
+        players[0].cards = parse_cards("3c4d")
+        players[1].cards = parse_cards("AhAd")
+        players[2].cards = parse_cards("KdKc")
+
+        result = game.evaluate_winner(players)
+
+        # Bob wins both pots; Carol only gets her uncalled 700 back
+        assert result["winner"] == "Bob"
+        assert result["amount"] == 700
+        assert result["payouts"] == {"Bob": 700, "Carol": 700}
+        assert result["reason"] == "Best hand: One pair"
+
+        game = PokerGame(deck_provider=SeededDeckProvider(1))
+        players = [Player("Alice", 100, []), Player("Bob", 300, []), Player("Carol", 1000, [])]
+        game.start_new_hand(players)
+        for _ in range(3):
+            game.make_action(players, game.current_player_index, "all_in")
+        game.community_cards = parse_cards("2h7d9cJsQh")
+        players[0].cards = parse_cards("AhAd")
+        players[1].cards = parse_cards("KdKc")
+        players[2].cards = parse_cards("3c4d")
+
+        result = game.evaluate_winner(players)
+
+        assert result["winners"] == ["Alice", "Bob"]
+        assert result["payouts"]["Carol"] == 700
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+import preflop_tables
+from preflop_tables import (
+    NUM_CLASSES, PreflopTables, class_from_name, class_index, class_name, write_tables,
+)
+from hand_evaluator import parse_cards
+from game_logic import PokerGame
+from models import Player
+
+class TestHandClasses:
+    """Test cases for the 169 starting-hand classes"""
+
+    def test_all_classes_round_trip(self):
+        """Test that every class name maps back to its index"""
+        names = {class_name(index) for index in range(NUM_CLASSES)}
+        assert len(names) == NUM_CLASSES
+        for index in range(NUM_CLASSES):
+            assert class_from_name(class_name(index)) == index
+
+    def test_class_of_hole_cards(self):
+        """Test classifying specific hole cards"""
+        assert class_name(class_index(parse_cards("AhAd"))) == "AA"
+        assert class_name(class_index(parse_cards("KhAh"))) == "AKs"
+        assert class_name(class_index(parse_cards("9c8d"))) == "98o"
+
+    def test_invalid_class_name(self):
+        """Test rejecting malformed names"""
+        for name in ("AAs", "AK", "X9o", "A"):
+            with pytest.raises(ValueError):
+                class_from_name(name)
+
+class TestPreflopTables:
+    """Test cases for the memory-mapped table file"""
+
+    def test_write_and_map(self, tmp_path):
+        """Test that written tables are read back through the memory map"""
+        heads_up = np.full((NUM_CLASSES, NUM_CLASSES), 0.5)
+        heads_up[0, 14] = 0.82
+        heads_up[14, 0] = 0.18
+        multiway = np.tile(np.linspace(0.5, 0.1, 5), (NUM_CLASSES, 1))
+        path = str(tmp_path / "preflop.bin")
+
+        write_tables(path, heads_up, multiway, 1000)
+        tables = PreflopTables(path)
+
+        assert tables.rollouts == 1000
+        assert tables.versus(class_from_name("AA"), class_from_name("KK")) == pytest.approx(0.82, abs=1e-4)
+        assert tables.against_field(class_from_name("AA"), 6) == pytest.approx(0.1, abs=1e-4)
+        assert tables.showdown_equities([parse_cards("AhAd"), parse_cards("KsKc")]) == pytest.approx([0.82, 0.18], abs=1e-4)
+        tables.close()
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Test that a file without the table header is rejected"""
+        path = tmp_path / "bogus.bin"
+        path.write_bytes(b"not a table" * 10)
+        with pytest.raises(ValueError):
+            PreflopTables(str(path))
+
+    def test_shipped_tables(self):
+        """Test the generated tables against well-known preflop equities"""
+        tables = preflop_tables.get_preflop_tables()
+        if tables is None:
+            pytest.skip("preflop table file has not been built")
+
+        assert tables.versus(class_from_name("AA"), class_from_name("KK")) == pytest.approx(0.82, abs=0.02)
+        assert tables.versus(class_from_name("AKs"), class_from_name("QQ")) == pytest.approx(0.46, abs=0.02)
+        assert tables.against_field(class_from_name("72o"), 2) == pytest.approx(0.35, abs=0.02)
+
+class TestPreflopShowdown:
+    """Test cases for preflop showdowns in evaluate_winner"""
+
+    def test_winner_drawn_by_equity(self):
+        """Test that a preflop showdown reports the equities it used"""
+        if preflop_tables.get_preflop_tables() is None:
+            pytest.skip("preflop table file has not been built")
+        game = PokerGame()
+        game.pot = 100
+        players = [
+            Player("Alice", 950, parse_cards("AhAd")),
+            Player("Bob", 950, parse_cards("7c2d")),
+        ]
+
+        result = game.evaluate_winner(players)
+
+        assert result["winner"] in ("Alice", "Bob")
+        assert result["preflop_equities"]["Alice"] > 0.8
+        assert players[0].stack + players[1].stack == 2000
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import orjson
+
+from deck_provider import SeededDeckProvider
+from game_logic import PokerGame
+from hand_cache import HandCache
+from models import Action, Hand, HandHistory, Player
+from routers.game_router import GameStateResponse, get_game_state_response
+from serialization import dumps, hand_dict, hand_row
+
+class TestSerialization:
+    """Test cases for the shared model serializer"""
+
+    def test_models_are_slotted(self):
+        """Test that the models carry no per-instance __dict__"""
+        assert not hasattr(Player("Alice", 1000, []), "__dict__")
+        assert not hasattr(Action("Alice", "fold"), "__dict__")
+
+    def test_hand_layout(self):
+        """Test the JSON layout of a hand history record"""
+        hand = HandHistory(
+            "hand-1", [Player("Alice", 1000, ["Ah", "Kd"])], ["2h", "7d", "9c"], 60,
+            {"winner": "Alice"}, datetime(2024, 1, 1, 12, 30), id=1, actions=[Action("Alice", "bet", 40, "flop")]
+        )
+
+        data = orjson.loads(dumps(hand_dict(hand)))
+
+        assert data["created_at"] == "2024-01-01T12:30:00"
+        assert data["players"][0] == {
+            "name": "Alice", "stack": 1000, "cards": ["Ah", "Kd"],
+            "is_active": True, "is_all_in": False, "current_bet": 0
+        }
+        assert data["actions"] == [{"player_name": "Alice", "action_type": "bet", "amount": 40, "street": "flop"}]
+        assert orjson.loads(hand_row(hand)[1]) == data["players"]
+
+    def test_hand_row_keeps_created_at(self):
+        """Test that a saved hand's row carries the timestamp its cached copy is served with"""
+        hand = Hand("hand-2", [Player("Alice", 1000, [])], [], 60, winner={"winner": "Alice"})
+        cache = HandCache()
+        cache.add_completed(hand)
+
+        assert hand_row(hand)[-1] == cache.get_hand("hand-2").created_at == hand.created_at
+
+    def test_game_state_matches_response_model(self):
+        """Test that the game state dict validates against GameStateResponse"""
+        game = PokerGame(deck_provider=SeededDeckProvider(5))
+        game.start_new_hand([Player("Alice", 1000, []), Player("Bob", 1000, [])])
+        game.deal_flop(game.players)
+
+        state = get_game_state_response(game)
+
+        assert GameStateResponse(**state).model_dump() == state
+        assert all(isinstance(card, str) for card in state["community_cards"] + state["players"][0]["cards"])
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from deck_provider import SeededDeckProvider
+from game_logic import PokerGame
+from models import Player
+from simulator import POLICIES, SimulationResult, load_policy, play_hand, simulate
+
+class LeakyGame(PokerGame):
+    """A game whose showdown pays out one chip too many"""
+
+    def evaluate_winner(self, players):
+        result = super().evaluate_winner(players)
+        players[0].stack += 1
+        return result
+
+class TestSimulator:
+    """Test cases for the headless hand simulator"""
+
+    def test_policies_play_clean_hands(self):
+        """Test that every built-in policy, with fuzzing, plays hands without breaking an invariant"""
+        # Deep stacks leave room for long betting rounds, where streets used to get stuck
+        result = simulate(1000, players=6, policies=list(POLICIES), seed=0, fuzz=0.3)
+
+        assert result.hands == 1000
+        assert result.fuzzed > 0
+        assert result.violation_count == 0, result.violations
+        assert result.calls["showdown"] == 1000
+        assert result.calls["action"] == result.actions
+
+    def test_shards_cover_every_hand(self):
+        """Test that hands split across processes add up"""
+        result = simulate(101, players=3, processes=2)
+
+        assert result.hands == 101
+        assert result.violation_count == 0
+
+    def test_reports_broken_conservation(self):
+        """Test that a hand creating chips is reported"""
+        game = LeakyGame(deck_provider=SeededDeckProvider(1))
+        players = [Player("Alice", 1000, []), Player("Bob", 1000, [])]
+
+        problems = play_hand(game, players, [POLICIES["calling_station"]], random.Random(1), SimulationResult())
+
+        assert problems == ["chips not conserved: 2000 before the hand, 2001 after"]
+
+    def test_load_policy(self):
+        """Test loading policies by name and as module:function"""
+        assert load_policy("aggressive") is POLICIES["aggressive"]
+        assert load_policy("simulator:random_policy") is POLICIES["random"]
+        with pytest.raises(ValueError):
+            load_policy("unknown")
@@ -0,0 +1,138 @@
+import asyncio
+import json
+
+from table_events import TableChannel, diff_state
+import table_events
+
+def make_state(**overrides):
+    state = {
+        "players": [
+            {"name": "Alice", "stack": 1000, "current_bet": 0, "is_active": True},
+            {"name": "Bob", "stack": 1000, "current_bet": 0, "is_active": True},
+        ],
+        "community_cards": [],
+        "pot_amount": 0,
+        "current_street": "preflop",
+        "current_player_index": 0,
+        "actions": [],
+    }
+    state.update(overrides)
+    return state
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+class TestDiffState:
+    """Test cases for computing state deltas"""
+
+    def test_changed_fields_only(self):
+        """Test that a delta carries only what changed"""
+        before = make_state()
+        after = make_state(
+            players=[
+                {"name": "Alice", "stack": 980, "current_bet": 20, "is_active": True},
+                before["players"][1],
+            ],
+            pot_amount=20,
+            current_player_index=1,
+            actions=[{"player": "Alice", "action": "bet", "amount": 20}],
+        )
+
+        delta = diff_state(before, after)
+
+        assert delta == {
+            "players": {"0": {"stack": 980, "current_bet": 20}},
+            "actions": [{"player": "Alice", "action": "bet", "amount": 20}],
+            "state": {"pot_amount": 20, "current_player_index": 1},
+        }
+
+    def test_new_board_cards(self):
+        """Test that only newly dealt cards are sent"""
+        before = make_state(community_cards=["Ah", "Kd", "2c"])
+        after = make_state(community_cards=["Ah", "Kd", "2c", "9s"], current_street="turn")
+
+        delta = diff_state(before, after)
+
+        assert delta["community_cards"] == ["9s"]
+        assert delta["state"] == {"current_street": "turn"}
+
+    def test_new_hand_needs_snapshot(self):
+        """Test that a reset board or reseating cannot be expressed as a delta"""
+        before = make_state(community_cards=["Ah", "Kd", "2c"], actions=[{"action": "call"}])
+        assert diff_state(before, make_state()) is None
+        reseated = make_state(players=[{"name": "Carol", "stack": 1000}])
+        assert diff_state(make_state(), reseated) is None
+
+class TestTableChannel:
+    """Test cases for fanning state changes out to subscribers"""
+
+    def test_snapshot_then_deltas(self):
+        """Test that subscribers get a snapshot followed by versioned deltas"""
+        async def scenario():
+            channel = TableChannel()
+            subscriber = channel.subscribe(make_state())
+            channel.publish(make_state(pot_amount=30))
+            return [json.loads((await subscriber.get())[1]) for _ in range(2)]
+
+        snapshot, delta = run(scenario())
+
+        assert snapshot["type"] == "snapshot"
+        assert delta == {
+            "type": "delta",
+            "version": snapshot["version"] + 1,
+            "base_version": snapshot["version"],
+            "state": {"pot_amount": 30},
+        }
+
+    def test_payload_serialized_once(self):
+        """Test that every subscriber receives the same payload object"""
+        async def scenario():
+            channel = TableChannel()
+            subscribers = [channel.subscribe(make_state()) for _ in range(3)]
+            channel.publish(make_state(pot_amount=30))
+            for subscriber in subscribers:
+                await subscriber.get()
+            return [await subscriber.get() for subscriber in subscribers]
+
+        events = run(scenario())
+
+        assert all(event is events[0] for event in events)
+
+    def test_unchanged_state_is_not_published(self):
+        """Test that republishing the same state does not bump the version"""
+        async def scenario():
+            channel = TableChannel()
+            channel.subscribe(make_state())
+            version = channel.version
+            return version, channel.publish(make_state())
+
+        version, republished = run(scenario())
+        assert republished == version
+
+    def test_slow_subscriber_resyncs(self, monkeypatch):
+        """Test that a full queue is replaced by a fresh snapshot"""
+        monkeypatch.setattr(table_events, "SUBSCRIBER_QUEUE_SIZE", 2)
+
+        async def scenario():
+            channel = TableChannel()
+            subscriber = channel.subscribe(make_state())
+            for pot in range(1, 5):
+                channel.publish(make_state(pot_amount=pot))
+            return channel.version, json.loads((await subscriber.get())[1])
+
+        version, message = run(scenario())
+
+        assert message["type"] == "snapshot"
+        assert message["version"] == version
+        assert message["state"]["pot_amount"] == 4
+
+    def test_close_ends_subscriptions(self):
+        """Test that closing the channel wakes subscribers with None"""
+        async def scenario():
+            channel = TableChannel()
+            subscriber = channel.subscribe(make_state())
+            await subscriber.get()
+            channel.close()
+            return await subscriber.get(), channel.subscriber_count
+
+        assert run(scenario()) == (None, 0)
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import random
+
+from deck_provider import SeededDeckProvider
+from models import Player
+from serialization import game_state_dict
+from table_registry import TableRegistry
+from table_wal import TableWAL, encode_record, decode_record
+
+def play(table, rng, moves):
+    """Start a hand if needed, then make up to ``moves`` random legal actions and deals"""
+    game = table.game
+    if not game.players or game.events[-1]["type"] == "showdown":
+        game.start_new_hand([Player(f"Player{i}", rng.choice([500, 2000]), []) for i in range(rng.randint(2, 6))])
+    for _ in range(moves):
+        if game.events[-1]["type"] == "showdown":
+            break
+        if game.is_hand_complete(game.players) or game.ledger.active_count < 2:
+            if game.current_street == "river" or game.ledger.active_count < 2:
+                game.evaluate_winner(game.players)
+            else:
+                getattr(game, {"preflop": "deal_flop", "flop": "deal_turn", "turn": "deal_river"}[game.current_street])(game.players)
+            continue
+        legal = game.legal_actions(game.players, game.current_player_index)
+        if not legal:
+            break
+        action_type = rng.choice(sorted(legal))
+        options = legal[action_type]
+        amount = rng.randint(options["min"], options["max"]) if "min" in options else 0
+        game.make_action(game.players, game.current_player_index, action_type, amount)
+
+def open_registry(directory, **options):
+    registry = TableRegistry()
+    wal = TableWAL(directory, **options)
+    recovered = wal.recover(registry)
+    return registry, wal, recovered
+
+def states(registry):
+    # Versions restart with each game object, so they are left out
+    return {
+        table_id: {k: v for k, v in game_state_dict(registry.get(table_id).game).items() if k != "version"}
+        for table_id in registry.table_ids()
+    }
+
+def run_tables(registry, wal, rng, rounds, tables=20):
+    for _ in range(rounds):
+        table = registry.get_or_create(f"table-{rng.randrange(tables)}")
+        table.game.deck_provider = SeededDeckProvider(rng.randrange(1000))
+        play(table, rng, rng.randint(1, 4))
+        wal.log_events(table.table_id, table.game)
+
+class TestRecords:
+    """Test cases for the log record format"""
+
+    def test_round_trip_and_torn_records(self):
+        """Test that records survive encoding and that damaged lines are rejected"""
+        line = encode_record({"op": "open", "table": "t1"})
+
+        assert decode_record(line) == {"op": "open", "table": "t1"}
+        assert decode_record(line[:-3]) is None
+        assert decode_record(line.replace(b"t1", b"t2")) is None
+
+class TestTableWAL:
+    """Test cases for recovering live tables from the write-ahead log"""
+
+    def test_recovers_tables_mid_hand(self, tmp_path):
+        """Test that a restart restores every open table exactly, hands in progress included"""
+        registry, wal, _ = open_registry(tmp_path, fsync_interval=0.001)
+        rng = random.Random(1)
+        run_tables(registry, wal, rng, 300)
+        registry.remove("table-3")
+        before = states(registry)
+        wal.close()
+
+        recovered_registry, recovered_wal, recovered = open_registry(tmp_path, fsync_interval=0)
+        assert recovered == len(before)
+        assert "table-3" not in recovered_registry.table_ids()
+        assert states(recovered_registry) == before
+
+        # Recovered tables keep logging from where they were
+        run_tables(recovered_registry, recovered_wal, rng, 100)
+        after = states(recovered_registry)
+        recovered_wal.close()
+        assert states(open_registry(tmp_path)[0]) == after
+
+    def test_torn_tail_is_ignored(self, tmp_path):
+        """Test that a record cut off by a crash is dropped along with nothing before it"""
+        registry, wal, _ = open_registry(tmp_path, fsync_interval=0)
+        registry.create("kept")
+        wal.sync()
+        with open(wal._segments[-1], "ab") as segment:
+            segment.write(encode_record({"op": "open", "table": "torn"})[:-5])
+        wal.close()
+
+        recovered_registry, recovered_wal, _ = open_registry(tmp_path)
+        assert recovered_registry.table_ids() == ["kept"]
+        assert recovered_wal.torn_records == 1
+
+    def test_rotation_and_compaction(self, tmp_path):
+        """Test that small segments rotate, compaction bounds the log, and recovery still matches"""
+        registry, wal, _ = open_registry(tmp_path, fsync_interval=0, segment_bytes=4096, compact_segments=3)
+        run_tables(registry, wal, random.Random(2), 500, tables=5)
+        before = states(registry)
+        stats = wal.stats()
+        wal.close()
+
+        assert stats["rotations"] > 0 and stats["compactions"] > 1
+        assert len([name for name in os.listdir(tmp_path) if name.endswith(".wal")]) <= 3
+        assert states(open_registry(tmp_path)[0]) == before
+
+    def test_group_commit(self, tmp_path):
+        """Test that appends made within one fsync window share an fsync"""
+        registry, wal, _ = open_registry(tmp_path, fsync_interval=0.05)
+        for i in range(200):
+            registry.create(f"table-{i}")
+        wal.close()
+
+        assert wal.records == 200
+        assert wal.fsyncs < 20
+        assert len(open_registry(tmp_path)[0]) == 200
+
+    def test_synced_waits_for_the_fsync(self, tmp_path):
+        """Test that synced() returns only once everything appended before it is on disk"""
+        registry, wal, _ = open_registry(tmp_path, fsync_interval=0.05)
+
+        async def scenario():
+            registry.create("table-1")
+            assert wal.fsyncs == 0
+            await wal.synced()
+            return wal.fsyncs
+
+        assert asyncio.run(scenario()) == 1
+        wal.close()
+
+    def test_one_process_per_directory(self, tmp_path):
+        """Test that a second log on a directory in use neither recovers nor logs"""
+        registry, wal, _ = open_registry(tmp_path)
+        registry.create("kept")
+
+        other_registry, other_wal, recovered = open_registry(tmp_path)
+        assert recovered == 0
+        assert not other_wal.is_open and other_registry.wal is None
+        other_registry.create("lost")
+        other_wal.close()
+
+        wal.close()
+        assert open_registry(tmp_path)[0].table_ids() == ["kept"]
@@ -9,7 +9,7 @@ import PokerTable from '@/components/PokerTable';
 import ActionControls from '@/components/ActionControls';
 import ActionLog from '@/components/ActionLog';
 import HandHistoryComponent from '@/components/HandHistory';
-import { GameState, HandHistory, PlayerRequest } from '@/types/poker';
+import { EquityMethod, GameState, HandHistory, PlayerRequest } from '@/types/poker';
 import * as api from '@/lib/api';
 
 export default function Home() {
@@ -17,6 +17,8 @@ export default function Home() {
   const [handHistory, setHandHistory] = useState<HandHistory[]>([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [equities, setEquities] = useState<{ [playerName: string]: number }>({});
+  const [equityMethod, setEquityMethod] = useState<EquityMethod | null>(null);
   const [playerStacks, setPlayerStacks] = useState<{ [key: string]: number }>({
     'Alice': 1000,
     'Bob': 1000,
@@ -31,6 +33,23 @@ export default function Home() {
     loadHandHistory();
   }, []);
 
+  // Refresh live equity whenever the board or the players in the pot change
+  const activePlayers = gameState?.players.filter(p => p.is_active).map(p => p.name).join(',');
+  const board = gameState?.community_cards.join('');
+  useEffect(() => {
+    if (!gameState) return;
+    api.getEquity()
+      .then(result => {
+        setEquities(Object.fromEntries(result.players.map(p => [p.name, p.equity])));
+        setEquityMethod(result.method);
+      })
+      .catch(err => {
+        console.error('Failed to load equity:', err);
+        setEquities({});
+        setEquityMethod(null);
+      });
+  }, [activePlayers, board]);
+
   const loadHandHistory = async () => {
     try {
       const response = await api.getHandHistory();
@@ -235,6 +254,8 @@ export default function Home() {
             <PokerTable
               gameState={gameState}
               onPlayerAction={makeAction}
+              equities={equities}
+              equityMethod={equityMethod}
             />
           </div>
 
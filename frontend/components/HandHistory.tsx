@@ -1,8 +1,11 @@
 'use client';
 
-import React from 'react';
+import React, { useState } from 'react';
+import { Button } from '@/components/ui/button';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { ScrollArea } from '@/components/ui/scroll-area';
+import { getHandReplay } from '@/lib/api';
+import { HandEvent, HandReplayStep } from '@/types/poker';
 
 interface HandHistoryProps {
   hands: Array<{
@@ -23,12 +26,51 @@ interface HandHistoryProps {
       amount: number;
       reason: string;
       hand_rank?: string;
+      payouts?: Record<string, number>;
     };
     created_at: string;
   }>;
 }
 
 const HandHistory: React.FC<HandHistoryProps> = ({ hands }) => {
+  // Replay step shown for each hand that has been opened
+  const [replays, setReplays] = useState<Record<string, HandReplayStep>>({});
+
+  const showReplayStep = async (handId: string, step?: number) => {
+    try {
+      const replay = await getHandReplay(handId, step);
+      setReplays(current => ({ ...current, [handId]: replay }));
+    } catch (error) {
+      console.error('Failed to load replay:', error);
+    }
+  };
+
+  const closeReplay = (handId: string) => {
+    setReplays(current => {
+      const { [handId]: _, ...rest } = current;
+      return rest;
+    });
+  };
+
+  const formatEvent = (event: HandEvent | null, replay: HandReplayStep): string => {
+    if (!event) return 'Before the deal';
+    switch (event.type) {
+      case 'start':
+        return `Dealt, blinds ${event.small_blind}/${event.big_blind}`;
+      case 'action': {
+        const name = replay.state.players[event.player_index]?.name || 'Unknown';
+        const amount = event.amount ? ` ${event.amount}` : '';
+        return `${name} ${event.action_type}${amount}`;
+      }
+      case 'deal':
+        return `${event.street}: ${formatCards(event.cards)}`;
+      case 'showdown':
+        return 'Showdown';
+      default:
+        return event.type;
+    }
+  };
+
   const formatActionSequence = (actions: any[]): string => {
     if (!actions || actions.length === 0) return '';
     
@@ -61,7 +103,10 @@ const HandHistory: React.FC<HandHistoryProps> = ({ hands }) => {
   };
 
   const formatWinnings = (winner: any, players: any[]): string => {
-    if (winner.winners) {
+    if (winner.payouts) {
+      // Main and side pots
+      return Object.entries(winner.payouts).map(([name, amount]) => `${name}:+${amount}`).join(' ');
+    } else if (winner.winners) {
       // Split pot
       return winner.winners.map(w => `${w}:+${winner.amount}`).join(' ');
     } else if (winner.winner) {
@@ -146,6 +191,45 @@ const HandHistory: React.FC<HandHistoryProps> = ({ hands }) => {
                     </div>
                   )}
                   
+                  {/* Step-by-step replay */}
+                  {replays[hand.hand_id] ? (
+                    <div className="text-xs border-t pt-2 space-y-1">
+                      <div className="flex items-center gap-2">
+                        <Button
+                          size="sm"
+                          variant="outline"
+                          disabled={replays[hand.hand_id].step === 0}
+                          onClick={() => showReplayStep(hand.hand_id, replays[hand.hand_id].step - 1)}
+                        >
+                          Prev
+                        </Button>
+                        <span>
+                          Step {replays[hand.hand_id].step}/{replays[hand.hand_id].steps}
+                        </span>
+                        <Button
+                          size="sm"
+                          variant="outline"
+                          disabled={replays[hand.hand_id].step === replays[hand.hand_id].steps}
+                          onClick={() => showReplayStep(hand.hand_id, replays[hand.hand_id].step + 1)}
+                        >
+                          Next
+                        </Button>
+                        <Button size="sm" variant="ghost" onClick={() => closeReplay(hand.hand_id)}>
+                          Close
+                        </Button>
+                      </div>
+                      <div>{formatEvent(replays[hand.hand_id].event, replays[hand.hand_id])}</div>
+                      <div>
+                        Board: {formatCards(replays[hand.hand_id].state.community_cards) || '-'} | Pot: ${replays[hand.hand_id].state.pot_amount}
+                      </div>
+                      <div>{formatStackSetting(replays[hand.hand_id].state.players)}</div>
+                    </div>
+                  ) : (
+                    <Button size="sm" variant="outline" onClick={() => showReplayStep(hand.hand_id, 0)}>
+                      Replay
+                    </Button>
+                  )}
+                  
                   {/* Timestamp */}
                   <div className="text-xs text-gray-500">
                     {new Date(hand.created_at).toLocaleString()}
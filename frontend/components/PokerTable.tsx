@@ -2,14 +2,16 @@
 
 import React from 'react';
 import { Card, CardContent } from '@/components/ui/card';
-import { Player, GameState } from '@/types/poker';
+import { Player, GameState, EquityMethod } from '@/types/poker';
 
 interface PokerTableProps {
   gameState: GameState;
   onPlayerAction: (playerIndex: number, actionType: string, amount?: number) => void;
+  equities?: { [playerName: string]: number };
+  equityMethod?: EquityMethod | null;
 }
 
-const PokerTable: React.FC<PokerTableProps> = ({ gameState, onPlayerAction }) => {
+const PokerTable: React.FC<PokerTableProps> = ({ gameState, onPlayerAction, equities, equityMethod }) => {
   const { players, community_cards, pot_amount, current_street, current_player_index } = gameState;
 
   const getPlayerPosition = (index: number) => {
@@ -90,6 +92,12 @@ const PokerTable: React.FC<PokerTableProps> = ({ gameState, onPlayerAction }) =>
                 {!player.is_active && (
                   <div className="text-xs text-gray-500">FOLDED</div>
                 )}
+                {player.is_active && equities?.[player.name] !== undefined && (
+                  <div className="text-xs text-green-700">
+                    Equity: {(equities[player.name] * 100).toFixed(1)}%
+                    {equityMethod === 'preflop_table' && <span title="Looked up by starting-hand class"> (preflop est.)</span>}
+                  </div>
+                )}
                 {player.cards.length > 0 && (
                   <div className="flex gap-1 justify-center mt-1">
                     {player.cards.map((card, cardIndex) => (
@@ -1,4 +1,4 @@
-import { PlayerRequest, ActionRequest, GameState, HandHistory } from '@/types/poker';
+import { PlayerRequest, ActionRequest, GameState, HandHistory, HandReplayStep, EquityResult } from '@/types/poker';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
@@ -105,8 +105,26 @@ export async function getCurrentState(): Promise<GameState> {
   return response.json();
 }
 
-export async function getHandHistory(limit: number = 10): Promise<{ hands: HandHistory[] }> {
-  const response = await fetch(`${API_BASE_URL}/api/hands?limit=${limit}`);
+export async function getEquity(): Promise<EquityResult> {
+  const response = await fetch(`${API_BASE_URL}/api/game/equity`);
+
+  if (!response.ok) {
+    throw new Error('Failed to get equity');
+  }
+
+  return response.json();
+}
+
+export async function getHandHistory(
+  limit: number = 10,
+  cursor?: string
+): Promise<{ hands: HandHistory[]; next_cursor: string | null }> {
+  // Actions come back with each hand, saving a request per hand
+  const params = new URLSearchParams({ limit: String(limit), include: 'actions' });
+  if (cursor) {
+    params.set('cursor', cursor);
+  }
+  const response = await fetch(`${API_BASE_URL}/api/hands?${params}`);
 
   if (!response.ok) {
     throw new Error('Failed to get hand history');
@@ -114,3 +132,15 @@ export async function getHandHistory(limit: number = 10): Promise<{ hands: HandH
 
   return response.json();
 }
+
+export async function getHandReplay(handId: string, step?: number): Promise<HandReplayStep> {
+  // Without a step the replay ends at the showdown
+  const params = step === undefined ? '' : `?step=${step}`;
+  const response = await fetch(`${API_BASE_URL}/api/hands/${handId}/replay${params}`);
+
+  if (!response.ok) {
+    throw new Error('Failed to get hand replay');
+  }
+
+  return response.json();
+}
@@ -26,6 +26,7 @@ export interface GameState {
   min_bet: number;
   last_raise_amount: number;
   actions: Action[];
+  version: number;
 }
 
 export interface HandHistory {
@@ -35,6 +36,43 @@ export interface HandHistory {
   pot_amount: number;
   winner: any;
   created_at: string;
+  actions?: Action[];
+}
+
+export interface HandEvent {
+  type: 'start' | 'action' | 'deal' | 'showdown';
+  [key: string]: any;
+}
+
+export interface HandReplayStep {
+  hand_id: string;
+  step: number;
+  steps: number;
+  event: HandEvent | null;
+  state: GameState;
+}
+
+// Preflop table lookups give equity only; win and tie shares are null
+export type EquityMethod = 'exact' | 'monte_carlo' | 'preflop_table';
+
+export interface PlayerEquity {
+  name: string;
+  cards: string[];
+  equity: number;
+  win: number | null;
+  tie: number | null;
+}
+
+export interface EquityResult {
+  players: PlayerEquity[];
+  community_cards: string[];
+  equities: number[];
+  wins: number[] | null;
+  ties: number[] | null;
+  method: EquityMethod;
+  iterations: number;
+  elapsed: number;
+  confidence_interval?: number;
 }
 
 export interface PlayerRequest {